@@ -38,6 +38,19 @@ def main():
             help="path to a json file containing the Vm interface, as generated by Foundry")
     args = parser.parse_args()
     json_str = request.urlopen(CHEATCODES_JSON_URL).read().decode("utf-8") if args.path is None else Path(args.path).read_text()
+    out = generate(json_str)
+
+    with open(OUT_PATH, "w") as f:
+        f.write(out)
+
+    forge_fmt = ["forge", "fmt", OUT_PATH]
+    res = subprocess.run(forge_fmt)
+    assert res.returncode == 0, f"command failed: {forge_fmt}"
+
+    print(f"Wrote to {OUT_PATH}")
+
+
+def generate(json_str: str) -> str:
     contract = Cheatcodes.from_json(json_str)
 
     ccs = contract.cheatcodes
@@ -95,16 +108,7 @@ def main():
     def memory_to_calldata(m: re.Match) -> str:
         return " calldata " + m.group(1)
 
-    out = re.sub(r" memory (.*returns)", memory_to_calldata, out)
-
-    with open(OUT_PATH, "w") as f:
-        f.write(out)
-
-    forge_fmt = ["forge", "fmt", OUT_PATH]
-    res = subprocess.run(forge_fmt)
-    assert res.returncode == 0, f"command failed: {forge_fmt}"
-
-    print(f"Wrote to {OUT_PATH}")
+    return re.sub(r" memory (.*returns)", memory_to_calldata, out)
 
 
 class CmpCheatcode:
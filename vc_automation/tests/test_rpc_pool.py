@@ -0,0 +1,127 @@
+"""
+vc_rpc_pool.RpcPool against local ThrottlingNode fake nodes: AIMD backoff and
+recovery, failover away from a dead endpoint, hedged reads, and resent writes.
+"""
+import asyncio
+import json
+import socket
+import sys
+from pathlib import Path
+
+from eth_utils import keccak
+
+# The automation modules import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from vc_rpc_pool import Endpoint, RpcPool, ThrottlingNode, drive  # noqa: E402
+
+RAW_TX = "0x" + "ab" * 100
+
+
+def unused_url() -> str:
+    """A local URL nothing is listening on."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+class LosingFirstAnswer(ThrottlingNode):
+    """Accepts every transaction, but answers the first with a 503 as if the
+    response had been lost; later sends of it are rejected as already known."""
+
+    def __init__(self):
+        super().__init__(rate=1000, capacity=8)
+        self.seen: set = set()
+
+    def handle_rpc(self, body: bytes) -> tuple:
+        request = json.loads(body)
+        raw = request["params"][0]
+        if raw not in self.seen:
+            self.seen.add(raw)
+            return 503, b'{"error":"upstream timeout"}', {}
+        reply = {"jsonrpc": "2.0", "id": request["id"],
+                 "error": {"code": -32000, "message": "already known"}}
+        return 200, json.dumps(reply).encode("utf-8"), {}
+
+# ======================================================================
+# === TESTS ===
+# ======================================================================
+def test_limit_drops_on_429_and_recovers():
+    with ThrottlingNode(rate=10_000, capacity=1, latency=0.01) as node:
+        endpoint = Endpoint("node", node.url, rate=10_000, initial_concurrency=8)
+
+        async def run():
+            async with RpcPool([endpoint]) as pool:
+                await drive(pool, 16, concurrency=16)
+                throttled_limit = endpoint.limiter.limit
+                node.capacity = 64  # the node stops throttling
+                await drive(pool, 60, concurrency=16)
+                return throttled_limit
+
+        throttled_limit = asyncio.run(run())
+    assert node.throttled > 0
+    assert endpoint.limiter.backoffs > 0
+    assert throttled_limit < 4
+    assert endpoint.limiter.limit > throttled_limit + 2
+
+
+def test_dead_endpoint_fails_over():
+    with ThrottlingNode(rate=1000, capacity=8) as node:
+        dead = Endpoint("dead", unused_url())
+        live = Endpoint("live", node.url)
+
+        async def run():
+            async with RpcPool([dead, live]) as pool:
+                return await pool.call("eth_chainId", [])
+
+        assert asyncio.run(run()) == "0x7a69"
+    assert dead.failures == 1
+    assert node.served == 1
+
+
+def test_read_is_hedged_and_losing_hedge_is_not_counted():
+    with ThrottlingNode(rate=1000, capacity=8, latency=0.005) as slow_node, \
+            ThrottlingNode(rate=1000, capacity=8, latency=0.005) as fast_node:
+        slow = Endpoint("slow", slow_node.url)
+        fast = Endpoint("fast", fast_node.url)
+
+        async def run():
+            async with RpcPool([slow, fast]) as pool:
+                for _ in range(5):
+                    await pool.call("eth_blockNumber", [])  # both idle: "slow" is first in the list
+                before = (slow.limiter.limit, slow.limiter.latency, slow.limiter.backoffs)
+                hedged, served = pool.hedged, fast_node.served
+                slow_node.latency = 0.5
+                await pool.call("eth_blockNumber", [])
+                return pool.hedged - hedged, fast_node.served - served, before
+
+        hedged, served, before = asyncio.run(run())
+    assert hedged == 1
+    assert served == 1
+    assert (slow.limiter.limit, slow.limiter.latency, slow.limiter.backoffs) == before
+    assert slow.limiter.in_flight == 0
+    assert slow.failures == 0 and slow.throttled == 0
+
+
+def test_resent_write_that_is_already_known_returns_its_hash():
+    with LosingFirstAnswer() as node:
+        endpoint = Endpoint("node", node.url)
+
+        async def run():
+            async with RpcPool([endpoint]) as pool:
+                return await pool.call("eth_sendRawTransaction", [RAW_TX])
+
+        assert asyncio.run(run()) == "0x" + keccak(hexstr=RAW_TX).hex()
+
+
+def test_already_known_on_first_send_is_an_error():
+    with LosingFirstAnswer() as node:
+        node.seen.add(RAW_TX)
+        endpoint = Endpoint("node", node.url)
+
+        async def run():
+            async with RpcPool([endpoint]) as pool:
+                return await pool.request("eth_sendRawTransaction", [RAW_TX])
+
+        assert asyncio.run(run())["error"]["message"] == "already known"
@@ -0,0 +1,230 @@
+"""
+Stage 4 against vc_rpc_replay.ReplayServer, with no node and no forge.
+
+data/stage4_members.jsonl.gz was recorded through RecordingProxy in front of
+ScriptedNode below, with concurrency 1 so nonces follow the member order.
+The tests replay it with the members reversed and full concurrency, so every
+eth_sendRawTransaction carries a different nonce, raw payload and hash than
+the recorded one.
+
+Regenerate the recording with:
+    python vc_automation/tests/test_rpc_replay.py
+"""
+import json
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import keccak
+
+# The automation modules import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import vc_automation  # noqa: E402
+import vc_toolkit  # noqa: E402
+from vc_rpc_replay import RecordingProxy, ReplayServer, _JsonRpcHandler, decode_raw_transaction  # noqa: E402
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+RECORDING = DATA_DIR / "stage4_members.jsonl.gz"
+ABIS = json.loads((DATA_DIR / "stage4_abi.json").read_text(encoding="utf-8"))
+
+ADMIN = "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+MEMBERS = [
+    "0x70997970C51812dc3A010C7d01b50e0d17dc79C8",
+    "0x3C44CdDdB6a900fa2b585dd299e03d12FA4293BC",
+    "0x90F79bf6EB2c4f870365E785982E1f101E93b906",
+]
+DEPLOYMENT = {
+    "LoanManager": "0xCf7Ed3AccA5a467e9e704C703E8D87F634fB0Fc9",
+    "LoanLogicFixed": "0x9fE46736679d2D9a65F0992F2272dE9f3c7fa6e0",
+}
+
+
+def _selector(signature: str) -> str:
+    return "0x" + keccak(text=signature)[:4].hex()
+
+
+SELECTORS = {_selector(s): s for s in (
+    "loanLogic()", "grantRole(bytes32,address)", "hasRole(bytes32,address)", "updateKyc(address,uint8)",
+    "registerMemberFor(address)", "isRegistered(address)", "getKycStatus(address)")}
+
+# ======================================================================
+# === SCRIPTED NODE ===
+# ======================================================================
+class ScriptedNode(ThreadingHTTPServer):
+    """Just enough of Anvil plus LoanManager/LoanLogicFixed for stage 4.
+
+    Mirrors the contracts' rules that matter here: LoanLogicFixed.updateKyc
+    only accepts its admin, so LoanManager.updateKyc (which calls it as the
+    contract) reverts.
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _JsonRpcHandler)
+        self.nonces: dict = {}
+        self.roles: set = set()
+        self.registered: set = set()
+        self.kyc: dict = {}
+        self.receipts: dict = {}
+        self.polled: set = set()
+        self.block = 1
+
+    def answer(self, payload, body):
+        if isinstance(payload, list):
+            return [self._answer_one(r) for r in payload]
+        return self._answer_one(payload)
+
+    def _answer_one(self, request: dict) -> dict:
+        method, params = request["method"], request.get("params", [])
+        result = getattr(self, "rpc_" + method)(*params)
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def rpc_eth_chainId(self):
+        return hex(31337)
+
+    def rpc_eth_gasPrice(self):
+        return hex(1_000_000_000)
+
+    def rpc_eth_getTransactionCount(self, address, block):
+        return hex(self.nonces.get(address.lower(), 0))
+
+    def rpc_eth_estimateGas(self, tx, *block):
+        return hex(60_000)
+
+    def rpc_eth_call(self, tx, *block):
+        signature = SELECTORS[tx["data"][:10]]
+        args = bytes.fromhex(tx["data"][10:])
+        if signature == "loanLogic()":
+            return "0x" + encode(["address"], [DEPLOYMENT["LoanLogicFixed"]]).hex()
+        if signature == "hasRole(bytes32,address)":
+            role, account = decode(["bytes32", "address"], args)
+            return "0x" + encode(["bool"], [(role, account.lower()) in self.roles]).hex()
+        (member,) = decode(["address"], args)
+        if signature == "isRegistered(address)":
+            return "0x" + encode(["bool"], [member.lower() in self.registered]).hex()
+        return "0x" + encode(["uint8"], [self.kyc.get(member.lower(), 0)]).hex()
+
+    def rpc_eth_sendRawTransaction(self, raw):
+        sender = Account.recover_transaction(raw).lower()
+        tx = decode_raw_transaction(raw)
+        signature = SELECTORS[tx["data"][:10]]
+        args = bytes.fromhex(tx["data"][10:])
+        to_logic = tx["to"].lower() == DEPLOYMENT["LoanLogicFixed"].lower()
+        ok = True
+        if signature == "grantRole(bytes32,address)":
+            role, account = decode(["bytes32", "address"], args)
+            self.roles.add((role, account.lower()))
+        elif signature == "registerMemberFor(address)":
+            (member,) = decode(["address"], args)
+            self.registered.add(member.lower())
+            self.kyc[member.lower()] = 0
+        elif signature == "updateKyc(address,uint8)":
+            member, status = decode(["address", "uint8"], args)
+            ok = to_logic and sender == ADMIN.lower() and member.lower() in self.registered
+            if ok:
+                self.kyc[member.lower()] = status
+        self.nonces[sender] = self.nonces.get(sender, 0) + 1
+        self.block += 1
+        tx_hash = "0x" + keccak(hexstr=raw).hex()
+        self.receipts[tx_hash] = {
+            "transactionHash": tx_hash, "transactionIndex": "0x0", "blockNumber": hex(self.block),
+            "blockHash": "0x" + keccak(self.block.to_bytes(32, "big")).hex(), "from": sender, "to": tx["to"],
+            "cumulativeGasUsed": hex(50_000), "gasUsed": hex(50_000), "effectiveGasPrice": hex(1_000_000_000),
+            "contractAddress": None, "logs": [], "logsBloom": "0x" + "00" * 256, "type": "0x0",
+            "status": "0x1" if ok else "0x0",
+        }
+        return tx_hash
+
+    def rpc_eth_getTransactionReceipt(self, tx_hash):
+        # The first poll of each hash finds it pending, as on a real node
+        if tx_hash not in self.polled:
+            self.polled.add(tx_hash)
+            return None
+        return self.receipts.get(tx_hash)
+
+# ======================================================================
+# === HELPERS ===
+# ======================================================================
+def run_stage_4(rpc_url: str, members: list, workdir: Path, concurrency: int) -> dict:
+    """Run stage 4 against `rpc_url`; returns {step label: [OpResult]}."""
+    results = {}
+    summary = workdir / f"deployment_summary_{vc_automation.TIMESTAMP}.json"
+    summary.write_text(json.dumps(DEPLOYMENT), encoding="utf-8")
+    with mock.patch.object(vc_toolkit, "load_abi", ABIS.__getitem__), \
+            mock.patch.object(vc_automation, "LOG_FILE", workdir / "automation.log"), \
+            mock.patch.object(vc_automation, "_log_results", results.__setitem__):
+        vc_automation.stage_4_post_deploy_setup(workdir, rpc_url=rpc_url, operator_address=ADMIN,
+                                                members=members, concurrency=concurrency)
+    return results
+
+
+@contextmanager
+def serving(server: ThreadingHTTPServer):
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def record(path: Path, workdir: Path, members: list = MEMBERS) -> None:
+    path.unlink(missing_ok=True)
+    with serving(ScriptedNode()) as node_url, serving(RecordingProxy(node_url, path)) as proxy_url:
+        run_stage_4(proxy_url, members, workdir, concurrency=1)
+
+
+def assert_stage_4_succeeded(results: dict, members: list) -> None:
+    assert set(results) == {"grantRole", "registerMemberFor", "updateKyc", "verify"}
+    for label, ops in results.items():
+        assert all(op.ok for op in ops), (label, ops)
+    values = {op.name: op.value for op in results["verify"]}
+    assert values[f"hasRole:{ADMIN}"] is True
+    for member in members:
+        assert values[f"isRegistered:{member}"] is True
+        assert values[f"getKycStatus:{member}"] == 1
+
+# ======================================================================
+# === TESTS ===
+# ======================================================================
+def test_stage_4_replays_with_different_nonce_order(tmp_path):
+    members = MEMBERS[::-1]
+    server = ReplayServer(RECORDING)
+    with server as rpc_url:
+        results = run_stage_4(rpc_url, members, tmp_path, concurrency=16)
+    assert server.misses == 0
+    assert_stage_4_succeeded(results, members)
+
+
+def test_fresh_recording_replays(tmp_path):
+    # Two members are enough to reorder; the checked-in recording covers the full set
+    members = MEMBERS[:2]
+    recording = tmp_path / "stage4.jsonl.gz"
+    record(recording, tmp_path, members)
+    server = ReplayServer(recording)
+    with server as rpc_url:
+        results = run_stage_4(rpc_url, members[::-1], tmp_path, concurrency=16)
+    assert server.misses == 0
+    assert_stage_4_succeeded(results, members)
+
+
+def test_unrecorded_send_is_a_miss(tmp_path):
+    server = ReplayServer(RECORDING)
+    with server as rpc_url:
+        results = run_stage_4(rpc_url, ["0x15d34AAf54267DB7D7c367839AAf71A00a2C6A65"], tmp_path, concurrency=1)
+    assert server.misses > 0
+    assert not all(op.ok for op in results["registerMemberFor"])
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        record(RECORDING, Path(tmp))
+    print(f"Recorded stage 4 for {len(MEMBERS)} members -> {RECORDING}", file=sys.stderr)
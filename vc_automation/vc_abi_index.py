@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa ABI Index
+---------------------------
+One compact index of everything Python tools need from forge's out/:
+  • ABI, function selectors, event topics and error selectors per contract
+  • Hashes of the creation and (normalised) runtime bytecode
+  • Keyed by the forge build hash (out/build-info ids); a matching build
+    hash skips the scan entirely
+
+Artifacts are parsed only up to the keys the index needs, so the AST and
+metadata that make up most of each file are never decoded. On rebuild an
+artifact is re-extracted only when its mtime/size changed and its content
+hash differs from the indexed one.
+
+Usage:
+    python vc_automation/vc_abi_index.py [--force]
+    python vc_automation/vc_abi_index.py --selector 0x6d5d1a4a
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from eth_utils import keccak
+
+from vc_helpers import OUT_DIR, VC_DIR, normalized_runtime
+
+INDEX_PATH = VC_DIR / "cache" / "abi_index.json"
+INDEX_VERSION = 1
+
+WANTED_KEYS = ("abi", "bytecode", "deployedBytecode", "methodIdentifiers")
+
+_loaded: Optional[dict] = None
+_checked_dirs: Optional[tuple] = None   # out_dir_mtimes() at the last check without a build hash
+
+# ======================================================================
+# === ARTIFACT EXTRACTION ===
+# ======================================================================
+def read_top_level(text: str, wanted=WANTED_KEYS) -> dict:
+    """Decode only the wanted top-level keys of a JSON object, stopping once all are found."""
+    decoder = json.JSONDecoder()
+    found = {}
+    pos = text.index("{") + 1
+    length = len(text)
+    while len(found) < len(wanted):
+        while pos < length and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= length or text[pos] == "}":
+            break
+        key, pos = decoder.raw_decode(text, pos)
+        while text[pos] in " \t\r\n:":
+            pos += 1
+        value, pos = decoder.raw_decode(text, pos)
+        if key in wanted:
+            found[key] = value
+    return found
+
+
+def canonical_type(param: dict) -> str:
+    type_name = param["type"]
+    if type_name.startswith("tuple"):
+        inner = ",".join(canonical_type(c) for c in param.get("components", []))
+        return f"({inner}){type_name[len('tuple'):]}"
+    return type_name
+
+
+def signature(item: dict) -> str:
+    return f"{item['name']}({','.join(canonical_type(p) for p in item.get('inputs', []))})"
+
+
+def extract_artifact(path: Path) -> dict:
+    data = path.read_bytes()
+    fields = read_top_level(data.decode("utf-8"))
+    abi = fields.get("abi", [])
+
+    events = {}
+    errors = {}
+    for item in abi:
+        if item.get("type") == "event":
+            events["0x" + keccak(text=signature(item)).hex()] = signature(item)
+        elif item.get("type") == "error":
+            errors["0x" + keccak(text=signature(item)).hex()[:8]] = signature(item)
+
+    creation = ((fields.get("bytecode") or {}).get("object") or "").removeprefix("0x")
+    deployed = fields.get("deployedBytecode") or {}
+    runtime = (deployed.get("object") or "").removeprefix("0x")
+    runtime_hash = None
+    if runtime and not deployed.get("linkReferences"):
+        runtime_hash = hashlib.sha256(normalized_runtime(
+            bytes.fromhex(runtime), deployed.get("immutableReferences"))).hexdigest()
+
+    return {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "abi": abi,
+        "selectors": {"0x" + sel: sig for sig, sel in (fields.get("methodIdentifiers") or {}).items()},
+        "events": events,
+        "errors": errors,
+        "bytecode_hash": hashlib.sha256(creation.encode()).hexdigest() if creation else None,
+        "runtime_hash": runtime_hash,
+        "immutable_references": deployed.get("immutableReferences") or {},
+    }
+
+# ======================================================================
+# === INDEX BUILD ===
+# ======================================================================
+def build_hash(out_dir: Path = OUT_DIR) -> Optional[str]:
+    """Hash of the build-info ids in out/, or None when there are none to go by."""
+    build_info = out_dir / "build-info"
+    ids = sorted(p.name for p in build_info.glob("*.json")) if build_info.exists() else []
+    return hashlib.sha256("\n".join(ids).encode()).hexdigest() if ids else None
+
+
+def out_dir_mtimes(out_dir: Path = OUT_DIR) -> tuple:
+    """mtimes of out/ and its per-source directories; they change when artifacts are added or replaced."""
+    try:
+        with os.scandir(out_dir) as entries:
+            subdirs = sorted((e.name, e.stat().st_mtime_ns) for e in entries
+                             if e.is_dir() and e.name != "build-info")
+        return out_dir.stat().st_mtime_ns, tuple(subdirs)
+    except FileNotFoundError:
+        return ()
+
+
+def artifact_files(out_dir: Path = OUT_DIR) -> list:
+    return [p for p in out_dir.glob("*/*.json") if p.parent.name != "build-info"]
+
+
+def build_index(out_dir: Path = OUT_DIR, index_path: Path = INDEX_PATH, force: bool = False) -> dict:
+    """Bring the index up to date with out/; returns rebuild statistics."""
+    start = time.perf_counter()
+    current_build = build_hash(out_dir)
+    previous = {} if force else _read_index(index_path)
+    if (current_build is not None and previous.get("build") == current_build
+            and previous.get("version") == INDEX_VERSION):
+        return {"build": current_build, "reused": len(previous["artifacts"]), "extracted": 0, "skipped": 0,
+                "unchanged_build": True, "seconds": time.perf_counter() - start}
+
+    old_artifacts = previous.get("artifacts", {})
+    artifacts = {}
+    reused = extracted = skipped = 0
+    for path in artifact_files(out_dir):
+        key = f"{path.parent.name}:{path.stem}"
+        old = old_artifacts.get(key)
+        try:
+            st = path.stat()
+            if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+                artifacts[key] = old
+                reused += 1
+                continue
+            if old and old["sha256"] == hashlib.sha256(path.read_bytes()).hexdigest():
+                artifacts[key] = dict(old, mtime_ns=st.st_mtime_ns, size=st.st_size)
+                reused += 1
+                continue
+            artifacts[key] = dict(extract_artifact(path), mtime_ns=st.st_mtime_ns, size=st.st_size)
+            extracted += 1
+        except (OSError, ValueError) as e:
+            # Empty, truncated or vanished while forge / vc_watch rewrites out/:
+            # keep the previous entry (its stale mtime gets it re-read next time)
+            print(f"[abi-index] skipping {path}: {e}", file=sys.stderr)
+            if old:
+                artifacts[key] = old
+            skipped += 1
+
+    # A build hash is only recorded for a complete index, so a partial one is rechecked
+    index = {"version": INDEX_VERSION, "build": None if skipped else current_build, "artifacts": artifacts}
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp_path, index_path)
+
+    global _loaded
+    _loaded = index
+    return {"build": current_build, "reused": reused, "extracted": extracted, "skipped": skipped,
+            "unchanged_build": False, "seconds": time.perf_counter() - start}
+
+
+def _read_index(index_path: Path) -> dict:
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+# ======================================================================
+# === LOOKUPS ===
+# ======================================================================
+def load_index(refresh: bool = True) -> dict:
+    """The in-memory index, rebuilt first if out/ has a different build hash.
+
+    Without build-info there is no hash to compare, so build_index's
+    per-artifact mtime/size check runs instead: once per process, and again
+    only when a directory under out/ changed. An artifact rewritten in place
+    is picked up by the next process or by running this module.
+    """
+    global _loaded, _checked_dirs
+    if _loaded is None:
+        _loaded = _read_index(INDEX_PATH)
+    if not refresh:
+        return _loaded
+    current_build = build_hash()
+    if current_build is not None:
+        if not _loaded or _loaded.get("build") != current_build:
+            build_index()
+    else:
+        dirs = out_dir_mtimes()
+        if not _loaded or dirs != _checked_dirs:
+            build_index()
+            _checked_dirs = dirs
+    return _loaded
+
+
+def get_artifact(contract_name: str, source_name: Optional[str] = None) -> dict:
+    artifacts = load_index()["artifacts"]
+    key = f"{source_name or contract_name + '.sol'}:{contract_name}"
+    if key in artifacts:
+        return artifacts[key]
+    matches = [v for k, v in artifacts.items() if k.endswith(f":{contract_name}")]
+    if not matches:
+        raise KeyError(f"No artifact for {contract_name}")
+    return matches[0]
+
+
+def get_abi(contract_name: str, source_name: Optional[str] = None) -> list:
+    return get_artifact(contract_name, source_name)["abi"]
+
+
+def find_selector(selector: str) -> list:
+    """Contracts and signatures that define a function or error selector."""
+    selector = selector.lower()
+    hits = []
+    for key, artifact in load_index()["artifacts"].items():
+        sig = artifact["selectors"].get(selector) or artifact["errors"].get(selector)
+        if sig:
+            hits.append((key, sig))
+    return hits
+
+
+def find_event(topic: str) -> list:
+    topic = topic.lower()
+    return [(key, a["events"][topic]) for key, a in load_index()["artifacts"].items() if topic in a["events"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the compact ABI index")
+    parser.add_argument("--force", action="store_true", help="re-extract every artifact")
+    parser.add_argument("--selector", help="look up a 4-byte function/error selector")
+    parser.add_argument("--topic", help="look up an event topic0")
+    args = parser.parse_args()
+
+    stats = build_index(force=args.force)
+    print(f"Index {INDEX_PATH}: build {(stats['build'] or 'unknown')[:12]}, {stats['extracted']} extracted, "
+          f"{stats['reused']} reused, {stats['skipped']} skipped in {stats['seconds'] * 1000:.1f} ms")
+    for key, sig in find_selector(args.selector) if args.selector else []:
+        print(f"  {args.selector}  {key}  {sig}")
+    for key, sig in find_event(args.topic) if args.topic else []:
+        print(f"  {args.topic[:10]}…  {key}  {sig}")
+
+
+if __name__ == "__main__":
+    main()
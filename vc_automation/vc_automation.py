@@ -10,7 +10,7 @@ A unified automation pipeline for:
 
 All logs are stored under: vc_automation/logs/
 """
-from web3 import Web3
+import asyncio
 import os
 import sys
 import subprocess
@@ -22,6 +22,10 @@ from pathlib import Path
 from typing import Optional
 import shutil
 
+from vc_metrics import (COMMAND_DURATION, COMMAND_FAILURES, STAGE_DURATION,
+                        command_label, serve_metrics, track_anvil)
+from vc_toolkit import AsyncToolkit, OPERATOR_ROLE
+
 # ======================================================================
 # === GLOBAL SETUP ===
 # ======================================================================
@@ -39,6 +43,9 @@ TRANSACTIONS_DIR.mkdir(parents=True, exist_ok=True)
 TIMESTAMP = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 LOG_FILE = LOGS_DIR / f"automation_{TIMESTAMP}.log"
 
+# Set to serve /metrics while the pipeline runs, e.g. VC_METRICS_PORT=9108
+METRICS_PORT = os.environ.get("VC_METRICS_PORT")
+
 # ======================================================================
 # === BASIC LOGGING ===
 # ======================================================================
@@ -56,8 +63,12 @@ def ensure_requirements_and_install():
     this_script = Path(__file__).read_text(encoding="utf-8", errors="ignore")
 
     imports = re.findall(r"^(?:from|import)\s+([a-zA-Z0-9_\.]+)", this_script, re.MULTILINE)
+    local_modules = {p.stem for p in VC_DIR.glob("*.py")}
     required_packages = sorted(set(
-        [i.split('.')[0] for i in imports if i not in ('os', 'sys', 'subprocess', 'datetime', 'time', 're', 'json', 'pathlib')]
+        [i.split('.')[0] for i in imports
+         if i not in ('os', 'sys', 'subprocess', 'datetime', 'time', 're', 'json', 'pathlib')
+         and i.split('.')[0] not in sys.stdlib_module_names
+         and i.split('.')[0] not in local_modules]
     ))
 
     for p in CORE_PKGS:
@@ -113,6 +124,9 @@ def is_process_running_by_name_contains(name_fragment: str) -> bool:
 
 def run_command(cmd: list, cwd: Path = PROJECT_ROOT, capture: bool = True, timeout: int = 300) -> tuple:
     log(f"$ {' '.join(cmd)}")
+    label = command_label(cmd)
+    start = time.perf_counter()
+    returncode = 1
     try:
         proc = subprocess.run(
             cmd,
@@ -126,13 +140,19 @@ def run_command(cmd: list, cwd: Path = PROJECT_ROOT, capture: bool = True, timeo
             log(proc.stdout.strip())
         if proc.stderr:
             log(proc.stderr.strip())
+        returncode = proc.returncode
         return proc.returncode, proc.stdout, proc.stderr
     except subprocess.TimeoutExpired:
         log(f"Command timed out after {timeout} seconds: {' '.join(cmd)}")
+        returncode = 124
         return 124, "", "Timeout expired"
     except Exception as e:
         log(f"Exception running command {cmd}: {str(e)}")
         return 1, "", str(e)
+    finally:
+        COMMAND_DURATION.labels(label).observe(time.perf_counter() - start)
+        if returncode != 0:
+            COMMAND_FAILURES.labels(label).inc()
 
 def try_find_deploy_script() -> Optional[Path]:
     candidates = [
@@ -242,6 +262,33 @@ def stage_2_ensure_anvil(start_if_missing: bool = True,
 # ======================================================================
 # === STAGE 3: DEPLOYMENT ===
 # ======================================================================
+DEPLOYED_AT_RE = re.compile(r"^(\w+) deployed at:\s*(0x[0-9a-fA-F]{40})\b")
+
+
+def parse_deploy_output(stdout: str) -> tuple:
+    """Contract addresses and transaction hashes from `forge script` output."""
+    deployed_contracts = {}
+    tx_hashes = []
+
+    # --- Parse lines like: DeployedContract:ContractName:0x...
+    # --- or Deploy.s.sol's console.log form: ContractName deployed at: 0x...
+    for line in stdout.splitlines():
+        # Strip ANSI codes and whitespace
+        line_clean = re.sub(r'\x1b\[[0-9;]*m', '', line).strip()
+        logged = DEPLOYED_AT_RE.match(line_clean)
+        if logged:
+            deployed_contracts[logged.group(1)] = logged.group(2)
+        elif line_clean.startswith("DeployedContract:"):
+            try:
+                _, contract_name, address = line_clean.split(":")
+                deployed_contracts[contract_name] = address
+            except ValueError:
+                log(f"Warning: Could not parse deployment line: {line_clean}")
+        elif "Transaction hash:" in line_clean:
+            tx_hashes.append(line_clean.split("Transaction hash:")[1].strip())
+    return deployed_contracts, tx_hashes
+
+
 def stage_3_deploy_and_capture(rpc_url: str = "http://127.0.0.1:8545",
                                chain_id: int = 31337,
                                dry_run: bool = False,
@@ -273,14 +320,17 @@ def stage_3_deploy_and_capture(rpc_url: str = "http://127.0.0.1:8545",
     log(f"Executing deployment: {' '.join(cmd)}")
 
     try:
-        result = subprocess.run(
-            cmd,
-            cwd=str(PROJECT_ROOT),
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=timeout_seconds
-        )
+        with COMMAND_DURATION.labels(command_label(cmd)).time():
+            result = subprocess.run(
+                cmd,
+                cwd=str(PROJECT_ROOT),
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=timeout_seconds
+            )
+        if result.returncode != 0:
+            COMMAND_FAILURES.labels(command_label(cmd)).inc()
 
         stdout = result.stdout or ""
         stderr = result.stderr or ""
@@ -290,21 +340,7 @@ def stage_3_deploy_and_capture(rpc_url: str = "http://127.0.0.1:8545",
         with open(deploy_log_path, "w", encoding="utf-8") as fh:
             fh.write(stdout + "\n" + stderr)
 
-        deployed_contracts = {}
-        tx_hashes = []
-
-        # --- Parse lines like: DeployedContract:ContractName:0x...
-        for line in stdout.splitlines():
-            # Strip ANSI codes and whitespace
-            line_clean = re.sub(r'\x1b\[[0-9;]*m', '', line).strip()
-            if line_clean.startswith("DeployedContract:"):
-                try:
-                    _, contract_name, address = line_clean.split(":")
-                    deployed_contracts[contract_name] = address
-                except ValueError:
-                    log(f"Warning: Could not parse deployment line: {line_clean}")
-            elif "Transaction hash:" in line_clean:
-                tx_hashes.append(line_clean.split("Transaction hash:")[1].strip())
+        deployed_contracts, tx_hashes = parse_deploy_output(stdout)
 
         if deployed_contracts:
             json_path = chain_folder / f"deployment_summary_{TIMESTAMP}.json"
@@ -318,7 +354,7 @@ def stage_3_deploy_and_capture(rpc_url: str = "http://127.0.0.1:8545",
                 log(f"{name:25} -> {addr}")
             log("=========================\n")
         else:
-            log("No deployed contracts detected. Ensure Deploy.s.sol prints 'DeployedContract:ContractName:0x...' for each contract.")
+            log("No deployed contracts detected. Ensure Deploy.s.sol logs 'ContractName deployed at: 0x...' for each contract.")
 
         if tx_hashes:
             tx_log = TRANSACTIONS_DIR / f"tx_{TIMESTAMP}.log"
@@ -367,9 +403,14 @@ def stage_4_post_deploy_setup(chain_folder: Path,
                               rpc_url: str = "http://127.0.0.1:8545",
                               admin_private_key: str = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80",
                               operator_address: str = "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266",
-                              test_member_address: str = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8") -> None:
+                              test_member_address: str = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8",
+                              members: Optional[list] = None,
+                              concurrency: int = 16) -> None:
     """
-    Grant operator role, register a test member, update KYC, and verify.
+    Grant operator role, register test members, update KYC, and verify.
+
+    Each step is sent for all members at once through the async toolkit, so
+    setting up N members costs about one round trip per step instead of N.
     """
     if not chain_folder:
         log("No deployment folder provided. Skipping Stage 4.")
@@ -383,62 +424,49 @@ def stage_4_post_deploy_setup(chain_folder: Path,
     with open(deployment_summary, "r", encoding="utf-8") as f:
         deployed_contracts = json.load(f)
 
-    loan_manager_address = deployed_contracts.get("LoanManager")
-    if not loan_manager_address:
+    if not deployed_contracts.get("LoanManager"):
         log("LoanManager address not found in deployment summary. Skipping Stage 4.")
         return
 
-    # Operator role hash in Solidity (replace with actual if different)
-    OPERATOR_ROLE_HASH = Web3.keccak(text="OPERATOR_ROLE").hex()
+    members = members or [test_member_address]
+    asyncio.run(_stage_4_async(deployed_contracts, rpc_url, admin_private_key,
+                               operator_address, members, concurrency))
 
 
+def _log_results(label: str, results: list) -> None:
+    failed = [r for r in results if not r.ok]
+    log(f"{label}: {len(results) - len(failed)}/{len(results)} succeeded")
+    for r in results:
+        log(f"  {r.name:60} {'OK' if r.ok else 'FAILED: ' + str(r.error)}  value={r.value}")
 
-    # Grant OPERATOR_ROLE to operator_address
-    log(f"Computed OPERATOR_ROLE hash: {OPERATOR_ROLE_HASH}")
-    run_command([
-        "cast", "send", loan_manager_address,
-        "grantRole(bytes32,address)", OPERATOR_ROLE_HASH, operator_address,
-        "--rpc-url", rpc_url,
-        "--private-key", admin_private_key
-    ])
-
-    
-    # Verify OPERATOR_ROLE assignment
-    log(f"Verifying if {operator_address} has OPERATOR_ROLE")
-    code, stdout, _ = run_command([
-        "cast", "call", loan_manager_address,
-        "hasRole(bytes32,address) returns (bool)", OPERATOR_ROLE_HASH, operator_address,
-        "--rpc-url", rpc_url
-    ])
-    log(f"Operator role assigned: {stdout.strip()}")
-
-
-    # Register test member (you may need to adapt the registration function & parameters)
-    log(f"Registering test member {test_member_address}")
-    run_command([
-        "cast", "send", loan_manager_address,
-        "registerMember(address)", test_member_address,
-        "--rpc-url", rpc_url,
-        "--private-key", operator_address
-    ])
-
-    # Update KYC for test member
-    log(f"Updating KYC for {test_member_address} to 1 (verified)")
-    run_command([
-        "cast", "send", loan_manager_address,
-        "updateKyc(address,uint8)", test_member_address, "1",
-        "--rpc-url", rpc_url,
-        "--private-key", operator_address
-    ])
-
-    # Verify isRegistered
-    log(f"Verifying if {test_member_address} is registered")
-    code, stdout, _ = run_command([
-        "cast", "call", loan_manager_address,
-        "isRegistered(address) returns (bool)", test_member_address,
-        "--rpc-url", rpc_url
-    ])
-    log(f"isRegistered: {stdout.strip()}")
+
+async def _stage_4_async(deployed_contracts: dict, rpc_url: str, admin_private_key: str,
+                         operator_address: str, members: list, concurrency: int) -> None:
+    async with AsyncToolkit(rpc_url, admin_private_key, concurrency=concurrency) as tk:
+        loan_manager = tk.contract(deployed_contracts["LoanManager"], "LoanManager")
+        loan_logic_address = (deployed_contracts.get("LoanLogicFixed")
+                              or await loan_manager.functions.loanLogic().call())
+        loan_logic = tk.contract(loan_logic_address, "LoanLogicFixed")
+
+        # Grant OPERATOR_ROLE to operator_address
+        log(f"Computed OPERATOR_ROLE hash: {OPERATOR_ROLE.to_0x_hex()}")
+        _log_results("grantRole", await tk.grant_roles(loan_manager, OPERATOR_ROLE, [operator_address]))
+
+        # Register members (registration lives on LoanLogicFixed.registerMemberFor)
+        log(f"Registering {len(members)} member(s)")
+        _log_results("registerMemberFor", await tk.register_members(loan_logic, members))
+
+        # Update KYC to 1 (verified), directly on LoanLogicFixed as its admin
+        log(f"Updating KYC for {len(members)} member(s) to 1 (verified)")
+        _log_results("updateKyc", await tk.update_kyc(loan_logic, members, 1))
+
+        # Verify role, registration and KYC in one concurrent read batch
+        reads = [("hasRole:" + operator_address,
+                  loan_manager.functions.hasRole(OPERATOR_ROLE, operator_address))]
+        for member in members:
+            reads.append((f"isRegistered:{member}", loan_manager.functions.isRegistered(member)))
+            reads.append((f"getKycStatus:{member}", loan_manager.functions.getKycStatus(member)))
+        _log_results("verify", await tk.read_many(reads))
 
 # ======================================================================
 # === MAIN PIPELINE ===
@@ -446,11 +474,19 @@ def stage_4_post_deploy_setup(chain_folder: Path,
 def main():
     clean_previous_deployments()
     log("=== VaultChain Africa Automation Bootstrap ===")
+    if METRICS_PORT:
+        track_anvil()
+        server = serve_metrics(int(METRICS_PORT))
+        log(f"Serving metrics on {server.url}")
     ensure_requirements_and_install()
-    stage_1_build_and_test()
-    stage_2_ensure_anvil()
-    chain_folder = stage_3_deploy_and_capture()  # Capture deployment folder
-    stage_4_post_deploy_setup(chain_folder)      # Run post-deploy setup
+    with STAGE_DURATION.labels("build_and_test").time():
+        stage_1_build_and_test()
+    with STAGE_DURATION.labels("ensure_anvil").time():
+        stage_2_ensure_anvil()
+    with STAGE_DURATION.labels("deploy").time():
+        chain_folder = stage_3_deploy_and_capture()  # Capture deployment folder
+    with STAGE_DURATION.labels("post_deploy_setup").time():
+        stage_4_post_deploy_setup(chain_folder)      # Run post-deploy setup
     log(f"All automation stages completed. Logs stored at: {LOG_FILE}")
 
 if __name__ == "__main__":
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Benchmark Suite
+---------------------------------
+Timing benchmarks for the Python toolchain, with stored baselines:
+  • vm_generate:       scripts/vm.py generation over a fixed, seeded
+                       cheatcodes.json (or --cheatcodes PATH)
+  • log_throughput:    vc_automation.log() messages per second
+  • run_command:       run_command() per call against a bare subprocess.run
+  • parse_deploy:      stage 3 deploy-output parsing on a large forge log
+  • stage_3_4:         end-to-end stage 3 + 4 against a fresh local Anvil
+                       (skipped when forge/anvil are not on PATH)
+
+Each benchmark is repeated and reported by its median. Results are JSON
+(-o / --json); with a baseline present, a median slower than the baseline
+by more than --threshold percent is a regression and the run exits 1.
+Benchmarks whose parameters differ from the baseline are not compared.
+Baselines are per machine and not checked in: without one, nothing is
+compared and a warning says so (--require-baseline makes that exit 2).
+
+Usage:
+    python vc_automation/vc_bench.py                      # run all, compare
+    python vc_automation/vc_bench.py -k vm_generate parse_deploy --repeat 20
+    python vc_automation/vc_bench.py --save-baseline
+    python vc_automation/vc_bench.py --json -o bench.json --threshold 15
+    python vc_automation/vc_bench.py --require-baseline   # CI: fail without a baseline
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from vc_helpers import PROJECT_ROOT, VC_DIR, local_anvil
+
+BASELINE_PATH = VC_DIR / "bench_baseline.json"
+DEFAULT_THRESHOLD = 10.0  # percent
+BENCH_CHAIN_ID = 31337
+
+# ======================================================================
+# === MEASUREMENT ===
+# ======================================================================
+def measure(fn: Callable[[], None], repeat: int, warmup: int = 1) -> list:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings: list, ops: int = 1, **params) -> dict:
+    median = statistics.median(timings)
+    return {
+        "status": "ok",
+        "params": params,
+        "runs": len(timings),
+        "median": round(median, 6),
+        "min": round(min(timings), 6),
+        "max": round(max(timings), 6),
+        "stdev": round(statistics.stdev(timings), 6) if len(timings) > 1 else 0.0,
+        "ops": ops,
+        "ops_per_second": round(ops / median, 1) if median else None,
+    }
+
+
+@contextlib.contextmanager
+def quiet_logging():
+    """Send vc_automation.log() to a temp file and stdout to /dev/null, and
+    point its logs/, deployments/ and transactions/ at the same temp dir so a
+    benchmark never touches the real ones."""
+    import vc_automation
+    names = ("LOG_FILE", "LOGS_DIR", "DEPLOYMENTS_DIR", "TRANSACTIONS_DIR")
+    original = {name: getattr(vc_automation, name) for name in names}
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        tmp = Path(tmp)
+        for name in names[1:]:
+            path = tmp / original[name].name
+            path.mkdir()
+            setattr(vc_automation, name, path)
+        vc_automation.LOG_FILE = tmp / "bench.log"
+        try:
+            with contextlib.redirect_stdout(devnull):
+                yield vc_automation
+        finally:
+            for name, value in original.items():
+                setattr(vc_automation, name, value)
+
+# ======================================================================
+# === FIXTURES ===
+# ======================================================================
+def synthetic_cheatcodes(count: int = 600, seed: int = 1) -> str:
+    """A cheatcodes.json in Foundry's layout; identical for the same count and seed."""
+    rng = random.Random(seed)
+    groups = ["evm", "testing", "scripting", "filesystem", "environment", "json", "utilities"]
+    types = ["uint256", "address", "bytes32", "bool", "string memory", "bytes memory"]
+
+    def function(i: int) -> dict:
+        args = ", ".join(f"{rng.choice(types)} arg{j}" for j in range(rng.randint(0, 4)))
+        mutability = rng.choice(["", "view", "pure"])
+        returns = f" returns ({rng.choice(types)} value)" if rng.random() < 0.6 else ""
+        declaration = f"function cheat{i}({args}) external{' ' + mutability if mutability else ''}{returns};"
+        selector = rng.getrandbits(32).to_bytes(4, "big")
+        return {
+            "id": f"cheat{i}",
+            "description": " ".join(rng.choice(["Sets", "the", "value", "of", "a", "slot", "for", "testing"])
+                                    for _ in range(rng.randint(4, 30))),
+            "declaration": declaration,
+            "visibility": "external",
+            "mutability": mutability,
+            "signature": f"cheat{i}()",
+            "selector": "0x" + selector.hex(),
+            "selectorBytes": list(selector),
+        }
+
+    return json.dumps({
+        "errors": [{"name": f"Error{i}", "description": "An error.", "declaration": f"error Error{i}(string);"}
+                   for i in range(4)],
+        "events": [{"name": f"Event{i}", "description": "An event.", "declaration": f"event Event{i}(uint256);"}
+                   for i in range(4)],
+        "enums": [{"name": f"Enum{i}", "description": "An enum.",
+                   "variants": [{"name": f"V{j}", "description": f"Variant {j}."} for j in range(5)]}
+                  for i in range(6)],
+        "structs": [{"name": f"Struct{i}", "description": "A struct.",
+                     "fields": [{"name": f"f{j}", "ty": rng.choice(types).split()[0], "description": "A field."}
+                                for j in range(6)]}
+                    for i in range(12)],
+        "cheatcodes": [{
+            "func": function(i),
+            "group": rng.choice(groups),
+            "status": rng.choice(["stable"] * 8 + ["experimental", "deprecated"]),
+            "safety": rng.choice(["safe", "unsafe"]),
+        } for i in range(count)],
+    })
+
+
+def synthetic_deploy_output(noise_lines: int = 20_000, seed: int = 1) -> str:
+    """forge script stdout with ANSI colour codes, traces and the lines stage 3 looks for."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(noise_lines):
+        roll = rng.random()
+        if roll < 0.05:
+            lines.append(f"\x1b[32m  [Success]\x1b[0m Hash: 0x{rng.getrandbits(256):064x}")
+        elif roll < 0.1:
+            lines.append(f"  Transaction hash: 0x{rng.getrandbits(256):064x}")
+        else:
+            lines.append(f"  \x1b[2m[{rng.randint(1000, 99999)}]\x1b[0m VaultChain::call{i}() \x1b[33m← [Return]\x1b[0m")
+    # script/Deploy.s.sol's console.log lines, printed together under "== Logs =="
+    logs = ["== Logs =="] + [f"  {name} deployed at: 0x{rng.getrandbits(160):040x}"
+                             for name in ("MembershipModule", "LoanCore", "LoanLogicFixed", "LoanManager", "VaultChain")]
+    at = rng.randrange(len(lines))
+    lines[at:at] = logs
+    return "\n".join(lines)
+
+# ======================================================================
+# === BENCHMARKS ===
+# ======================================================================
+def bench_vm_generate(repeat: int, cheatcodes: Optional[Path] = None) -> dict:
+    sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+    import vm
+    json_str = cheatcodes.read_text(encoding="utf-8") if cheatcodes else synthetic_cheatcodes()
+    ops = len(json.loads(json_str)["cheatcodes"])
+    return summarize(measure(lambda: vm.generate(json_str), repeat), ops,
+                     fixture=str(cheatcodes) if cheatcodes else "synthetic:600:1")
+
+
+def bench_log_throughput(repeat: int, messages: int = 5000) -> dict:
+    message = "Deployment stage completed successfully. " * 2
+    with quiet_logging() as vc:
+        def run():
+            for _ in range(messages):
+                vc.log(message)
+        return summarize(measure(run, repeat), messages, messages=messages)
+
+
+def bench_run_command(repeat: int, calls: int = 20) -> dict:
+    true = shutil.which("true")
+    cmd = [true] if true else [sys.executable, "-c", "pass"]
+
+    def bare():
+        for _ in range(calls):
+            subprocess.run(cmd, capture_output=True, text=True, check=False)
+
+    with quiet_logging() as vc:
+        def wrapped():
+            for _ in range(calls):
+                vc.run_command(cmd)
+        result = summarize(measure(wrapped, repeat), calls, command=os.path.basename(cmd[0]), calls=calls)
+    baseline = statistics.median(measure(bare, repeat))
+    result["bare_median"] = round(baseline, 6)
+    result["overhead_per_call"] = round((result["median"] - baseline) / calls, 6)
+    return result
+
+
+def bench_parse_deploy(repeat: int, noise_lines: int = 20_000) -> dict:
+    stdout = synthetic_deploy_output(noise_lines)
+    with quiet_logging() as vc:
+        contracts, _ = vc.parse_deploy_output(stdout)
+        if len(contracts) != 5:
+            raise AssertionError(f"parsed {len(contracts)} of 5 deployed contracts")
+        return summarize(measure(lambda: vc.parse_deploy_output(stdout), repeat),
+                         noise_lines, noise_lines=noise_lines)
+
+
+def bench_stage_3_4(repeat: int) -> dict:
+    if not (shutil.which("anvil") and shutil.which("forge")):
+        return {"status": "skipped", "reason": "forge/anvil not on PATH"}
+    build = subprocess.run(["forge", "build"], cwd=str(PROJECT_ROOT), capture_output=True, check=False)
+    if build.returncode != 0:
+        return {"status": "error", "reason": "forge build failed"}
+
+    with quiet_logging() as vc:
+        def run(rpc_url: str) -> float:
+            start = time.perf_counter()
+            chain_folder = vc.stage_3_deploy_and_capture(rpc_url, BENCH_CHAIN_ID)
+            vc.stage_4_post_deploy_setup(chain_folder, rpc_url)
+            elapsed = time.perf_counter() - start
+            if not chain_folder or not (chain_folder / f"deployment_summary_{vc.TIMESTAMP}.json").exists():
+                raise RuntimeError("stage 3 produced no deployment summary")
+            return elapsed
+
+        timings = []
+        for _ in range(repeat):
+            # a fresh chain per run so every run deploys from the same state
+            with local_anvil(BENCH_CHAIN_ID) as rpc_url:
+                timings.append(run(rpc_url))
+    return summarize(timings, 1, chain_id=BENCH_CHAIN_ID)
+
+
+# name -> (function, default repeat)
+BENCHMARKS = {
+    "vm_generate": (bench_vm_generate, 10),
+    "log_throughput": (bench_log_throughput, 10),
+    "run_command": (bench_run_command, 10),
+    "parse_deploy": (bench_parse_deploy, 10),
+    "stage_3_4": (bench_stage_3_4, 3),
+}
+
+# ======================================================================
+# === BASELINES ===
+# ======================================================================
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Optional[dict]:
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: dict, path: Path = BASELINE_PATH) -> None:
+    """Merge into the stored baseline so a partial run (-k) keeps the other entries."""
+    baseline = load_baseline(path) or {"benchmarks": {}}
+    baseline["machine"] = results["machine"]
+    baseline["created"] = results["created"]
+    baseline["benchmarks"].update({name: r for name, r in results["benchmarks"].items() if r["status"] == "ok"})
+    baseline["benchmarks"] = dict(sorted(baseline["benchmarks"].items()))
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+    tmp_path.replace(path)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> dict:
+    """Per-benchmark change in median against the baseline, in percent; positive is slower."""
+    comparison = {}
+    for name, result in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if result["status"] != "ok" or not base:
+            continue
+        if base.get("params") != result.get("params"):
+            comparison[name] = {"status": "incomparable", "reason": "parameters differ from baseline"}
+            continue
+        change = (result["median"] - base["median"]) / base["median"] * 100 if base["median"] else 0.0
+        comparison[name] = {
+            "status": "regression" if change > threshold else ("improvement" if change < -threshold else "ok"),
+            "baseline_median": base["median"],
+            "change_percent": round(change, 2),
+        }
+    return comparison
+
+
+def run_benchmarks(names: list, repeat: Optional[int] = None, cheatcodes: Optional[Path] = None) -> dict:
+    results = {}
+    for name in names:
+        fn, default_repeat = BENCHMARKS[name]
+        kwargs = {"cheatcodes": cheatcodes} if name == "vm_generate" else {}
+        try:
+            results[name] = fn(repeat or default_repeat, **kwargs)
+        except Exception as e:
+            results[name] = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "benchmarks": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VaultChain Python toolchain")
+    parser.add_argument("-k", "--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, help="runs per benchmark (default: per benchmark)")
+    parser.add_argument("--cheatcodes", type=Path, help="real cheatcodes.json for vm_generate")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="exit 2 instead of warning when there is no baseline to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="regression threshold in percent of the baseline median")
+    parser.add_argument("-o", "--output", type=Path, help="write results as JSON")
+    parser.add_argument("--json", action="store_true", help="print results as JSON instead of a table")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.only or list(BENCHMARKS), args.repeat, args.cheatcodes)
+    baseline = load_baseline(args.baseline)
+    if baseline is None and not args.save_baseline:
+        print(f"{'Error' if args.require_baseline else 'Warning'}: no baseline at {args.baseline}; "
+              f"nothing was compared. Record one with --save-baseline.", file=sys.stderr)
+    if baseline and baseline.get("machine") != results["machine"]:
+        print("Warning: baseline was recorded on a different machine; timings may not be comparable",
+              file=sys.stderr)
+    results["threshold"] = args.threshold
+    results["comparison"] = compare(results, baseline, args.threshold) if baseline else {}
+    regressions = sorted(n for n, c in results["comparison"].items() if c["status"] == "regression")
+    results["regressions"] = regressions
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'benchmark':16} {'median':>11} {'ops/s':>12} {'vs baseline':>12}")
+        for name, result in results["benchmarks"].items():
+            if result["status"] != "ok":
+                print(f"{name:16} {result['status']}: {result['reason']}")
+                continue
+            cmp = results["comparison"].get(name, {})
+            change = f"{cmp['change_percent']:+.1f}%" if "change_percent" in cmp else "-"
+            flag = "  REGRESSION" if cmp.get("status") == "regression" else ""
+            print(f"{name:16} {result['median'] * 1000:>9.2f}ms {result['ops_per_second'] or 0:>12,.0f} "
+                  f"{change:>12}{flag}")
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+    if baseline is None and args.require_baseline and not args.save_baseline:
+        raise SystemExit(2)
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
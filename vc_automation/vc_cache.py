@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa View-Call Cache
+---------------------------------
+A block-aware read-through cache for contract view calls such as
+getLoanDetails, getKycStatus, isRegistered and getActiveLoanId:
+  • Entries keyed by (contract, selector, args, block) with LRU eviction
+    and an approximate memory cap
+  • "latest" entries survive new blocks unless the contract, or one of the
+    contracts it reads from, was active in them
+  • Hit / miss / eviction / invalidation counters
+
+A contract counts as active in a block when it emitted a log or was the
+direct recipient of a transaction. The second check matters here because
+several state changes (updateKyc, registerMemberFor, updateLoanStatus) emit
+no events at all.
+
+Usage:
+    python vc_automation/vc_cache.py --rpc-url http://127.0.0.1:8545 --rounds 20
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from web3 import Web3
+
+from vc_helpers import load_abi, load_deployment
+
+# Contracts whose views read state held by other contracts. An entry for the
+# key contract is invalidated when any contract in its set is active.
+LOAN_MANAGER_READS_FROM = ("LoanManager", "LoanLogicFixed", "LoanCore", "MembershipModule")
+
+# Beyond this many blocks behind, scanning for activity costs more than
+# simply flushing the "latest" entries.
+MAX_CATCHUP_BLOCKS = 256
+
+# ======================================================================
+# === SIZE ESTIMATION ===
+# ======================================================================
+def approx_size(obj) -> int:
+    """Rough recursive size in bytes of a decoded call result or key."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list)):
+        size += sum(approx_size(item) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in obj.items())
+    return size
+
+
+def freeze(value):
+    """Make call arguments hashable (address[] arrays arrive as lists)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+# ======================================================================
+# === CACHE ===
+# ======================================================================
+class ViewCache:
+    """Read-through cache in front of ContractFunction.call()."""
+
+    def __init__(self, w3: Web3,
+                 max_entries: int = 50_000,
+                 max_bytes: int = 32 * 1024 * 1024,
+                 dependencies: Optional[dict] = None):
+        self.w3 = w3
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.block: Optional[int] = None
+
+        # source address -> cached addresses that read from it
+        self._dependents: dict = {}
+        for address, reads_from in (dependencies or {}).items():
+            for source in reads_from:
+                self._dependents.setdefault(source.lower(), set()).add(address.lower())
+
+        self._entries: OrderedDict = OrderedDict()   # key -> (value, size)
+        self._by_address: dict = {}                   # address -> set(keys) for "latest" entries
+        self._selectors: dict = {}                    # signature -> 4-byte selector
+        self._generation: dict = {}                   # address -> invalidations so far
+        self._flushes = 0
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # ------------------------------------------------------------------
+    def _selector(self, signature: str) -> str:
+        selector = self._selectors.get(signature)
+        if selector is None:
+            selector = Web3.keccak(text=signature)[:4].hex()
+            self._selectors[signature] = selector
+        return selector
+
+    def _key(self, fn, block) -> tuple:
+        return (fn.address.lower(), self._selector(fn.signature), freeze(fn.args), block)
+
+    def _store(self, key: tuple, value) -> None:
+        size = approx_size(key) + approx_size(value)
+        self._entries[key] = (value, size)
+        self._bytes += size
+        if key[3] is None:
+            self._by_address.setdefault(key[0], set()).add(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            old_key, _ = next(iter(self._entries.items()))
+            self._drop(old_key)
+            self.evictions += 1
+
+    def _drop(self, key: tuple) -> None:
+        _, size = self._entries.pop(key)
+        self._bytes -= size
+        if key[3] is None:
+            keys = self._by_address.get(key[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_address[key[0]]
+
+    # ------------------------------------------------------------------
+    def call(self, fn, block_identifier="latest"):
+        """Return fn.call(block_identifier=...) from cache when possible.
+
+        Calls pinned to a block number are immutable and cached forever (until
+        evicted); "latest" calls are cached until invalidated by activity.
+        """
+        block = None if block_identifier == "latest" else int(block_identifier)
+        key = self._key(fn, block)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = (self._flushes, self._generation.get(key[0], 0))
+
+        value = fn.call(block_identifier=block_identifier)
+        with self._lock:
+            # A "latest" result read before an invalidation that landed while
+            # the call was in flight may already be stale: return it, don't cache it
+            stale = block is None and generation != (self._flushes, self._generation.get(key[0], 0))
+            if not stale and key not in self._entries:
+                self._store(key, value)
+        return value
+
+    def invalidate_addresses(self, addresses: Iterable[str]) -> int:
+        """Drop "latest" entries for the given contracts and their dependents."""
+        targets = set()
+        for address in addresses:
+            address = address.lower()
+            targets.add(address)
+            targets |= self._dependents.get(address, set())
+
+        dropped = 0
+        with self._lock:
+            for address in targets:
+                self._generation[address] = self._generation.get(address, 0) + 1
+                for key in list(self._by_address.get(address, ())):
+                    self._drop(key)
+                    dropped += 1
+            self.invalidations += dropped
+        return dropped
+
+    def flush_latest(self) -> int:
+        with self._lock:
+            self._flushes += 1
+            return self.invalidate_addresses(list(self._by_address))
+
+    def active_addresses(self, from_block: int, to_block: int) -> set:
+        """Contracts that emitted logs or received transactions in a block range."""
+        with self._lock:
+            watched = set(self._by_address) | set(self._dependents)
+        if not watched:
+            return set()
+
+        logs = self.w3.eth.get_logs({
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "address": [Web3.to_checksum_address(a) for a in watched],
+        })
+        active = {log["address"].lower() for log in logs}
+        for number in range(from_block, to_block + 1):
+            block = self.w3.eth.get_block(number, full_transactions=True)
+            active |= {tx["to"].lower() for tx in block["transactions"] if tx.get("to")}
+        return active
+
+    def on_new_block(self, block_number: int) -> int:
+        """Advance to block_number, invalidating only entries touched since the last block seen."""
+        if self.block is None:
+            self.block = block_number
+            return 0
+        if block_number <= self.block:
+            return 0
+
+        from_block = self.block + 1
+        if block_number - from_block >= MAX_CATCHUP_BLOCKS:
+            dropped = self.flush_latest()
+        else:
+            dropped = self.invalidate_addresses(self.active_addresses(from_block, block_number))
+        self.block = block_number
+        return dropped
+
+    def sync(self) -> int:
+        """Poll the node for its head block and apply any invalidations."""
+        return self.on_new_block(self.w3.eth.block_number)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "block": self.block,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def loan_manager_dependencies(deployment: dict) -> dict:
+    """Dependency map for the LoanManager views, from a deployment summary."""
+    loan_manager = deployment.get("LoanManager")
+    if not loan_manager:
+        return {}
+    return {loan_manager: [deployment[name] for name in LOAN_MANAGER_READS_FROM if name in deployment]}
+
+# ======================================================================
+# === BENCHMARK ===
+# ======================================================================
+def dashboard_queries(loan_manager, members: list, loan_ids: list) -> list:
+    """The view calls a typical member dashboard refresh issues."""
+    queries = []
+    for member in members:
+        queries.append(loan_manager.functions.isRegistered(member))
+        queries.append(loan_manager.functions.getKycStatus(member))
+        queries.append(loan_manager.functions.getActiveLoanId(member))
+    for loan_id in loan_ids:
+        queries.append(loan_manager.functions.getLoanDetails(loan_id))
+    return queries
+
+
+def benchmark(w3: Web3, deployment: dict, rounds: int = 20) -> dict:
+    """Compare uncached and cached dashboard refreshes against a node."""
+    loan_manager = w3.eth.contract(address=deployment["LoanManager"], abi=load_abi("LoanManager"))
+    members = w3.eth.accounts[:10]
+    queries = dashboard_queries(loan_manager, members, list(range(1, 11)))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for fn in queries:
+            fn.call()
+    uncached = time.perf_counter() - start
+
+    cache = ViewCache(w3, dependencies=loan_manager_dependencies(deployment))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cache.sync()
+        for fn in queries:
+            cache.call(fn)
+    cached = time.perf_counter() - start
+
+    return {
+        "rounds": rounds,
+        "queries_per_round": len(queries),
+        "uncached_s": uncached,
+        "cached_s": cached,
+        "speedup": uncached / cached if cached else None,
+        "cache": cache.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard-style view calls with and without the cache")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    parser.add_argument("--chain-id", type=int, default=31337)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    deployment = load_deployment(args.chain_id)
+    if "LoanManager" not in deployment:
+        parser.error("No LoanManager found in the latest deployment summary.")
+
+    w3 = Web3(Web3.HTTPProvider(args.rpc_url))
+    print(json.dumps(benchmark(w3, deployment, args.rounds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+VaultChain Africa Per-Contract Deployment
+-----------------------------------------
+Deploys the core contracts one at a time with `forge create`, mirroring
+script/Deploy.s.sol, so that a subset can be redeployed without touching
+the rest:
+  • Deployment specs: source, constructor arguments, post-deploy calls and
+    the contracts each one depends on
+  • Dependency closure and deploy ordering
+  • Deployment summaries compatible with stage 3
+"""
+import datetime
+import json
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+
+from vc_automation import log, run_command
+from vc_helpers import DEPLOYMENTS_DIR
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# Argument placeholders: a contract name resolves to its deployed address,
+# ADMIN to the deployer, [ADMIN] to a one-element address array.
+ADMIN = "$admin"
+ADMIN_LIST = "[$admin]"
+
+# Keep in the same order as script/Deploy.s.sol.
+DEPLOY_SPECS = {
+    "MembershipModule": {
+        "source": "contracts/membership/MembershipModule.sol",
+        "depends_on": (),
+        "constructor_args": (),
+    },
+    "LoanCore": {
+        "source": "contracts/loan/LoanCore.sol",
+        "depends_on": ("MembershipModule",),
+        "constructor_args": ("MembershipModule",),
+    },
+    "LoanLogicFixed": {
+        "source": "contracts/loan/LoanLogicFixed.sol",
+        "depends_on": ("LoanCore", "MembershipModule"),
+        "constructor_args": ("LoanCore", "MembershipModule", ADMIN),
+    },
+    "LoanManager": {
+        "source": "contracts/loan/LoanManager.sol",
+        "depends_on": ("LoanCore", "LoanLogicFixed", "MembershipModule"),
+        "constructor_args": (),
+        "post_deploy": (
+            "initialize(address,address,address,address,address[])",
+            ("LoanCore", "LoanLogicFixed", "MembershipModule", ADMIN, ADMIN_LIST),
+        ),
+    },
+    "VaultChain": {
+        "source": "contracts/core/VaultChain.sol",
+        "depends_on": ("MembershipModule", "LoanManager"),
+        "constructor_args": ("MembershipModule", "LoanManager", "LoanManager",
+                             ZERO_ADDRESS, ZERO_ADDRESS, ZERO_ADDRESS,
+                             ZERO_ADDRESS, ZERO_ADDRESS, ZERO_ADDRESS),
+    },
+}
+DEPLOY_ORDER = tuple(DEPLOY_SPECS)
+
+# ======================================================================
+# === DEPENDENCY RESOLUTION ===
+# ======================================================================
+def with_dependents(changed: Iterable[str]) -> list:
+    """Changed contracts plus everything that (transitively) depends on them, in deploy order."""
+    selected = set(changed)
+    for name in DEPLOY_ORDER:
+        if any(dep in selected for dep in DEPLOY_SPECS[name]["depends_on"]):
+            selected.add(name)
+    return [name for name in DEPLOY_ORDER if name in selected]
+
+
+def resolve_arg(arg: str, addresses: dict, admin: str) -> str:
+    if arg == ADMIN:
+        return admin
+    if arg == ADMIN_LIST:
+        return f"[{admin}]"
+    if arg in DEPLOY_SPECS:
+        if arg not in addresses:
+            raise KeyError(f"No address known for dependency {arg}")
+        return addresses[arg]
+    return arg
+
+# ======================================================================
+# === DEPLOYMENT ===
+# ======================================================================
+def deploy_contract(name: str, addresses: dict, rpc_url: str,
+                    private_key: str, admin: str) -> Optional[str]:
+    """Deploy one contract (and run its post-deploy call); returns its address."""
+    spec = DEPLOY_SPECS[name]
+    cmd = [
+        "forge", "create", f"{spec['source']}:{name}",
+        "--rpc-url", rpc_url,
+        "--private-key", private_key,
+        "--broadcast",
+    ]
+    if spec["constructor_args"]:
+        cmd += ["--constructor-args"] + [resolve_arg(a, addresses, admin) for a in spec["constructor_args"]]
+
+    code, stdout, _ = run_command(cmd)
+    match = re.search(r"Deployed to:\s*(0x[0-9a-fA-F]{40})", stdout or "")
+    if code != 0 or not match:
+        log(f"Deployment of {name} failed.")
+        return None
+    address = match.group(1)
+
+    if "post_deploy" in spec:
+        signature, args = spec["post_deploy"]
+        code, _, _ = run_command([
+            "cast", "send", address, signature,
+            *[resolve_arg(a, addresses, admin) for a in args],
+            "--rpc-url", rpc_url,
+            "--private-key", private_key,
+        ])
+        if code != 0:
+            log(f"Post-deploy call {signature} on {name} failed.")
+            return None
+
+    log(f"DeployedContract:{name}:{address}")
+    return address
+
+
+def deploy_contracts(names: Iterable[str], addresses: dict, rpc_url: str,
+                     private_key: str, admin: str) -> dict:
+    """Deploy the given contracts in dependency order on top of existing addresses.
+
+    Returns the updated address book; stops at the first failure.
+    """
+    addresses = dict(addresses)
+    for name in [n for n in DEPLOY_ORDER if n in set(names)]:
+        address = deploy_contract(name, addresses, rpc_url, private_key, admin)
+        if address is None:
+            break
+        addresses[name] = address
+    return addresses
+
+
+def save_deployment(addresses: dict, chain_id: int = 31337) -> Path:
+    """Write a deployment_summary_<timestamp>.json in the stage 3 layout."""
+    chain_folder = DEPLOYMENTS_DIR / str(chain_id)
+    chain_folder.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    path = chain_folder / f"deployment_summary_{timestamp}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(addresses, f, indent=4)
+    return path
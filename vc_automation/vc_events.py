@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Event Watcher
+-------------------------------
+Push-based receipts and events over one websocket connection:
+  • eth_subscribe to newHeads and to logs from LoanManager, LoanCore and
+    MembershipModule
+  • Many pending receipt futures resolved per block with a single
+    eth_getBlockReceipts call (per-hash lookups where it is unsupported)
+  • Decoded events fanned out to registered async handlers, in chain order
+  • Automatic reconnect; blocks from the last head seen onwards are
+    backfilled with eth_getLogs before live events resume
+
+Handlers run on a dispatch task, so a slow handler delays later events but
+never the websocket reader. Logs are deduplicated on (blockHash, logIndex),
+which makes the overlap between backfill and the live subscription harmless.
+
+Usage:
+    async with EventWatcher("ws://127.0.0.1:8545", load_deployment()) as watcher:
+        watcher.on("LoanCreated", handle_loan_created)
+        receipt = await watcher.wait_for_receipt(tx_hash)
+
+    python vc_automation/vc_events.py --ws-url ws://127.0.0.1:8545 [--from-block 0]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from web3 import Web3
+from web3._utils.events import get_event_data
+from web3._utils.method_formatters import log_entry_formatter
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from vc_helpers import load_abi, load_deployment
+
+WATCHED_CONTRACTS = ("LoanManager", "LoanCore", "MembershipModule")
+GET_LOGS_RANGE = 2_000
+SEEN_LOGS_LIMIT = 50_000
+
+Handler = Callable[[dict], Awaitable[None]]
+
+# ======================================================================
+# === EVENT DECODING ===
+# ======================================================================
+def event_abis(contract_names) -> dict:
+    """Map topic0 -> (contract name, event ABI) for the given contracts."""
+    topics = {}
+    for name in contract_names:
+        for item in load_abi(name):
+            if item.get("type") != "event" or item.get("anonymous"):
+                continue
+            signature = f"{item['name']}({','.join(_abi_type(i) for i in item['inputs'])})"
+            topics["0x" + Web3.keccak(text=signature).hex()] = (name, item)
+    return topics
+
+
+def _abi_type(param: dict) -> str:
+    if param["type"].startswith("tuple"):
+        return f"({','.join(_abi_type(c) for c in param['components'])}){param['type'][5:]}"
+    return param["type"]
+
+
+def _log_key(log: dict) -> tuple:
+    return log["blockHash"], log["logIndex"]
+
+# ======================================================================
+# === WATCHER ===
+# ======================================================================
+class EventWatcher:
+    """One websocket connection serving receipts, block heads and contract events."""
+
+    def __init__(self, ws_url: str, deployment: dict,
+                 contracts=WATCHED_CONTRACTS,
+                 from_block: Optional[int] = None,
+                 reconnect_delay: float = 0.5,
+                 max_reconnect_delay: float = 30.0):
+        self.ws_url = ws_url
+        self.names = {deployment[n].lower(): n for n in contracts if deployment.get(n)}
+        self.addresses = [Web3.to_checksum_address(a) for a in self.names]
+        self.topics = event_abis(self.names.values())
+        self.codec = Web3().codec
+        self.last_block = from_block
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+
+        self._handlers: dict = {}          # event name or "*" -> [Handler]
+        self._block_handlers: list = []
+        self._receipts: dict = {}          # tx hash -> Future
+        self._requests: dict = {}          # request id -> Future
+        self._ids = itertools.count(1)
+        self._subscriptions: dict = {}     # subscription id -> "newHeads" | "logs"
+        self._seen: OrderedDict = OrderedDict()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._held: Optional[list] = None  # notifications held back during backfill
+        self._ws = None
+        self._connected = asyncio.Event()
+        self._block_receipts_supported = True
+        self._tasks: list = []
+
+    # ------------------------------------------------------------------
+    def on(self, event_name: str, handler: Handler) -> None:
+        """Call handler for each decoded event of that name ("*" for all)."""
+        self._handlers.setdefault(event_name, []).append(handler)
+
+    def on_block(self, handler: Handler) -> None:
+        self._block_handlers.append(handler)
+
+    async def wait_for_receipt(self, tx_hash: str, timeout: Optional[float] = 120.0) -> dict:
+        """Receipt of a transaction, returned once it is mined."""
+        tx_hash = tx_hash.lower()
+        future = self._receipts.get(tx_hash)
+        if future is None:
+            future = self._receipts[tx_hash] = asyncio.get_running_loop().create_future()
+            if self._ws is not None:
+                # It may be mined already: check now rather than on the next head.
+                asyncio.ensure_future(self._check_receipts([tx_hash]))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if self._receipts.get(tx_hash) is future:
+                del self._receipts[tx_hash]
+            raise
+
+    async def __aenter__(self) -> "EventWatcher":
+        runner = asyncio.ensure_future(self.run())
+        self._tasks = [runner, asyncio.ensure_future(self._dispatch())]
+        connected = asyncio.ensure_future(self._connected.wait())
+        await asyncio.wait([connected, runner], return_when=asyncio.FIRST_COMPLETED)
+        if runner.done():
+            connected.cancel()
+            await self.close()
+            runner.result()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for future in list(self._receipts.values()) + list(self._requests.values()):
+            if not future.done():
+                future.cancel()
+
+    # ------------------------------------------------------------------
+    async def request(self, method: str, params: list):
+        """JSON-RPC call multiplexed on the websocket connection."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._requests[request_id] = future
+        try:
+            await self._ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id,
+                                            "method": method, "params": params}))
+            return await future
+        finally:
+            self._requests.pop(request_id, None)
+            if future.done() and not future.cancelled():
+                future.exception()  # the send may have failed after the reader failed it
+
+    async def run(self) -> None:
+        """Connect, subscribe, backfill and read until cancelled; reconnects on failure."""
+        delay = self.reconnect_delay
+        while True:
+            reason = "closed by the node"
+            try:
+                async with connect(self.ws_url, max_size=None) as ws:
+                    self._ws = ws
+                    reader = asyncio.ensure_future(self._read(ws))
+                    try:
+                        await self._start_session()
+                        delay = self.reconnect_delay
+                        self._connected.set()
+                        await reader
+                    finally:
+                        reader.cancel()
+            except (ConnectionClosed, OSError, asyncio.TimeoutError) as e:
+                reason = repr(e)
+            self._ws = None
+            self._held = None
+            self._fail_requests(reason)
+            self.reconnects += 1
+            print(f"Websocket lost ({reason}); reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _start_session(self) -> None:
+        self._subscriptions.clear()
+        # Subscribe before backfilling so nothing falls between the two.
+        # Live notifications are held until the backfill is queued, then
+        # deduplicated against it; if the session fails they are dropped
+        # and the next backfill covers them, as last_block has not moved.
+        self._held = []
+        heads = await self.request("eth_subscribe", ["newHeads"])
+        logs = await self.request("eth_subscribe", ["logs", {"address": self.addresses}])
+        self._subscriptions[heads] = "newHeads"
+        self._subscriptions[logs] = "logs"
+
+        head = int(await self.request("eth_blockNumber", []), 16)
+        if self.last_block is not None and self.last_block <= head:
+            # Inclusive: logs of the last head seen may not all have arrived.
+            await self._backfill(self.last_block, head)
+        self.last_block = head if self.last_block is None else max(self.last_block, head)
+        held, self._held = self._held, None
+        for item in held:
+            self._queue.put_nowait(item)
+        if self._receipts:
+            await self._check_receipts(list(self._receipts))
+
+    async def _backfill(self, start: int, end: int) -> None:
+        for chunk_start in range(start, end + 1, GET_LOGS_RANGE):
+            chunk_end = min(chunk_start + GET_LOGS_RANGE - 1, end)
+            logs = await self.request("eth_getLogs", [{
+                "address": self.addresses,
+                "fromBlock": hex(chunk_start),
+                "toBlock": hex(chunk_end),
+            }])
+            for log in logs:
+                self._queue.put_nowait(("log", log))
+
+    async def _read(self, ws) -> None:
+        try:
+            await self._read_messages(ws)
+        finally:
+            self._fail_requests("reader stopped")
+
+    async def _read_messages(self, ws) -> None:
+        async for message in ws:
+            payload = json.loads(message)
+            for item in payload if isinstance(payload, list) else [payload]:
+                if "id" in item and item["id"] in self._requests:
+                    future = self._requests[item["id"]]
+                    if future.done():
+                        continue
+                    if "error" in item:
+                        future.set_exception(RuntimeError(f"RPC error: {item['error']}"))
+                    else:
+                        future.set_result(item.get("result"))
+                elif item.get("method") == "eth_subscription":
+                    params = item["params"]
+                    kind = self._subscriptions.get(params["subscription"])
+                    if kind is None:
+                        continue
+                    entry = ("head" if kind == "newHeads" else "log", params["result"])
+                    if self._held is not None:
+                        self._held.append(entry)
+                    else:
+                        self._queue.put_nowait(entry)
+
+    def _fail_requests(self, reason: str) -> None:
+        for future in self._requests.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"websocket closed: {reason}"))
+
+    # ------------------------------------------------------------------
+    async def _dispatch(self) -> None:
+        while True:
+            kind, item = await self._queue.get()
+            try:
+                if kind == "head":
+                    await self._on_head(item)
+                else:
+                    await self._on_log(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Handler error on {kind}: {e!r}")
+
+    async def _on_head(self, head: dict) -> None:
+        self.last_block = max(self.last_block or 0, int(head["number"], 16))
+        if self._receipts:
+            asyncio.ensure_future(self._resolve_block_receipts(head))
+        for handler in self._block_handlers:
+            await handler(head)
+
+    async def _on_log(self, log: dict) -> None:
+        key = _log_key(log)
+        if log.get("removed"):
+            self._seen.pop(key, None)
+        elif key in self._seen:
+            return
+        else:
+            self._seen[key] = None
+            if len(self._seen) > SEEN_LOGS_LIMIT:
+                self._seen.popitem(last=False)
+
+        event = self.decode(log)
+        for handler in self._handlers.get(event["event"], []) + self._handlers.get("*", []):
+            await handler(event)
+
+    def decode(self, log: dict) -> dict:
+        """Decoded event with the emitting contract's name; unknown topics keep the raw log."""
+        topics = log.get("topics") or []
+        known = self.topics.get(topics[0]) if topics else None
+        contract = self.names.get(log["address"].lower())
+        if known is None:
+            return {"event": "<unknown>", "contract": contract, "args": {}, "log": log,
+                    "removed": bool(log.get("removed"))}
+        event = dict(get_event_data(self.codec, known[1], log_entry_formatter(log)))
+        event.update(contract=contract, removed=bool(log.get("removed")), log=log)
+        return event
+
+    # ------------------------------------------------------------------
+    async def _resolve_block_receipts(self, head: dict) -> None:
+        if self._block_receipts_supported:
+            try:
+                receipts = await self.request("eth_getBlockReceipts", [head["number"]])
+            except ConnectionError:
+                return
+            except RuntimeError:
+                self._block_receipts_supported = False
+            else:
+                for receipt in receipts or []:
+                    self._resolve(receipt)
+                return
+        await self._check_receipts(list(self._receipts))
+
+    async def _check_receipts(self, tx_hashes: list) -> None:
+        try:
+            receipts = await asyncio.gather(*(self.request("eth_getTransactionReceipt", [h])
+                                              for h in tx_hashes))
+        except (ConnectionError, ConnectionClosed, RuntimeError):
+            return  # checked again on the next head or after reconnect
+        for receipt in receipts:
+            if receipt:
+                self._resolve(receipt)
+
+    def _resolve(self, receipt: dict) -> None:
+        future = self._receipts.pop(receipt["transactionHash"].lower(), None)
+        if future is not None and not future.done():
+            future.set_result(receipt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream VaultChain contract events over websockets")
+    parser.add_argument("--ws-url", default="ws://127.0.0.1:8545")
+    parser.add_argument("--chain-id", type=int, default=31337)
+    parser.add_argument("--from-block", type=int, help="backfill from this block before streaming")
+    args = parser.parse_args()
+
+    deployment = load_deployment(args.chain_id)
+    if not any(deployment.get(n) for n in WATCHED_CONTRACTS):
+        parser.error("No LoanManager, LoanCore or MembershipModule address in the latest deployment summary")
+
+    async def print_event(event: dict) -> None:
+        args_text = ", ".join(f"{k}={v}" for k, v in event["args"].items())
+        flag = " (removed)" if event["removed"] else ""
+        print(f"#{int(event['log']['blockNumber'], 16)} {event['contract']}.{event['event']}({args_text}){flag}")
+
+    async def print_block(head: dict) -> None:
+        print(f"-- block {int(head['number'], 16)}")
+
+    async def run():
+        watcher = EventWatcher(args.ws_url, deployment, from_block=args.from_block)
+        watcher.on("*", print_event)
+        watcher.on_block(print_block)
+        async with watcher:
+            print(f"Watching {', '.join(watcher.names.values())} on {args.ws_url}")
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
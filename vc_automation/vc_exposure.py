@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Guarantor Exposure Index
+------------------------------------------
+In-memory graph of borrower <-> loan <-> guarantor edges from LoanCore:
+  • Per-guarantor exposure totals kept up to date on every loan change, so
+    "what is X on the hook for" costs O(degree) instead of a full scan
+  • Concentration rankings (top guarantors, share of total, HHI)
+  • Incremental sync: new loans from LoanCreated events, status/amount
+    changes of open loans from one batched storage round, guarantor flags
+    from MembershipModule MemberApproved events
+  • gzip-JSON snapshots, so a restart resumes from the last synced block
+
+Status changes and repayments emit no LoanCore events, but they only touch
+loans that are still open; closed loans (FullyRepaid, Repaid, Defaulted)
+and every loan's guarantor list are never rewritten after creation, so only
+open loans' status and amount words are re-read on each sync.
+
+Each guarantor of an active loan (Disbursed, PartiallyRepaid) is exposed to
+an equal share of the outstanding amount, or to all of it with --joint.
+
+Usage:
+    python vc_automation/vc_exposure.py --snapshot exposure.json.gz [--top 20]
+    python vc_automation/vc_exposure.py --snapshot exposure.json.gz --guarantor 0xabc...
+"""
+import argparse
+import gzip
+import heapq
+import json
+from pathlib import Path
+from typing import Optional
+
+import requests
+from eth_utils import keccak
+
+from vc_helpers import ACTIVE_LOAN_STATUSES, LOAN_STATUSES, load_deployment
+from vc_state import StorageReader, batch_rpc, decode, decode_mapping, load_storage_layout, mapping_slot, slot_of
+
+CLOSED_STATUSES = tuple(LOAN_STATUSES.index(s) for s in ("FullyRepaid", "Repaid", "Defaulted"))
+DEFAULTED = LOAN_STATUSES.index("Defaulted")
+
+LOAN_CREATED_TOPIC = "0x" + keccak(text="LoanCreated(uint256,address,uint256)").hex()
+MEMBER_APPROVED_TOPIC = "0x" + keccak(text="MemberApproved(address,uint256,bool)").hex()
+
+# ======================================================================
+# === INDEX ===
+# ======================================================================
+class ExposureIndex:
+    """Loans keyed by id plus adjacency sets and running exposure totals.
+
+    Every mutation goes through upsert_loan, which removes the old
+    contribution of a loan and adds the new one in O(guarantors).
+    """
+
+    def __init__(self, joint: bool = False):
+        self.joint = joint
+        self.loans: dict = {}            # loan id -> {borrower, amount, status, guarantors}
+        self.by_guarantor: dict = {}     # guarantor -> set of loan ids
+        self.by_borrower: dict = {}      # borrower -> set of loan ids
+        self.exposure: dict = {}         # guarantor -> outstanding amount on active loans
+        self.defaulted: dict = {}        # guarantor -> amount on defaulted loans
+        self.flags: dict = {}            # member -> MembershipModule isGuarantor
+        self.total_exposure = 0
+        self.last_block: Optional[int] = None
+
+    def _share(self, loan: dict) -> int:
+        guarantors = loan["guarantors"]
+        if not guarantors:
+            return 0
+        return loan["amount"] if self.joint else loan["amount"] // len(guarantors)
+
+    def _apply(self, loan: dict, sign: int) -> None:
+        share = self._share(loan) * sign
+        if loan["status"] in ACTIVE_LOAN_STATUSES:
+            totals = self.exposure
+            self.total_exposure += share * len(loan["guarantors"])
+        elif loan["status"] == DEFAULTED:
+            totals = self.defaulted
+        else:
+            return
+        for g in loan["guarantors"]:
+            value = totals.get(g, 0) + share
+            if value:
+                totals[g] = value
+            else:
+                totals.pop(g, None)
+
+    def upsert_loan(self, loan_id: int, borrower: str, amount: int, status: int, guarantors) -> None:
+        old = self.loans.get(loan_id)
+        if old is not None:
+            self._apply(old, -1)
+        loan = {"borrower": borrower.lower(), "amount": amount, "status": status,
+                "guarantors": tuple(g.lower() for g in guarantors)}
+        self.loans[loan_id] = loan
+        if old is None:
+            self.by_borrower.setdefault(loan["borrower"], set()).add(loan_id)
+            for g in loan["guarantors"]:
+                self.by_guarantor.setdefault(g, set()).add(loan_id)
+        self._apply(loan, 1)
+
+    def update_loan(self, loan_id: int, amount: int, status: int) -> bool:
+        """Apply a status/amount change to a known loan; returns whether anything changed."""
+        loan = self.loans[loan_id]
+        if loan["amount"] == amount and loan["status"] == status:
+            return False
+        self.upsert_loan(loan_id, loan["borrower"], amount, status, loan["guarantors"])
+        return True
+
+    def open_loans(self) -> list:
+        return [i for i, loan in self.loans.items() if loan["status"] not in CLOSED_STATUSES]
+
+    # ------------------------------------------------------------------
+    def guarantor_exposure(self, guarantor: str) -> dict:
+        """Exposure of one guarantor with a per-loan breakdown, in O(degree)."""
+        guarantor = guarantor.lower()
+        loans = []
+        for loan_id in sorted(self.by_guarantor.get(guarantor, ())):
+            loan = self.loans[loan_id]
+            loans.append({
+                "loan_id": loan_id,
+                "borrower": loan["borrower"],
+                "status": LOAN_STATUSES[loan["status"]],
+                "outstanding": loan["amount"],
+                "share": self._share(loan),
+                "co_guarantors": len(loan["guarantors"]) - 1,
+            })
+        return {
+            "guarantor": guarantor,
+            "is_guarantor": self.flags.get(guarantor),
+            "exposure": self.exposure.get(guarantor, 0),
+            "defaulted": self.defaulted.get(guarantor, 0),
+            "loans": loans,
+        }
+
+    def borrower_guarantors(self, borrower: str) -> set:
+        """Everyone guaranteeing any loan of a borrower."""
+        return {g for i in self.by_borrower.get(borrower.lower(), ()) for g in self.loans[i]["guarantors"]}
+
+    def concentration(self, top: int = 20) -> dict:
+        """Largest exposures, their share of the total, and the HHI across guarantors."""
+        total = self.total_exposure
+        largest = heapq.nlargest(top, self.exposure.items(), key=lambda kv: kv[1])
+        hhi = sum((v / total) ** 2 for v in self.exposure.values()) if total else 0.0
+        return {
+            "total_exposure": total,
+            "guarantors": len(self.exposure),
+            "hhi": round(hhi, 6),
+            "top": [{"guarantor": g, "exposure": v, "share": round(v / total, 6) if total else 0.0,
+                     "active_loans": sum(1 for i in self.by_guarantor[g]
+                                         if self.loans[i]["status"] in ACTIVE_LOAN_STATUSES),
+                     "is_guarantor": self.flags.get(g)}
+                    for g, v in largest],
+            "unflagged_guarantors": sorted(g for g in self.exposure if self.flags.get(g) is False),
+        }
+
+    # ------------------------------------------------------------------
+    def save(self, path) -> None:
+        data = {
+            "joint": self.joint,
+            "last_block": self.last_block,
+            "loans": {str(i): [l["borrower"], l["amount"], l["status"], list(l["guarantors"])]
+                      for i, l in self.loans.items()},
+            "flags": self.flags,
+        }
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path, joint: Optional[bool] = None) -> "ExposureIndex":
+        """Load a snapshot; `joint` overrides the stored split (exposure is recomputed either way)."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(joint=data["joint"] if joint is None else joint)
+        for loan_id, (borrower, amount, status, guarantors) in data["loans"].items():
+            index.upsert_loan(int(loan_id), borrower, amount, status, guarantors)
+        index.flags = data["flags"]
+        index.last_block = data["last_block"]
+        return index
+
+# ======================================================================
+# === CHAIN SYNC ===
+# ======================================================================
+class ExposureSync:
+    """Brings an ExposureIndex up to date with LoanCore and MembershipModule."""
+
+    def __init__(self, index: ExposureIndex, rpc_url: str, addresses: dict, batch_size: int = 500):
+        self.index = index
+        self.rpc_url = rpc_url
+        self.loan_core = addresses["LoanCore"]
+        self.membership = addresses.get("MembershipModule")
+        self.batch_size = batch_size
+        self.session = requests.Session()
+        layout = load_storage_layout("LoanCore")
+        self.types = layout["types"]
+        self.loans_slot, _, self.loans_type = slot_of(layout, "loans")
+        loan_type = self.types[self.types[self.loans_type]["value"]]
+        self.members = {m["label"]: m for m in loan_type["members"]}
+
+    def _field(self, loan_id: int, label: str):
+        member = self.members[label]
+        base = mapping_slot("uint256", loan_id, self.loans_slot)
+        return decode(self.types, member["type"], base + int(member["slot"]), int(member["offset"]))
+
+    def sync(self, to_block: Optional[int] = None) -> dict:
+        """One incremental step up to `to_block` (default: latest)."""
+        index = self.index
+        (head,) = batch_rpc(self.session, self.rpc_url, [("eth_blockNumber", [])])
+        to_block = to_block if to_block is not None else int(head, 16)
+        from_block = 0 if index.last_block is None else index.last_block + 1
+        if from_block > to_block:
+            return {"block": index.last_block, "new_loans": 0, "changed": 0, "rounds": 0}
+
+        log_calls = [("eth_getLogs", [{"address": self.loan_core, "fromBlock": hex(from_block),
+                                       "toBlock": hex(to_block), "topics": [LOAN_CREATED_TOPIC]}])]
+        if self.membership:
+            log_calls.append(("eth_getLogs", [{"address": self.membership, "fromBlock": hex(from_block),
+                                               "toBlock": hex(to_block), "topics": [MEMBER_APPROVED_TOPIC]}]))
+        results = batch_rpc(self.session, self.rpc_url, log_calls)
+        new_ids = sorted({int(entry["topics"][1], 16) for entry in results[0]} - index.loans.keys())
+        for entry in results[1] if len(results) > 1 else []:
+            # data = abi.encode(shares, isGuarantor)
+            index.flags["0x" + entry["topics"][1][-40:]] = bool(int(entry["data"][2 + 64:2 + 128], 16))
+
+        open_ids = index.open_loans()
+        reader = StorageReader(self.session, self.rpc_url, self.loan_core, hex(to_block), self.batch_size)
+        decoders = [decode_mapping(self.types, self.loans_type, self.loans_slot, new_ids)]
+        decoders += [self._field(i, label) for i in open_ids for label in ("loan_amount", "status")]
+        results = reader.run(decoders)
+
+        for loan_id, loan in results[0].items():
+            index.upsert_loan(int(loan_id), loan["borrower"], loan["loan_amount"], loan["status"],
+                              loan["guarantors"])
+        changed = sum(index.update_loan(loan_id, results[1 + 2 * k], results[2 + 2 * k])
+                      for k, loan_id in enumerate(open_ids))
+        index.last_block = to_block
+        return {"block": to_block, "new_loans": len(new_ids), "changed": changed, "rounds": reader.rounds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guarantor exposure index")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    parser.add_argument("--chain-id", type=int, default=31337)
+    parser.add_argument("--snapshot", type=Path, help="load from and save to this gzip-JSON file")
+    parser.add_argument("--joint", action="store_true", help="every guarantor owes the full outstanding amount")
+    parser.add_argument("--no-sync", action="store_true", help="query the snapshot without touching the chain")
+    parser.add_argument("--guarantor", help="show one guarantor's exposure")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.snapshot and args.snapshot.exists():
+        index = ExposureIndex.load(args.snapshot, joint=args.joint)
+        print(f"Loaded {len(index.loans)} loans at block {index.last_block} from {args.snapshot}"
+              f" ({'joint' if index.joint else 'equal-share'} exposure)")
+    else:
+        index = ExposureIndex(joint=args.joint)
+
+    if not args.no_sync:
+        addresses = load_deployment(args.chain_id)
+        if "LoanCore" not in addresses:
+            parser.error("LoanCore address missing from the latest deployment summary")
+        stats = ExposureSync(index, args.rpc_url, addresses).sync()
+        print(f"Synced to block {stats['block']}: {stats['new_loans']} new loans, "
+              f"{stats['changed']} changed ({stats['rounds']} storage rounds)")
+        if args.snapshot:
+            index.save(args.snapshot)
+
+    report = index.guarantor_exposure(args.guarantor) if args.guarantor else index.concentration(args.top)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
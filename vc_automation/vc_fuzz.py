@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Fuzz Campaign Orchestrator
+--------------------------------------------
+Shards a forge fuzz campaign by seed across the cores of one machine:
+  • K `forge test` processes, each with its own --fuzz-seed and --fuzz-runs
+    budget and its own out/, cache and failure-persistence directories
+  • At most one process per core, each limited to its share of threads
+  • Counterexamples merged and deduplicated across shards
+  • Total fuzz executions per second
+
+The project is built once up front; every shard starts from a copy of that
+build, so shards never recompile or race on shared artifacts.
+
+Usage:
+    python vc_automation/vc_fuzz.py --shards 32 --runs 100000 --match-path "test/*.t.sol"
+"""
+import argparse
+import datetime
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from vc_helpers import OUT_DIR, PROJECT_ROOT, VC_DIR
+
+CACHE_DIR = PROJECT_ROOT / "cache"
+FUZZ_DIR = VC_DIR / "fuzz"
+LOGS_DIR = VC_DIR / "logs"
+
+DEFAULT_MATCH_PATHS = ("test/LoanManager.t.sol", "test/MembershipModule.t.sol")
+
+# ======================================================================
+# === SHARD EXECUTION ===
+# ======================================================================
+def prepare_shard_dir(shard_dir: Path) -> None:
+    """Give a shard private copies of the prebuilt out/ and cache/."""
+    if shard_dir.exists():
+        shutil.rmtree(shard_dir)
+    shard_dir.mkdir(parents=True)
+    shutil.copytree(OUT_DIR, shard_dir / "out")
+    if CACHE_DIR.exists():
+        shutil.copytree(CACHE_DIR, shard_dir / "cache")
+
+
+def run_shard(index: int, seed: int, runs: int, match_path: str,
+              shard_dir: Path, threads: int, timeout: int) -> dict:
+    """Run one forge fuzz shard and return its parsed JSON result."""
+    env = dict(os.environ)
+    env.update({
+        "FOUNDRY_OUT": str(shard_dir / "out"),
+        "FOUNDRY_CACHE_PATH": str(shard_dir / "cache"),
+        "FOUNDRY_FUZZ_FAILURE_PERSIST_DIR": str(shard_dir / "failures"),
+    })
+    cmd = [
+        "forge", "test",
+        "--match-path", match_path,
+        "--fuzz-seed", hex(seed),
+        "--fuzz-runs", str(runs),
+        "--threads", str(threads),
+        "--json",
+    ]
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(cmd, cwd=str(PROJECT_ROOT), env=env, capture_output=True,
+                              text=True, timeout=timeout, check=False)
+        elapsed = time.perf_counter() - start
+    except subprocess.TimeoutExpired:
+        return {"index": index, "seed": seed, "error": f"timed out after {timeout}s",
+                "elapsed": time.perf_counter() - start, "suites": {}}
+
+    (shard_dir / "stderr.log").write_text(proc.stderr or "", encoding="utf-8")
+    try:
+        suites = json.loads(proc.stdout) if proc.stdout.strip() else {}
+        error = None
+    except json.JSONDecodeError:
+        suites, error = {}, f"unparseable forge output (exit code {proc.returncode})"
+    return {"index": index, "seed": seed, "error": error, "elapsed": elapsed, "suites": suites}
+
+# ======================================================================
+# === MERGING ===
+# ======================================================================
+def fuzz_runs(test_result: dict) -> int:
+    kind = test_result.get("kind") or {}
+    fuzz = kind.get("Fuzz") or kind.get("fuzz") or {}
+    return int(fuzz.get("runs", 0))
+
+
+def counterexample_args(test_result: dict) -> Optional[str]:
+    counterexample = test_result.get("counterexample")
+    if not counterexample:
+        return None
+    single = counterexample.get("Single", counterexample) if isinstance(counterexample, dict) else {}
+    return single.get("args") or single.get("calldata") or json.dumps(counterexample, sort_keys=True)
+
+
+def merge_shards(shards: list) -> dict:
+    """Merge per-shard forge results into totals and deduplicated failures.
+
+    Failures are deduplicated on (suite, test, reason); every seed that hit a
+    failure is kept, along with the shortest counterexample seen.
+    """
+    total_runs = 0
+    failures = {}
+    for shard in shards:
+        for suite_name, suite in shard["suites"].items():
+            for test_name, result in (suite.get("test_results") or {}).items():
+                total_runs += fuzz_runs(result)
+                if result.get("status") != "Failure":
+                    continue
+                reason = result.get("reason") or ""
+                key = f"{suite_name}::{test_name}::{reason}"
+                args = counterexample_args(result)
+                entry = failures.setdefault(key, {
+                    "suite": suite_name,
+                    "test": test_name,
+                    "reason": reason,
+                    "counterexample": args,
+                    "seeds": [],
+                })
+                entry["seeds"].append(hex(shard["seed"]))
+                if args and (entry["counterexample"] is None or len(args) < len(entry["counterexample"])):
+                    entry["counterexample"] = args
+    return {"total_runs": total_runs, "failures": list(failures.values())}
+
+# ======================================================================
+# === CAMPAIGN ===
+# ======================================================================
+def run_campaign(shards: int, runs: int, match_path: str,
+                 base_seed: int, workers: Optional[int] = None,
+                 timeout: int = 8 * 3600) -> dict:
+    cpus = os.cpu_count() or 1
+    workers = min(workers or cpus, shards)
+    threads = max(1, cpus // workers)
+
+    print(f"Building once before sharding ({shards} shards, {workers} workers, {threads} thread(s) each)")
+    build = subprocess.run(["forge", "build"], cwd=str(PROJECT_ROOT), check=False)
+    if build.returncode != 0:
+        raise RuntimeError("forge build failed; fix the build before fuzzing")
+
+    shard_dirs = [FUZZ_DIR / f"shard_{i}" for i in range(shards)]
+    for shard_dir in shard_dirs:
+        prepare_shard_dir(shard_dir)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_shard, i, base_seed + i, runs, match_path, shard_dirs[i], threads, timeout)
+            for i in range(shards)
+        ]
+        results = []
+        for future in futures:
+            result = future.result()
+            status = result["error"] or "done"
+            print(f"  shard {result['index']:>3} seed={hex(result['seed'])} {status} in {result['elapsed']:.1f}s")
+            results.append(result)
+    wall = time.perf_counter() - start
+
+    merged = merge_shards(results)
+    return {
+        "shards": shards,
+        "workers": workers,
+        "runs_per_shard": runs,
+        "match_path": match_path,
+        "base_seed": hex(base_seed),
+        "wall_seconds": wall,
+        "total_runs": merged["total_runs"],
+        "execs_per_second": merged["total_runs"] / wall if wall else 0.0,
+        "failures": merged["failures"],
+        "shard_errors": [{"index": r["index"], "error": r["error"]} for r in results if r["error"]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shard a forge fuzz campaign by seed across cores")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="number of forge processes (K)")
+    parser.add_argument("--runs", type=int, default=10_000, help="--fuzz-runs budget per shard")
+    parser.add_argument("--match-path", default="test/{" + ",".join(Path(p).name for p in DEFAULT_MATCH_PATHS) + "}")
+    parser.add_argument("--base-seed", type=lambda s: int(s, 0), default=int(time.time()))
+    parser.add_argument("--workers", type=int, help="concurrent shards (default: CPU count)")
+    parser.add_argument("--timeout", type=int, default=8 * 3600, help="per-shard timeout in seconds")
+    parser.add_argument("--report", type=Path, help="where to write the JSON report")
+    args = parser.parse_args()
+
+    report = run_campaign(args.shards, args.runs, args.match_path, args.base_seed, args.workers, args.timeout)
+
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    report_path = args.report or LOGS_DIR / f"fuzz_{timestamp}.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+
+    print(f"Total fuzz runs: {report['total_runs']} in {report['wall_seconds']:.1f}s "
+          f"({report['execs_per_second']:.0f} execs/s)")
+    print(f"Unique failures: {len(report['failures'])}")
+    for failure in report["failures"]:
+        print(f"  {failure['suite']}::{failure['test']} — {failure['reason']} "
+              f"(seeds: {', '.join(failure['seeds'])})")
+    print(f"Report written to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Gas Profiler
+------------------------------
+Per-function gas flamegraphs for a single transaction:
+  • Replays the transaction with debug_traceTransaction on a local Anvil
+  • Streams structLogs from the response instead of loading the whole trace
+  • Follows CALL / STATICCALL / DELEGATECALL frames, so LoanManager ->
+    LoanLogicFixed -> LoanCore chains show up as nested stacks
+  • Maps every PC back to its Solidity function via forge source maps and AST
+  • Emits collapsed stacks ("A.f;B.g <gas>") for flamegraph.pl / speedscope
+
+Gas is attributed exclusively: a CALL opcode is charged its own overhead and
+the callee's gas appears under the callee's stack.
+
+Usage:
+    python vc_automation/vc_gasprof.py 0x<txhash> -o loan.folded
+    flamegraph.pl loan.folded > loan.svg
+"""
+import argparse
+import codecs
+import json
+import sys
+from bisect import bisect_right
+from pathlib import Path
+from typing import Iterator, Optional
+
+import requests
+
+from vc_helpers import OUT_DIR, normalized_runtime
+
+CALL_OPS = {"CALL", "CALLCODE", "STATICCALL", "DELEGATECALL"}
+CREATE_OPS = {"CREATE", "CREATE2"}
+
+TRACE_OPTIONS = {
+    "disableStack": False,
+    "disableMemory": True,
+    "disableStorage": True,
+    "enableReturnData": False,
+}
+
+# ======================================================================
+# === STREAMING TRACE READER ===
+# ======================================================================
+def stream_struct_logs(rpc_url: str, tx_hash: str, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield structLogs entries one at a time from a streamed JSON-RPC response."""
+    payload = {"jsonrpc": "2.0", "id": 1, "method": "debug_traceTransaction",
+               "params": [tx_hash, TRACE_OPTIONS]}
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    with requests.post(rpc_url, json=payload, stream=True, timeout=600) as response:
+        response.raise_for_status()
+        buffer = ""
+        pos = 0
+        in_logs = False
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+            pos = 0
+            if not in_logs:
+                start = buffer.find('"structLogs"')
+                if start < 0:
+                    continue
+                bracket = buffer.find("[", start)
+                if bracket < 0:
+                    continue
+                in_logs = True
+                pos = bracket + 1
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos >= len(buffer):
+                    break
+                if buffer[pos] == "]":
+                    return
+                try:
+                    entry, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # incomplete object: wait for more data
+                yield entry
+
+        if not in_logs:
+            reply = json.loads(buffer)
+            raise RuntimeError(f"debug_traceTransaction failed: {reply.get('error', reply)}")
+
+# ======================================================================
+# === SOURCE MAPPING ===
+# ======================================================================
+def instruction_offsets(code: bytes) -> dict:
+    """Map each PC to its instruction index (PUSH data is skipped)."""
+    offsets = {}
+    pc = index = 0
+    while pc < len(code):
+        offsets[pc] = index
+        op = code[pc]
+        pc += 1 + (op - 0x5F if 0x60 <= op <= 0x7F else 0)
+        index += 1
+    return offsets
+
+
+def parse_source_map(source_map: str) -> list:
+    """Decompress a solc source map into (start, length, file) per instruction."""
+    entries = []
+    start = length = file_id = -1
+    for item in source_map.split(";"):
+        fields = item.split(":")
+        if len(fields) > 0 and fields[0]:
+            start = int(fields[0])
+        if len(fields) > 1 and fields[1]:
+            length = int(fields[1])
+        if len(fields) > 2 and fields[2]:
+            file_id = int(fields[2])
+        entries.append((start, length, file_id))
+    return entries
+
+
+class SourceIndex:
+    """Function spans from forge artifacts plus per-contract runtime lookup."""
+
+    def __init__(self, out_dir: Path = OUT_DIR):
+        self.functions: dict = {}   # file id -> sorted [(start, end, label)]
+        self.contracts: dict = {}   # normalized runtime code -> (name, source map entries)
+        spans = {}
+        for path in out_dir.glob("*/*.json"):
+            if path.parent.name == "build-info":
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                artifact = json.load(f)
+            self._collect_functions(artifact.get("ast") or {}, None, spans)
+            deployed = artifact.get("deployedBytecode") or {}
+            code_hex = (deployed.get("object") or "").removeprefix("0x")
+            if code_hex and deployed.get("sourceMap"):
+                key = normalized_runtime(bytes.fromhex(code_hex), deployed.get("immutableReferences"))
+                self.contracts[key] = (path.stem, parse_source_map(deployed["sourceMap"]),
+                                       deployed.get("immutableReferences") or {})
+        for file_id, items in spans.items():
+            self.functions[file_id] = sorted(set(items))
+        self._starts = {fid: [s for s, _, _ in items] for fid, items in self.functions.items()}
+
+    def _collect_functions(self, node, contract: Optional[str], spans: dict) -> None:
+        if isinstance(node, list):
+            for child in node:
+                self._collect_functions(child, contract, spans)
+            return
+        if not isinstance(node, dict):
+            return
+        node_type = node.get("nodeType")
+        if node_type == "ContractDefinition":
+            contract = node.get("name")
+        elif node_type in ("FunctionDefinition", "ModifierDefinition") and node.get("src"):
+            start, length, file_id = (int(x) for x in node["src"].split(":"))
+            name = node.get("name") or node.get("kind") or "fallback"
+            label = f"{contract}.{name}" if contract else name
+            spans.setdefault(file_id, []).append((start, start + length, label))
+        for key in ("nodes", "body", "statements"):
+            if key in node:
+                self._collect_functions(node[key], contract, spans)
+
+    def function_at(self, file_id: int, offset: int) -> Optional[str]:
+        """Innermost function whose source span contains offset."""
+        items = self.functions.get(file_id)
+        if not items or offset < 0:
+            return None
+        best = None
+        for start, end, label in items[:bisect_right(self._starts[file_id], offset)]:
+            if start <= offset < end and (best is None or end - start < best[1] - best[0]):
+                best = (start, end, label)
+        return best[2] if best else None
+
+    def resolve(self, code: bytes):
+        """Return a pc -> label function for a deployed contract's runtime code."""
+        for key, (name, entries, immutables) in self.contracts.items():
+            if normalized_runtime(code, immutables) == key:
+                offsets = instruction_offsets(code)
+                cache = {}
+
+                def label(pc: int, name=name, entries=entries, offsets=offsets, cache=cache) -> str:
+                    if pc not in cache:
+                        index = offsets.get(pc)
+                        fn = None
+                        if index is not None and index < len(entries):
+                            start, _, file_id = entries[index]
+                            fn = self.function_at(file_id, start)
+                        cache[pc] = fn or f"{name}.<dispatch>"
+                    return cache[pc]
+                return label
+        return None
+
+# ======================================================================
+# === PROFILING ===
+# ======================================================================
+def rpc(session: requests.Session, rpc_url: str, method: str, params: list):
+    reply = session.post(rpc_url, json={"jsonrpc": "2.0", "id": 1, "method": method,
+                                        "params": params}, timeout=60).json()
+    if "error" in reply:
+        raise RuntimeError(f"{method} failed: {reply['error']}")
+    return reply["result"]
+
+
+def profile_transaction(rpc_url: str, tx_hash: str, index: SourceIndex) -> dict:
+    """Collapsed-stack gas totals for one transaction."""
+    session = requests.Session()
+    tx = rpc(session, rpc_url, "eth_getTransactionByHash", [tx_hash])
+    block = tx["blockNumber"]
+    resolvers = {}
+
+    def resolver_for(address: Optional[str]):
+        if address is None:
+            return lambda pc: "<create>"
+        if address not in resolvers:
+            code = bytes.fromhex(rpc(session, rpc_url, "eth_getCode", [address, block])[2:])
+            resolvers[address] = index.resolve(code) or (lambda pc, a=address: f"{a[:10]}.<unknown>")
+        return resolvers[address]
+
+    folded: dict = {}
+    # Frame: [label function, caller path prefix, gas at call, gas emitted inside]
+    frames = [[resolver_for(tx["to"]), (), None, 0]]
+
+    def emit(path: tuple, gas: int) -> None:
+        if gas > 0:
+            folded[path] = folded.get(path, 0) + gas
+            frames[-1][3] += gas
+
+    steps = stream_struct_logs(rpc_url, tx_hash)
+    step = next(steps, None)
+    while step is not None:
+        nxt = next(steps, None)
+        frame = frames[-1]
+        path = frame[1] + (frame[0](step["pc"]),)
+        depth, op = step["depth"], step["op"]
+
+        if nxt is not None and nxt["depth"] == depth + 1 and (op in CALL_OPS or op in CREATE_OPS):
+            stack = step.get("stack") or []
+            target = None
+            if op in CALL_OPS and len(stack) >= 2:
+                target = "0x" + stack[-2][2:].rjust(40, "0")[-40:]
+            frames.append([resolver_for(target), path, step["gas"], 0])
+        elif nxt is not None and nxt["depth"] == depth - 1:
+            emit(path, step["gasCost"])
+            _, caller_path, gas_at_call, used_inside = frames.pop()
+            total = gas_at_call - nxt["gas"]
+            # The call opcode's own overhead (memory expansion, value transfer,
+            # cold access) is whatever the call cost beyond the callee's gas.
+            emit(caller_path, total - used_inside)
+            frames[-1][3] += used_inside
+        elif nxt is not None and nxt["depth"] == depth:
+            emit(path, step["gas"] - nxt["gas"])
+        else:
+            emit(path, step["gasCost"])
+        step = nxt
+
+    return folded
+
+
+def write_folded(folded: dict, out) -> None:
+    for path, gas in sorted(folded.items()):
+        out.write(f"{';'.join(path)} {gas}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-function gas flamegraph for one transaction")
+    parser.add_argument("tx_hash")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    parser.add_argument("-o", "--output", type=Path, help="collapsed-stack output (default: stdout)")
+    parser.add_argument("--top", type=int, default=15, help="functions to summarise on stderr")
+    args = parser.parse_args()
+
+    folded = profile_transaction(args.rpc_url, args.tx_hash, SourceIndex())
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            write_folded(folded, f)
+    else:
+        write_folded(folded, sys.stdout)
+
+    by_function = {}
+    for path, gas in folded.items():
+        by_function[path[-1]] = by_function.get(path[-1], 0) + gas
+    total = sum(by_function.values())
+    print(f"Total attributed gas: {total}", file=sys.stderr)
+    for name, gas in sorted(by_function.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {gas:>10}  {gas / total:6.1%}  {name}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
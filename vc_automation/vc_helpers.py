@@ -0,0 +1,143 @@
+"""
+VaultChain Africa Automation Helpers
+------------------------------------
+Shared constants and loaders used by the vc_automation tools:
+  • Project paths (forge out/, deployment records)
+  • LoanCore enum values mirrored from contracts/loan/LoanCore.sol
+  • ABI and deployment-summary loading
+  • Throwaway local Anvil instances on free ports
+"""
+import contextlib
+import json
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+# ======================================================================
+# === PATHS ===
+# ======================================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+VC_DIR = PROJECT_ROOT / "vc_automation"
+OUT_DIR = PROJECT_ROOT / "out"
+DEPLOYMENTS_DIR = VC_DIR / "deployments"
+
+# ======================================================================
+# === CONTRACT ENUMS (order must match LoanCore.sol) ===
+# ======================================================================
+KYC_STATUSES = ("Pending", "Verified", "Rejected")
+PAYMENT_TYPES = ("Native", "Fiat", "Token")
+LOAN_STATUSES = (
+    "Requested",
+    "Guaranteed",
+    "Approved",
+    "Disbursed",
+    "PartiallyRepaid",
+    "FullyRepaid",
+    "Repaid",
+    "Defaulted",
+)
+
+# Statuses in which principal is still outstanding with the borrower
+ACTIVE_LOAN_STATUSES = (
+    LOAN_STATUSES.index("Disbursed"),
+    LOAN_STATUSES.index("PartiallyRepaid"),
+)
+
+# ======================================================================
+# === ARTIFACT & DEPLOYMENT LOADING ===
+# ======================================================================
+def artifact_path(contract_name: str, source_name: Optional[str] = None) -> Path:
+    """Path of the forge artifact for a contract, e.g. out/LoanCore.sol/LoanCore.json."""
+    source_name = source_name or f"{contract_name}.sol"
+    return OUT_DIR / source_name / f"{contract_name}.json"
+
+
+def load_abi(contract_name: str, source_name: Optional[str] = None) -> list:
+    """Load a contract ABI from the ABI index, falling back to its forge artifact."""
+    from vc_abi_index import get_abi  # imported lazily: vc_abi_index depends on this module
+
+    try:
+        return get_abi(contract_name, source_name)
+    except (KeyError, OSError, ValueError):
+        with open(artifact_path(contract_name, source_name), "r", encoding="utf-8") as f:
+            return json.load(f)["abi"]
+
+
+def latest_deployment_summary(chain_id: int = 31337) -> Optional[Path]:
+    """Return the most recent deployment_summary_*.json for a chain, if any."""
+    chain_folder = DEPLOYMENTS_DIR / str(chain_id)
+    summaries = sorted(chain_folder.glob("deployment_summary_*.json"))
+    return summaries[-1] if summaries else None
+
+
+def load_deployment(chain_id: int = 31337, summary_path: Optional[Path] = None) -> dict:
+    """Load a {contract_name: address} mapping from a deployment summary."""
+    summary_path = summary_path or latest_deployment_summary(chain_id)
+    if summary_path is None:
+        return {}
+    with open(summary_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# ======================================================================
+# === BYTECODE NORMALISATION ===
+# ======================================================================
+def strip_metadata(code: bytes) -> bytes:
+    """Drop the trailing CBOR metadata (its length is in the last two bytes)."""
+    if len(code) < 2:
+        return code
+    metadata_length = int.from_bytes(code[-2:], "big") + 2
+    return code[:-metadata_length] if metadata_length <= len(code) else code
+
+
+def mask_immutables(code: bytes, immutable_references: dict) -> bytes:
+    """Zero the byte ranges that hold immutables, as they appear in compiled output."""
+    if not immutable_references:
+        return code
+    masked = bytearray(code)
+    for refs in immutable_references.values():
+        for ref in refs:
+            start, length = int(ref["start"]), int(ref["length"])
+            masked[start:start + length] = bytes(length)
+    return bytes(masked)
+
+
+def normalized_runtime(code: bytes, immutable_references: Optional[dict] = None) -> bytes:
+    """Runtime code with immutables masked and metadata stripped, for comparisons."""
+    return strip_metadata(mask_immutables(code, immutable_references or {}))
+
+# ======================================================================
+# === LOCAL ANVIL ===
+# ======================================================================
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def local_anvil(chain_id: int = 31337, accounts: int = 10, timeout: float = 30.0):
+    """Start anvil on a free port, yield its RPC URL once it answers, stop it afterwards."""
+    port = free_port()
+    rpc_url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(["anvil", "--port", str(port), "--chain-id", str(chain_id),
+                             "--accounts", str(accounts)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                requests.post(rpc_url, json={"jsonrpc": "2.0", "id": 1, "method": "eth_chainId",
+                                             "params": []}, timeout=1).raise_for_status()
+                break
+            except requests.RequestException:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"anvil did not come up on port {port}")
+                time.sleep(0.1)
+        yield rpc_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Loan History
+------------------------------
+Point-in-time loan state without an archive node, from an event-sourced log:
+  • LoanCreated (LoanCore), LoanDisbursed and LoanRepaid (LoanLogicFixed)
+    folded into one block-ordered log of per-loan states, stored column-wise
+    in `array` buffers
+  • Per-loan timelines as arrays of log positions, so "loan X at block B"
+    is one binary search
+  • Checkpoints of every loan's status and outstanding amount every
+    --checkpoint-every events, so "all loans at block B" is a binary search
+    plus a replay of fewer than that many events
+  • Incremental sync with gzip-JSON persistence; `bench` measures memory
+    and query latency on a synthetic history (1M events by default)
+
+Approval and default emit no events, so each sync also re-reads the status
+and amount words of open loans at the synced block (as vc_exposure does) and
+records any difference as an "observed" event at that block. Those changes
+are therefore dated to the sync that saw them, not to their transaction;
+sync often (or per block) where that precision matters. Guarantors and
+borrowers never change after creation and are stored once per loan.
+
+Usage:
+    python vc_automation/vc_history.py sync
+    python vc_automation/vc_history.py loan 12 [--block 3400]
+    python vc_automation/vc_history.py all --block 3400 [--loans]
+    python vc_automation/vc_history.py bench [--events 1000000]
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Optional
+
+import requests
+from eth_utils import keccak
+
+from vc_exposure import CLOSED_STATUSES, LOAN_CREATED_TOPIC
+from vc_helpers import ACTIVE_LOAN_STATUSES, LOAN_STATUSES, VC_DIR, load_deployment
+from vc_state import StorageReader, batch_rpc, decode, decode_mapping, load_storage_layout, mapping_slot, slot_of
+
+HISTORY_PATH = VC_DIR / "cache" / "loan_history.json.gz"
+
+LOAN_DISBURSED_TOPIC = "0x" + keccak(text="LoanDisbursed(uint256,uint256,address)").hex()
+LOAN_REPAID_TOPIC = "0x" + keccak(text="LoanRepaid(uint256,uint256,address)").hex()
+
+EVENT_KINDS = ("created", "disbursed", "repaid", "observed")
+CREATED, DISBURSED, REPAID, OBSERVED = range(len(EVENT_KINDS))
+
+REQUESTED = LOAN_STATUSES.index("Requested")
+APPROVED = LOAN_STATUSES.index("Approved")
+DISBURSED_STATUS = LOAN_STATUSES.index("Disbursed")
+PARTIALLY_REPAID = LOAN_STATUSES.index("PartiallyRepaid")
+FULLY_REPAID = LOAN_STATUSES.index("FullyRepaid")
+DEFAULTED = LOAN_STATUSES.index("Defaulted")
+
+NO_LOAN = 255                # status of a loan slot not created yet at the queried block
+BIG_AMOUNT = (1 << 64) - 1   # amount column marker: the real value is in an overflow dict
+
+# ======================================================================
+# === HISTORY ===
+# ======================================================================
+class LoanHistory:
+    """Block-ordered log of loan states with per-loan timelines and checkpoints.
+
+    Every log entry stores the loan's status and outstanding amount *after*
+    the event, so a point query never folds anything and a replay is plain
+    assignment. Loans get dense slots in creation order; checkpoints and
+    per-loan metadata are indexed by slot.
+    """
+
+    def __init__(self, checkpoint_every: int = 65536):
+        self.checkpoint_every = checkpoint_every
+        self.last_block: Optional[int] = None
+        # event log, one entry per event
+        self.blocks = array("Q")
+        self.slots = array("I")
+        self.kinds = array("B")
+        self.statuses = array("B")
+        self.amounts = array("Q")
+        self.big_amounts: dict = {}      # log position -> amount >= BIG_AMOUNT
+        # per loan, indexed by slot
+        self.slot_of: dict = {}          # loan id -> slot
+        self.loan_ids: list = []
+        self.borrowers = array("I")
+        self.guarantor_start = array("I")
+        self.guarantor_count = array("H")
+        self.guarantors = array("I")
+        self.timelines: list = []        # slot -> array of log positions
+        self.addresses: list = []
+        self.address_ids: dict = {}
+        # latest state, indexed by slot
+        self.head_status = array("B")
+        self.head_amounts = array("Q")
+        self.head_big: dict = {}
+        # state after i * checkpoint_every events
+        self.checkpoints: list = [(array("B"), array("Q"), {})]
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def _address(self, address: str) -> int:
+        address = address.lower()
+        index = self.address_ids.get(address)
+        if index is None:
+            index = self.address_ids[address] = len(self.addresses)
+            self.addresses.append(address)
+        return index
+
+    def _register(self, loan_id: int, borrower: str, guarantors) -> int:
+        slot = self.slot_of[loan_id] = len(self.loan_ids)
+        self.loan_ids.append(loan_id)
+        self.borrowers.append(self._address(borrower))
+        self.guarantor_start.append(len(self.guarantors))
+        self.guarantor_count.append(len(guarantors))
+        self.guarantors.extend(self._address(g) for g in guarantors)
+        self.timelines.append(array("I"))
+        self.head_status.append(NO_LOAN)
+        self.head_amounts.append(0)
+        return slot
+
+    def _append(self, block: int, slot: int, kind: int, status: int, amount: int) -> None:
+        if self.blocks and block < self.blocks[-1]:
+            raise ValueError(f"block {block} is before the last recorded block {self.blocks[-1]}")
+        pos = len(self.blocks)
+        self.blocks.append(block)
+        self.slots.append(slot)
+        self.kinds.append(kind)
+        self.statuses.append(status)
+        self.head_status[slot] = status
+        if amount >= BIG_AMOUNT:
+            self.amounts.append(BIG_AMOUNT)
+            self.big_amounts[pos] = amount
+            self.head_amounts[slot] = BIG_AMOUNT
+            self.head_big[slot] = amount
+        else:
+            self.amounts.append(amount)
+            self.head_amounts[slot] = amount
+            if self.head_big:
+                self.head_big.pop(slot, None)
+        self.timelines[slot].append(pos)
+        if (pos + 1) % self.checkpoint_every == 0:
+            self.checkpoints.append((array("B", self.head_status), array("Q", self.head_amounts),
+                                     dict(self.head_big)))
+
+    def _amount_at(self, pos: int) -> int:
+        value = self.amounts[pos]
+        return self.big_amounts[pos] if value == BIG_AMOUNT else value
+
+    # ------------------------------------------------------------------
+    def create(self, block: int, loan_id: int, borrower: str, amount: int, guarantors=()) -> None:
+        if loan_id in self.slot_of:
+            raise ValueError(f"loan {loan_id} already recorded")
+        self._append(block, self._register(loan_id, borrower, guarantors), CREATED, REQUESTED, amount)
+
+    def disburse(self, block: int, loan_id: int) -> None:
+        slot = self.slot_of[loan_id]
+        self._append(block, slot, DISBURSED, DISBURSED_STATUS, self.current(loan_id)[1])
+
+    def repay(self, block: int, loan_id: int, paid: int) -> None:
+        """LoanLogicFixed.repayLoan: excess over the balance is not applied."""
+        slot = self.slot_of[loan_id]
+        remaining = max(self.current(loan_id)[1] - paid, 0)
+        self._append(block, slot, REPAID, PARTIALLY_REPAID if remaining else FULLY_REPAID, remaining)
+
+    def observe(self, block: int, loan_id: int, status: int, amount: int) -> bool:
+        """Record a state read from storage; returns whether it differed from the log."""
+        if self.current(loan_id) == (status, amount):
+            return False
+        self._append(block, self.slot_of[loan_id], OBSERVED, status, amount)
+        return True
+
+    def current(self, loan_id: int) -> tuple:
+        slot = self.slot_of[loan_id]
+        amount = self.head_amounts[slot]
+        return self.head_status[slot], self.head_big[slot] if amount == BIG_AMOUNT else amount
+
+    def open_loans(self) -> list:
+        return [self.loan_ids[slot] for slot, status in enumerate(self.head_status)
+                if status not in CLOSED_STATUSES and status != NO_LOAN]
+
+    # ------------------------------------------------------------------
+    def _loan_view(self, slot: int, status: int, amount: int) -> dict:
+        start = self.guarantor_start[slot]
+        return {
+            "loan_id": self.loan_ids[slot],
+            "borrower": self.addresses[self.borrowers[slot]],
+            "status": LOAN_STATUSES[status],
+            "outstanding": amount,
+            "guarantors": [self.addresses[g] for g in self.guarantors[start:start + self.guarantor_count[slot]]],
+        }
+
+    def loan_at(self, loan_id: int, block: int) -> Optional[dict]:
+        """State of one loan after all events up to and including `block`; None if not created yet."""
+        slot = self.slot_of.get(loan_id)
+        if slot is None:
+            return None
+        timeline = self.timelines[slot]
+        i = bisect_right(timeline, block, key=self.blocks.__getitem__)
+        if i == 0:
+            return None
+        pos = timeline[i - 1]
+        view = self._loan_view(slot, self.statuses[pos], self._amount_at(pos))
+        view["since_block"] = self.blocks[pos]
+        view["last_event"] = EVENT_KINDS[self.kinds[pos]]
+        return view
+
+    def timeline(self, loan_id: int) -> list:
+        slot = self.slot_of.get(loan_id)
+        if slot is None:
+            return []
+        return [{"block": self.blocks[pos], "event": EVENT_KINDS[self.kinds[pos]],
+                 "status": LOAN_STATUSES[self.statuses[pos]], "outstanding": self._amount_at(pos)}
+                for pos in self.timelines[slot]]
+
+    def states_at(self, block: int) -> tuple:
+        """(statuses, amounts, big amounts) of every slot at `block`, from a checkpoint plus replay.
+
+        Returns the replay length as a fourth element. Slots not created by
+        `block` have status NO_LOAN.
+        """
+        end = bisect_right(self.blocks, block)
+        c = end // self.checkpoint_every
+        status, amounts, big = self.checkpoints[c]
+        status, amounts, big = array("B", status), array("Q", amounts), dict(big)
+        missing = len(self.loan_ids) - len(status)
+        status.frombytes(bytes([NO_LOAN]) * missing)
+        amounts.frombytes(bytes(amounts.itemsize * missing))
+        slots, statuses, column = self.slots, self.statuses, self.amounts
+        start = c * self.checkpoint_every
+        for pos in range(start, end):
+            slot = slots[pos]
+            status[slot] = statuses[pos]
+            value = amounts[slot] = column[pos]
+            if value == BIG_AMOUNT:
+                big[slot] = self.big_amounts[pos]
+            elif big:
+                big.pop(slot, None)
+        return status, amounts, big, end - start
+
+    def all_at(self, block: int, with_loans: bool = False) -> dict:
+        status, amounts, big, replayed = self.states_at(block)
+        counts = {name: 0 for name in LOAN_STATUSES}
+        outstanding = 0
+        loans = []
+        for slot, s in enumerate(status):
+            if s == NO_LOAN:
+                continue
+            counts[LOAN_STATUSES[s]] += 1
+            amount = big[slot] if amounts[slot] == BIG_AMOUNT else amounts[slot]
+            if s in ACTIVE_LOAN_STATUSES:
+                outstanding += amount
+            if with_loans:
+                loans.append(self._loan_view(slot, s, amount))
+        summary = {"block": block, "loans": sum(counts.values()), "statuses": counts,
+                   "active_outstanding": outstanding, "replayed_events": replayed}
+        if with_loans:
+            summary["loan_states"] = loans
+        return summary
+
+    def memory_bytes(self) -> int:
+        """Buffer bytes of the log, timelines and checkpoints (excluding dict/list overhead)."""
+        columns = (self.blocks, self.slots, self.kinds, self.statuses, self.amounts,
+                   self.borrowers, self.guarantor_start, self.guarantor_count, self.guarantors)
+        total = sum(a.buffer_info()[1] * a.itemsize for a in columns)
+        total += sum(t.buffer_info()[1] * t.itemsize for t in self.timelines)
+        total += sum(s.buffer_info()[1] + a.buffer_info()[1] * a.itemsize for s, a, _ in self.checkpoints)
+        return total
+
+    # ------------------------------------------------------------------
+    def save(self, path) -> None:
+        data = {
+            "checkpoint_every": self.checkpoint_every,
+            "last_block": self.last_block,
+            "addresses": self.addresses,
+            "loans": [[loan_id, self.borrowers[slot],
+                       self.guarantors[self.guarantor_start[slot]:
+                                       self.guarantor_start[slot] + self.guarantor_count[slot]].tolist()]
+                      for slot, loan_id in enumerate(self.loan_ids)],
+            "log": [self.blocks.tolist(), self.slots.tolist(), self.kinds.tolist(), self.statuses.tolist(),
+                    [self._amount_at(pos) for pos in range(len(self.blocks))]],
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path, checkpoint_every: Optional[int] = None) -> "LoanHistory":
+        """Rebuild timelines and checkpoints from the stored log (optionally at a new interval)."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        history = cls(checkpoint_every or data["checkpoint_every"])
+        addresses = data["addresses"]
+        for loan_id, borrower, guarantors in data["loans"]:
+            history._register(loan_id, addresses[borrower], [addresses[g] for g in guarantors])
+        for entry in zip(*data["log"]):
+            history._append(*entry)
+        history.last_block = data["last_block"]
+        return history
+
+# ======================================================================
+# === CHAIN SYNC ===
+# ======================================================================
+class HistorySync:
+    """Appends LoanCore/LoanLogicFixed events and observed status changes to a LoanHistory."""
+
+    def __init__(self, history: LoanHistory, rpc_url: str, addresses: dict, batch_size: int = 500):
+        self.history = history
+        self.rpc_url = rpc_url
+        self.loan_core = addresses["LoanCore"]
+        self.loan_logic = addresses.get("LoanLogicFixed")
+        self.batch_size = batch_size
+        self.session = requests.Session()
+        layout = load_storage_layout("LoanCore")
+        self.types = layout["types"]
+        self.loans_slot, _, self.loans_type = slot_of(layout, "loans")
+        loan_type = self.types[self.types[self.loans_type]["value"]]
+        self.members = {m["label"]: m for m in loan_type["members"]}
+
+    def _field(self, loan_id: int, label: str):
+        member = self.members[label]
+        base = mapping_slot("uint256", loan_id, self.loans_slot)
+        return decode(self.types, member["type"], base + int(member["slot"]), int(member["offset"]))
+
+    def sync(self, to_block: Optional[int] = None) -> dict:
+        """One incremental step up to `to_block` (default: latest)."""
+        history = self.history
+        (head,) = batch_rpc(self.session, self.rpc_url, [("eth_blockNumber", [])])
+        to_block = to_block if to_block is not None else int(head, 16)
+        from_block = 0 if history.last_block is None else history.last_block + 1
+        if from_block > to_block:
+            return {"block": history.last_block, "events": 0, "observed": 0, "rounds": 0}
+
+        span = {"fromBlock": hex(from_block), "toBlock": hex(to_block)}
+        log_calls = [("eth_getLogs", [{**span, "address": self.loan_core, "topics": [LOAN_CREATED_TOPIC]}])]
+        if self.loan_logic:
+            log_calls.append(("eth_getLogs", [{**span, "address": self.loan_logic,
+                                               "topics": [[LOAN_DISBURSED_TOPIC, LOAN_REPAID_TOPIC]]}]))
+        entries = sorted((entry for logs in batch_rpc(self.session, self.rpc_url, log_calls) for entry in logs),
+                         key=lambda e: (int(e["blockNumber"], 16), int(e["logIndex"], 16)))
+        new_ids = sorted({int(e["topics"][1], 16) for e in entries if e["topics"][0] == LOAN_CREATED_TOPIC}
+                         - history.slot_of.keys())
+
+        # Guarantors never change, so reading them at to_block is as good as at creation
+        read_ids = history.open_loans() + new_ids
+        reader = StorageReader(self.session, self.rpc_url, self.loan_core, hex(to_block), self.batch_size)
+        decoders = [decode_mapping(self.types, self.loans_type, self.loans_slot, new_ids)]
+        decoders += [self._field(i, label) for i in read_ids for label in ("loan_amount", "status")]
+        results = reader.run(decoders)
+        created = results[0]
+
+        events = 0
+        for entry in entries:
+            loan_id = int(entry["topics"][1], 16)
+            block = int(entry["blockNumber"], 16)
+            topic = entry["topics"][0]
+            if topic == LOAN_CREATED_TOPIC:
+                if loan_id in history.slot_of:
+                    continue
+                # data = abi.encode(borrower, amount)
+                history.create(block, loan_id, "0x" + entry["data"][26:66],
+                               int(entry["data"][66:130], 16), created[str(loan_id)]["guarantors"])
+            elif loan_id not in history.slot_of:
+                continue
+            elif topic == LOAN_DISBURSED_TOPIC:
+                history.disburse(block, loan_id)
+            else:
+                # data = abi.encode(amount)
+                history.repay(block, loan_id, int(entry["data"][2:66], 16))
+            events += 1
+
+        observed = sum(history.observe(to_block, loan_id, results[2 + 2 * k], results[1 + 2 * k])
+                       for k, loan_id in enumerate(read_ids))
+        history.last_block = to_block
+        return {"block": to_block, "events": events, "observed": observed, "rounds": reader.rounds}
+
+# ======================================================================
+# === BENCHMARK ===
+# ======================================================================
+def synthetic_history(events: int, checkpoint_every: int = 65536, seed: int = 7) -> LoanHistory:
+    """A history following LoanLogicFixed's lifecycle: request, approve, disburse, one repayment, default."""
+    rng = random.Random(seed)
+    history = LoanHistory(checkpoint_every)
+    members = [f"0x{rng.getrandbits(160):040x}" for _ in range(5000)]
+    open_ids: list = []
+    block = next_id = 1
+    while len(history) < events:
+        block += rng.randint(0, 2)
+        if not open_ids or rng.random() < 0.22:
+            amount = rng.randint(10 ** 15, 10 ** 19) if rng.random() < 0.9 else rng.randint(10 ** 19, 10 ** 22)
+            history.create(block, next_id, rng.choice(members), amount, rng.sample(members, rng.randint(0, 3)))
+            open_ids.append(next_id)
+            next_id += 1
+            continue
+        k = rng.randrange(len(open_ids))
+        loan_id = open_ids[k]
+        status, amount = history.current(loan_id)
+        if status == REQUESTED:
+            history.observe(block, loan_id, APPROVED, amount)
+        elif status == APPROVED:
+            history.disburse(block, loan_id)
+        elif status == DISBURSED_STATUS and rng.random() < 0.9:
+            history.repay(block, loan_id, amount if rng.random() < 0.6 else rng.randint(1, amount))
+        else:
+            history.observe(block, loan_id, DEFAULTED, amount)
+        status = history.current(loan_id)[0]
+        if status in CLOSED_STATUSES or (status == PARTIALLY_REPAID and rng.random() < 0.5):
+            open_ids[k] = open_ids[-1]
+            open_ids.pop()
+    history.last_block = block
+    return history
+
+
+def _latency(samples: list) -> dict:
+    samples = sorted(samples)
+    return {"p50_us": round(statistics.median(samples) * 1e6, 1),
+            "p99_us": round(samples[int(len(samples) * 0.99) - 1] * 1e6, 1),
+            "max_us": round(samples[-1] * 1e6, 1)}
+
+
+def bench(events: int, checkpoint_every: int, queries: int, seed: int) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    history = synthetic_history(events, checkpoint_every, seed)
+    build = time.perf_counter() - start
+    traced, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rng = random.Random(seed + 1)
+    last = history.last_block
+    loan_samples, all_samples, replayed, mismatches = [], [], [], 0
+    for _ in range(queries):
+        loan_id = rng.choice(history.loan_ids)
+        block = rng.randint(0, last)
+        t = time.perf_counter()
+        history.loan_at(loan_id, block)
+        loan_samples.append(time.perf_counter() - t)
+    for _ in range(max(queries // 100, 5)):
+        block = rng.randint(0, last)
+        t = time.perf_counter()
+        status, amounts, big, n = history.states_at(block)
+        all_samples.append(time.perf_counter() - t)
+        replayed.append(n)
+        # cross-check the checkpoint path against per-loan timelines
+        for slot in rng.sample(range(len(history.loan_ids)), 20):
+            view = history.loan_at(history.loan_ids[slot], block)
+            expected = (NO_LOAN, None) if view is None else (LOAN_STATUSES.index(view["status"]), view["outstanding"])
+            got = (status[slot], None if status[slot] == NO_LOAN else
+                   big[slot] if amounts[slot] == BIG_AMOUNT else amounts[slot])
+            mismatches += expected != got
+
+    return {
+        "events": len(history),
+        "loans": len(history.loan_ids),
+        "blocks": last,
+        "checkpoint_every": checkpoint_every,
+        "checkpoints": len(history.checkpoints),
+        "build_seconds_traced": round(build, 3),
+        "memory_bytes": traced,
+        "memory_peak_bytes": peak,
+        "bytes_per_event": round(traced / len(history), 1),
+        "buffer_bytes": history.memory_bytes(),
+        "loan_at": _latency(loan_samples),
+        "all_at": {**_latency(all_samples), "mean_replayed_events": round(statistics.mean(replayed), 1)},
+        "mismatches": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Point-in-time loan state from an event-sourced history")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH, help="gzip-JSON history file")
+    parser.add_argument("--checkpoint-every", type=int, help="events between checkpoints (default: as stored, or 65536)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sync = sub.add_parser("sync", help="append new events up to the latest (or --to-block) block")
+    sync.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    sync.add_argument("--chain-id", type=int, default=31337)
+    sync.add_argument("--to-block", type=int)
+
+    loan = sub.add_parser("loan", help="one loan at a block, or its full timeline")
+    loan.add_argument("loan_id", type=int)
+    loan.add_argument("--block", type=int)
+
+    every = sub.add_parser("all", help="every loan at a block")
+    every.add_argument("--block", type=int, required=True)
+    every.add_argument("--loans", action="store_true", help="include each loan's state, not only totals")
+
+    bench_cmd = sub.add_parser("bench", help="memory and query latency on a synthetic history")
+    bench_cmd.add_argument("--events", type=int, default=1_000_000)
+    bench_cmd.add_argument("--queries", type=int, default=10_000)
+    bench_cmd.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        print(json.dumps(bench(args.events, args.checkpoint_every or 65536, args.queries, args.seed), indent=2))
+        return
+
+    if args.history.exists():
+        history = LoanHistory.load(args.history, args.checkpoint_every)
+    elif args.command != "sync":
+        parser.error(f"{args.history} not found; run `sync` first")
+    else:
+        history = LoanHistory(args.checkpoint_every or 65536)
+
+    if args.command == "sync":
+        addresses = load_deployment(args.chain_id)
+        if "LoanCore" not in addresses:
+            parser.error("LoanCore address missing from the latest deployment summary")
+        stats = HistorySync(history, args.rpc_url, addresses).sync(args.to_block)
+        history.save(args.history)
+        print(f"Synced to block {stats['block']}: {stats['events']} events, {stats['observed']} observed "
+              f"changes ({stats['rounds']} storage rounds); {len(history)} events, "
+              f"{len(history.loan_ids)} loans in {args.history}")
+    elif args.command == "loan":
+        if args.block is None:
+            report = history.timeline(args.loan_id)
+        else:
+            report = history.loan_at(args.loan_id, args.block)
+        print(json.dumps(report, indent=2))
+    else:
+        start = time.perf_counter()
+        report = history.all_at(args.block, args.loans)
+        report["query_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Log Index
+---------------------------
+Full-text search over the automation logs in vc_automation/logs/:
+  • automation_*.log, anvil_*.log, deploy_raw_*.log and deploy_trigger_*.txt
+    tokenised line by line into a SQLite FTS5 table
+  • Every line tagged with its run id (the timestamp shared by all files of
+    one pipeline run), log kind, pipeline stage and the most recent
+    timestamp seen before it ("Started at ..." or the run start)
+  • Incremental: each file's byte offset and parser state are stored, so a
+    pass reads only bytes appended since the previous one; a file that was
+    truncated or replaced is re-indexed from the start
+  • The index lives in vc_automation/cache/ and keeps runs whose log files
+    have since been cleared by the pipeline
+
+Usage:
+    python vc_automation/vc_logindex.py index [--rebuild]
+    python vc_automation/vc_logindex.py query "contract size" --first
+    python vc_automation/vc_logindex.py query "forge test" --stage 1 --runs
+    python vc_automation/vc_logindex.py query 'Error NOT warning' --run 2025-11-11_18-03-22 --limit 50
+    python vc_automation/vc_logindex.py stats
+"""
+import argparse
+import datetime
+import hashlib
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from vc_helpers import VC_DIR
+
+LOGS_DIR = VC_DIR / "logs"
+INDEX_PATH = VC_DIR / "cache" / "log_index.sqlite"
+
+LOG_PATTERNS = ("automation_*.log", "anvil_*.log", "deploy_raw_*.log", "deploy_trigger_*.txt")
+RUN_ID_RE = re.compile(r"^(?P<kind>[a-z_]+?)_(?P<run>\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})$")
+STAGE_RE = re.compile(r"^STAGE (\d+):")
+STARTED_RE = re.compile(r"^Started at (\S+)")
+
+# Files written by a single stage; automation logs follow the STAGE headers.
+KIND_STAGES = {"anvil": 2, "deploy_raw": 3, "deploy_trigger": 3}
+HEAD_BYTES = 256  # fingerprint of a file's start, to notice replacement
+KIND_ORDER = ("automation", "anvil", "deploy_raw", "deploy_trigger")
+
+# Row ids sort chronologically - run start, stage, kind, line - so FTS5 can
+# return matches in time order without sorting them: 31 bits of epoch
+# seconds, 4 of stage, 2 of kind, 22 of line number.
+LINE_BITS = 22
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    run_id TEXT,
+    kind TEXT,
+    head TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    stage INTEGER,
+    ts TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS lines USING fts5(
+    text,
+    run_id UNINDEXED,
+    kind UNINDEXED,
+    stage UNINDEXED,
+    ts UNINDEXED,
+    path UNINDEXED,
+    line UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# ======================================================================
+# === INDEXING ===
+# ======================================================================
+def connect(index_path: Path = INDEX_PATH) -> sqlite3.Connection:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(index_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def parse_name(path: Path) -> tuple:
+    """(kind, run id, run start as ISO) from e.g. automation_2025-11-11_15-14-29.log."""
+    match = RUN_ID_RE.match(path.stem)
+    if not match:
+        return path.stem, None, None
+    started = datetime.datetime.strptime(match.group("run"), "%Y-%m-%d_%H-%M-%S")
+    return match.group("kind"), match.group("run"), started.isoformat()
+
+
+def run_epoch(run_id: Optional[str]) -> Optional[int]:
+    if run_id is None:
+        return None
+    started = datetime.datetime.strptime(run_id, "%Y-%m-%d_%H-%M-%S")
+    return int(started.replace(tzinfo=datetime.timezone.utc).timestamp())
+
+
+def line_rowid(epoch: Optional[int], stage: int, kind: str, line_no: int) -> Optional[int]:
+    """Chronological row id, or None (assigned by SQLite) when the line does not fit the layout."""
+    if epoch is None or kind not in KIND_ORDER or line_no >= 1 << LINE_BITS or not 0 <= stage < 16:
+        return None
+    return (((epoch << 4 | stage) << 2 | KIND_ORDER.index(kind)) << LINE_BITS) | line_no
+
+
+def _head(path: Path, length: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+
+def index_file(conn: sqlite3.Connection, path: Path) -> int:
+    """Ingest the complete lines appended to one file since the last pass; returns lines added."""
+    key = path.name
+    size = path.stat().st_size
+    row = conn.execute("SELECT head, offset, line, stage, ts FROM files WHERE path = ?", (key,)).fetchone()
+    kind, run_id, started = parse_name(path)
+
+    if row and size >= row[1] and _head(path, row[1]) == row[0]:
+        _, offset, line_no, stage, ts = row
+    else:
+        if row:
+            conn.execute("DELETE FROM lines WHERE path = ?", (key,))
+        offset, line_no, stage, ts = 0, 0, KIND_STAGES.get(kind, 0), started
+    if size == offset:
+        return 0
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(size - offset)
+    end = data.rfind(b"\n") + 1
+    if end == 0:
+        return 0  # no complete line yet; pick it up once it ends
+
+    epoch = run_epoch(run_id)
+    rows = []
+    for raw in data[:end].decode("utf-8", errors="replace").splitlines():
+        line_no += 1
+        text = raw.strip()
+        if kind == "automation":
+            stage_match = STAGE_RE.match(text)
+            if stage_match:
+                stage = int(stage_match.group(1))
+        started_match = STARTED_RE.match(text)
+        if started_match:
+            ts = started_match.group(1)
+        if text:
+            rows.append((line_rowid(epoch, stage, kind, line_no), text, run_id, kind, stage, ts, key, line_no))
+
+    conn.executemany("INSERT INTO lines (rowid, text, run_id, kind, stage, ts, path, line) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.execute(
+        "INSERT INTO files (path, run_id, kind, head, offset, line, stage, ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(path) DO UPDATE SET head = excluded.head, offset = excluded.offset, "
+        "line = excluded.line, stage = excluded.stage, ts = excluded.ts",
+        (key, run_id, kind, _head(path, offset + end), offset + end, line_no, stage, ts))
+    return len(rows)
+
+
+def update_index(conn: sqlite3.Connection, logs_dir: Path = LOGS_DIR, rebuild: bool = False) -> dict:
+    if rebuild:
+        conn.execute("DELETE FROM lines")
+        conn.execute("DELETE FROM files")
+    paths = sorted({p for pattern in LOG_PATTERNS for p in logs_dir.glob(pattern)})
+    added = 0
+    with conn:
+        for path in paths:
+            added += index_file(conn, path)
+    return {"files": len(paths), "lines_added": added}
+
+# ======================================================================
+# === QUERY ===
+# ======================================================================
+def _match_expression(conn: sqlite3.Connection, query: str) -> str:
+    """The query as FTS5 syntax if it parses, otherwise as one quoted phrase."""
+    try:
+        conn.execute("SELECT 1 FROM lines WHERE lines MATCH ? LIMIT 1", (query,))
+        return query
+    except sqlite3.OperationalError:
+        return '"' + query.replace('"', '""') + '"'
+
+
+def search(conn: sqlite3.Connection, query: str, run_id: Optional[str] = None, stage: Optional[int] = None,
+           kind: Optional[str] = None, limit: Optional[int] = 20, order: str = "time") -> list:
+    """Matching lines, oldest first (order="time") or best first (order="rank")."""
+    where, params = ["lines MATCH ?"], [_match_expression(conn, query)]
+    for column, value in (("run_id", run_id), ("stage", stage), ("kind", kind)):
+        if value is not None:
+            where.append(f"{column} = ?")
+            params.append(value)
+    order_by = "rank" if order == "rank" else "rowid"
+    sql = (f"SELECT run_id, kind, stage, ts, path, line, highlight(lines, 0, '[', ']') FROM lines "
+           f"WHERE {' AND '.join(where)} ORDER BY {order_by}")
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    keys = ("run_id", "kind", "stage", "ts", "path", "line", "text")
+    return [dict(zip(keys, row)) for row in conn.execute(sql, params)]
+
+
+def runs_matching(conn: sqlite3.Connection, query: str, stage: Optional[int] = None,
+                  kind: Optional[str] = None) -> list:
+    """(run id, matching lines, first timestamp) for every run with a match."""
+    where, params = ["lines MATCH ?"], [_match_expression(conn, query)]
+    for column, value in (("stage", stage), ("kind", kind)):
+        if value is not None:
+            where.append(f"{column} = ?")
+            params.append(value)
+    return conn.execute(f"SELECT run_id, COUNT(*), MIN(ts) FROM lines WHERE {' AND '.join(where)} "
+                        f"GROUP BY run_id ORDER BY run_id", params).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and search the automation logs")
+    parser.add_argument("--index", type=Path, default=INDEX_PATH, help="SQLite index file")
+    parser.add_argument("--logs", type=Path, default=LOGS_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    index = sub.add_parser("index", help="ingest new log bytes")
+    index.add_argument("--rebuild", action="store_true", help="drop the index and ingest everything again")
+
+    query = sub.add_parser("query", help="search indexed lines (FTS5 syntax or plain words)")
+    query.add_argument("text")
+    query.add_argument("--run", help="run id, e.g. 2025-11-11_18-03-22")
+    query.add_argument("--stage", type=int)
+    query.add_argument("--kind", choices=["automation", "anvil", "deploy_raw", "deploy_trigger"])
+    query.add_argument("--limit", type=int, default=20, help="0 for no limit")
+    query.add_argument("--rank", action="store_true", help="best matches first instead of oldest first")
+    query.add_argument("--first", action="store_true", help="only the earliest match")
+    query.add_argument("--runs", action="store_true", help="list matching runs instead of lines")
+    query.add_argument("--no-update", action="store_true", help="search without ingesting new bytes first")
+
+    sub.add_parser("stats", help="indexed files, runs and lines")
+    args = parser.parse_args()
+
+    conn = connect(args.index)
+    if args.command == "index":
+        start = time.perf_counter()
+        result = update_index(conn, args.logs, args.rebuild)
+        print(f"Indexed {result['lines_added']} new lines from {result['files']} files "
+              f"in {(time.perf_counter() - start) * 1000:.1f}ms -> {args.index}")
+        return
+
+    if args.command == "stats":
+        files, runs = conn.execute("SELECT COUNT(*), COUNT(DISTINCT run_id) FROM files").fetchone()
+        lines = conn.execute("SELECT COUNT(*) FROM lines").fetchone()[0]
+        print(f"{files} files, {runs} runs, {lines} lines in {args.index}")
+        for run_id, kinds in conn.execute("SELECT run_id, GROUP_CONCAT(kind, ', ') FROM files "
+                                          "GROUP BY run_id ORDER BY run_id"):
+            print(f"  {run_id}: {kinds}")
+        return
+
+    if not args.no_update:
+        update_index(conn, args.logs)
+    start = time.perf_counter()
+    if args.runs:
+        rows = runs_matching(conn, args.text, args.stage, args.kind)
+        elapsed = (time.perf_counter() - start) * 1000
+        for run_id, count, first_ts in rows:
+            print(f"{run_id}  {count:>6} lines  first at {first_ts}")
+        print(f"{len(rows)} runs in {elapsed:.1f}ms")
+        return
+
+    matches = search(conn, args.text, args.run, args.stage, args.kind,
+                     1 if args.first else args.limit, "rank" if args.rank else "time")
+    elapsed = (time.perf_counter() - start) * 1000
+    for m in matches:
+        print(f"{m['ts']}  {m['run_id']}  stage {m['stage']}  {m['path']}:{m['line']}  {m['text']}")
+    print(f"{len(matches)} matches in {elapsed:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
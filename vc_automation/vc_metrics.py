@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Metrics
+-------------------------
+Prometheus-style metrics for the long-running automation services:
+  • Counters, gauges and histograms with labels
+  • Callback gauges evaluated at scrape time (cache hit rates, Anvil health)
+  • Web3 middleware timing every JSON-RPC call (sync and async providers)
+  • A local HTTP endpoint serving /metrics in the Prometheus text format
+
+Hot paths only do a dict lookup and an addition: label children are cached,
+histograms bisect into a fixed bucket list, and nothing is formatted until a
+scrape. Updates are not locked; under the GIL a lost increment between two
+threads is possible but rare, which is acceptable for monitoring.
+
+Usage:
+    from vc_metrics import serve_metrics, RPC_LATENCY
+    serve_metrics(9108)
+    with STAGE_DURATION.labels(stage="deploy").time():
+        ...
+
+    python vc_automation/vc_metrics.py --port 9108 --rpc-url http://127.0.0.1:8545
+"""
+import argparse
+import math
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import requests
+from web3.middleware import Web3Middleware
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+# ======================================================================
+# === METRIC TYPES ===
+# ======================================================================
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value != value:
+        return "NaN"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Timer:
+    __slots__ = ("_observe", "_start")
+
+    def __init__(self, observe: Callable[[float], None]):
+        self._observe = observe
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._observe(time.perf_counter() - self._start)
+
+
+class Metric:
+    """Base for labelled metrics; an unlabelled metric is its own single child."""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        key = values or tuple(kwargs[n] for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def samples(self) -> list:
+        """(suffix, label string, value) tuples for exposition."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def time(self) -> _Timer:
+        return _Timer(self.set)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._children[()].value += amount
+
+    def samples(self) -> list:
+        return [("", _format_labels(self.labelnames, k), c.value) for k, c in list(self._children.items())]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self._functions: dict = {}
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self._children[()].value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self._children[()].value -= amount
+
+    def set(self, value: float) -> None:
+        self._children[()].value = value
+
+    def set_function(self, fn: Callable[[], float], **labels) -> None:
+        """Evaluate fn at scrape time instead of storing a value."""
+        self._functions[tuple(labels[n] for n in self.labelnames)] = fn
+
+    def samples(self) -> list:
+        values = {k: c.value for k, c in list(self._children.items())}
+        for key, fn in list(self._functions.items()):
+            try:
+                values[key] = fn()
+            except Exception:
+                values[key] = math.nan
+        return [("", _format_labels(self.labelnames, k), v) for k, v in values.items()]
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self) -> _Timer:
+        return _Timer(self.observe)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (),
+                 buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def time(self) -> _Timer:
+        return self._children[()].time()
+
+    def samples(self) -> list:
+        out = []
+        for key, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), list(child.counts)):
+                cumulative += count
+                out.append(("_bucket", _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"'),
+                            cumulative))
+            out.append(("_sum", _format_labels(self.labelnames, key), child.sum))
+            out.append(("_count", _format_labels(self.labelnames, key), cumulative))
+        return out
+
+# ======================================================================
+# === REGISTRY ===
+# ======================================================================
+class Registry:
+    """Named metrics; asking for an existing name returns the same metric."""
+
+    def __init__(self):
+        self._metrics: dict = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (),
+                  buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in list(self._metrics.values())) + "\n"
+
+
+REGISTRY = Registry()
+
+# ======================================================================
+# === STANDARD METRICS ===
+# ======================================================================
+RPC_LATENCY = REGISTRY.histogram("vc_rpc_latency_seconds", "JSON-RPC call latency", ("method",))
+RPC_ERRORS = REGISTRY.counter("vc_rpc_errors_total", "JSON-RPC calls that raised or returned an error", ("method",))
+TX_SENT = REGISTRY.counter("vc_tx_total", "Transactions sent, by outcome", ("status",))
+TX_IN_FLIGHT = REGISTRY.gauge("vc_tx_in_flight", "Transactions sent and awaiting a receipt")
+STAGE_DURATION = REGISTRY.histogram("vc_stage_duration_seconds", "Pipeline stage duration",
+                                    ("stage",), buckets=SLOW_BUCKETS)
+COMMAND_DURATION = REGISTRY.histogram("vc_command_duration_seconds", "External command duration",
+                                      ("command",), buckets=SLOW_BUCKETS)
+COMMAND_FAILURES = REGISTRY.counter("vc_command_failures_total", "External commands with a non-zero exit",
+                                    ("command",))
+CACHE_HIT_RATE = REGISTRY.gauge("vc_cache_hit_rate", "Hit rate of a registered cache", ("cache",))
+CACHE_ENTRIES = REGISTRY.gauge("vc_cache_entries", "Entries held by a registered cache", ("cache",))
+ANVIL_UP = REGISTRY.gauge("vc_anvil_up", "1 if the Anvil node answered eth_blockNumber at scrape time")
+ANVIL_BLOCK = REGISTRY.gauge("vc_anvil_block_number", "Latest block reported by the Anvil node")
+
+
+def command_label(cmd: list) -> str:
+    """Low-cardinality label for a command line, e.g. 'forge build'."""
+    words = [c for c in cmd[:2] if not c.startswith("-") and "/" not in c and "\\" not in c]
+    return " ".join(words) or "unknown"
+
+
+def track_cache(name: str, cache) -> None:
+    """Expose a ViewCache's hit rate and size at scrape time."""
+    CACHE_HIT_RATE.set_function(lambda: cache.stats()["hit_rate"], cache=name)
+    CACHE_ENTRIES.set_function(lambda: cache.stats()["entries"], cache=name)
+
+
+def track_anvil(rpc_url: str = "http://127.0.0.1:8545", timeout: float = 1.0) -> None:
+    """Probe the node on every scrape; the block gauge reads the probe's result."""
+    last = {"block": math.nan}
+
+    def probe() -> int:
+        try:
+            reply = requests.post(rpc_url, json={"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber",
+                                                 "params": []}, timeout=timeout).json()
+            last["block"] = int(reply["result"], 16)
+            return 1
+        except Exception:
+            last["block"] = math.nan
+            return 0
+
+    ANVIL_UP.set_function(probe)
+    ANVIL_BLOCK.set_function(lambda: last["block"])
+
+# ======================================================================
+# === WEB3 MIDDLEWARE ===
+# ======================================================================
+class RpcMetricsMiddleware(Web3Middleware):
+    """Records latency and errors of every request made through a Web3 instance.
+
+    Add with w3.middleware_onion.add(RpcMetricsMiddleware, "metrics").
+    """
+
+    def wrap_make_request(self, make_request):
+        def middleware(method, params):
+            child = RPC_LATENCY.labels(method)
+            start = time.perf_counter()
+            try:
+                response = make_request(method, params)
+            except Exception:
+                RPC_ERRORS.labels(method).inc()
+                raise
+            finally:
+                child.observe(time.perf_counter() - start)
+            if "error" in response:
+                RPC_ERRORS.labels(method).inc()
+            return response
+        return middleware
+
+    async def async_wrap_make_request(self, make_request):
+        async def middleware(method, params):
+            child = RPC_LATENCY.labels(method)
+            start = time.perf_counter()
+            try:
+                response = await make_request(method, params)
+            except Exception:
+                RPC_ERRORS.labels(method).inc()
+                raise
+            finally:
+                child.observe(time.perf_counter() - start)
+            if "error" in response:
+                RPC_ERRORS.labels(method).inc()
+            return response
+        return middleware
+
+# ======================================================================
+# === HTTP ENDPOINT ===
+# ======================================================================
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        data = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 9108, host: str = "127.0.0.1", registry: Registry = REGISTRY):
+        super().__init__((host, port), _MetricsHandler)
+        self.registry = registry
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+
+def serve_metrics(port: int = 9108, host: str = "127.0.0.1",
+                  registry: Registry = REGISTRY) -> MetricsServer:
+    """Serve /metrics from a daemon thread and return the server."""
+    server = MetricsServer(port, host, registry)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve VaultChain automation metrics")
+    parser.add_argument("--port", type=int, default=9108)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545", help="Anvil node to health-check")
+    args = parser.parse_args()
+
+    track_anvil(args.rpc_url)
+    server = MetricsServer(args.port, args.host)
+    print(f"Serving metrics on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Bulk Member Onboarding
+----------------------------------------
+Streams a SACCO cohort manifest into MembershipModule.submitBiodata:
+  • Reads a CSV or JSONL manifest row by row
+  • Hashes ID scans and passport photos on a process pool (memory-mapped reads)
+  • Validates every submission against the contract's InvalidData rules
+    before anything is sent
+  • Submits through a bounded number of in-flight transactions
+  • Checkpoints each member, so a crashed run resumes where it stopped
+
+Manifest columns (CSV header or JSONL keys):
+    private_key, first_name, middle_name, last_name, date_of_birth,
+    national_id, passport_number, id_document, passport_photo
+
+submitBiodata must be sent by the member's own wallet, hence the private_key
+column (e.g. funded Anvil accounts for a test cohort). date_of_birth is
+either an integer or an ISO date, which is encoded as YYYYMMDD. Document
+paths are resolved relative to the manifest. Hashes are SHA-256:
+nationalIdHash is the digest as a uint256 (0 when no national id is given),
+the string fields are 0x-prefixed hex digests.
+
+Usage:
+    python vc_automation/vc_onboard.py cohort.csv [--dry-run] [--max-in-flight 32]
+"""
+import argparse
+import asyncio
+import csv
+import datetime
+import hashlib
+import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+from eth_account import Account
+from web3 import AsyncWeb3
+
+from vc_helpers import VC_DIR, load_abi, load_deployment
+
+LOGS_DIR = VC_DIR / "logs"
+
+# ======================================================================
+# === MANIFEST ===
+# ======================================================================
+def read_manifest(path: Path) -> Iterator[dict]:
+    """Yield manifest rows lazily, tagging each with its line number."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".jsonl":
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    yield dict(json.loads(line), _line=line_no)
+        else:
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield dict(row, _line=line_no)
+
+# ======================================================================
+# === HASHING & VALIDATION (runs in worker processes) ===
+# ======================================================================
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file via a memory-mapped read."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+    return "0x" + digest.hexdigest()
+
+
+def hash_text(value: str) -> str:
+    value = value.strip()
+    return "0x" + hashlib.sha256(value.encode("utf-8")).hexdigest() if value else ""
+
+
+def parse_date_of_birth(value) -> int:
+    value = str(value or "").strip()
+    if not value:
+        return 0
+    if value.isdigit():
+        return int(value)
+    return int(datetime.date.fromisoformat(value).strftime("%Y%m%d"))
+
+
+def validate(args: tuple) -> list:
+    """Mirror of the InvalidData checks in MembershipModule.submitBiodata."""
+    (first, middle, last, date_of_birth, national_id_hash,
+     passport_hash, id_document_hash, photo_hash) = args
+    errors = []
+    if not first or not middle or not last:
+        errors.append("first, middle and last name are required")
+    if date_of_birth == 0:
+        errors.append("date_of_birth is required")
+    if national_id_hash == 0 and not passport_hash:
+        errors.append("national_id or passport_number is required")
+    if not id_document_hash or not photo_hash:
+        errors.append("id_document and passport_photo are required")
+    return errors
+
+
+def prepare_submission(row: dict, base_dir: str) -> dict:
+    """Hash one member's documents and build submitBiodata arguments."""
+    result = {"line": row["_line"], "member": row["_member"], "private_key": row["private_key"]}
+    try:
+        documents = []
+        for column in ("id_document", "passport_photo"):
+            name = (row.get(column) or "").strip()
+            documents.append(hash_file(Path(base_dir) / name) if name else "")
+
+        national_id = (row.get("national_id") or "").strip()
+        args = (
+            (row.get("first_name") or "").strip(),
+            (row.get("middle_name") or "").strip(),
+            (row.get("last_name") or "").strip(),
+            parse_date_of_birth(row.get("date_of_birth")),
+            int(hash_text(national_id), 16) if national_id else 0,
+            hash_text(row.get("passport_number") or ""),
+            documents[0],
+            documents[1],
+        )
+    except (OSError, ValueError) as e:
+        result["errors"] = [str(e)]
+        return result
+
+    result["args"] = args
+    result["errors"] = validate(args)
+    return result
+
+# ======================================================================
+# === CHECKPOINT ===
+# ======================================================================
+class Checkpoint:
+    """Append-only JSONL record of members already handled."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.done = set()
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self.done.add(json.loads(line)["member"].lower())
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def __contains__(self, member: str) -> bool:
+        return member.lower() in self.done
+
+    def record(self, entry: dict) -> None:
+        self._fh.write(json.dumps(entry) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self.done.add(entry["member"].lower())
+
+    def close(self) -> None:
+        self._fh.close()
+
+# ======================================================================
+# === SUBMISSION ===
+# ======================================================================
+async def submit_one(w3: AsyncWeb3, membership, prepared: dict) -> dict:
+    member = prepared["member"]
+    entry = {"member": member, "line": prepared["line"]}
+
+    # A crash between sending and checkpointing must not lead to a resend
+    # that reverts with AlreadySubmitted.
+    existing = await membership.functions.getMemberSubmission(member).call()
+    if existing[8]:
+        return dict(entry, status="already_submitted")
+
+    account = Account.from_key(prepared["private_key"])
+    tx = await membership.functions.submitBiodata(*prepared["args"]).build_transaction({
+        "from": member,
+        "nonce": await w3.eth.get_transaction_count(member, "pending"),
+    })
+    tx_hash = await w3.eth.send_raw_transaction(account.sign_transaction(tx).raw_transaction)
+    receipt = await w3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=0.1)
+    status = "submitted" if receipt["status"] == 1 else "reverted"
+    return dict(entry, status=status, tx_hash=tx_hash.to_0x_hex())
+
+
+async def run_pipeline(manifest: Path, rpc_url: str, membership_address: Optional[str],
+                       checkpoint: Checkpoint, workers: int, max_in_flight: int,
+                       dry_run: bool = False) -> dict:
+    counts = {}
+    base_dir = str(manifest.resolve().parent)
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight * 2)
+
+    w3 = membership = None
+    if not dry_run:
+        w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
+        membership = w3.eth.contract(address=AsyncWeb3.to_checksum_address(membership_address),
+                                     abi=load_abi("MembershipModule"))
+
+    def count(status: str) -> None:
+        counts[status] = counts.get(status, 0) + 1
+
+    async def produce(pool: ProcessPoolExecutor) -> None:
+        window = deque()
+        for row in read_manifest(manifest):
+            try:
+                row["_member"] = Account.from_key(row["private_key"]).address
+            except (KeyError, ValueError) as e:
+                print(f"  line {row['_line']}: invalid private_key ({e})")
+                count("invalid")
+                continue
+            if row["_member"] in checkpoint:
+                count("skipped")
+                continue
+            window.append(loop.run_in_executor(pool, prepare_submission, row, base_dir))
+            if len(window) >= workers * 4:
+                await queue.put(await window.popleft())
+        while window:
+            await queue.put(await window.popleft())
+        for _ in range(max_in_flight):
+            await queue.put(None)
+
+    async def consume() -> None:
+        while (prepared := await queue.get()) is not None:
+            if prepared["errors"]:
+                # Invalid rows are not checkpointed, so a corrected row is picked up on rerun.
+                print(f"  line {prepared['line']}: {'; '.join(prepared['errors'])}")
+                count("invalid")
+                continue
+            if dry_run:
+                count("valid")
+                continue
+            try:
+                entry = await submit_one(w3, membership, prepared)
+            except Exception as e:
+                # Not checkpointed: transient failures are retried on the next run.
+                print(f"  line {prepared['line']}: submission failed ({e})")
+                count("failed")
+                continue
+            checkpoint.record(entry)
+            count(entry["status"])
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            await asyncio.gather(produce(pool), *(consume() for _ in range(max_in_flight)))
+    finally:
+        if w3 is not None:
+            await w3.provider.disconnect()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk member onboarding via submitBiodata")
+    parser.add_argument("manifest", type=Path, help="CSV or JSONL manifest")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    parser.add_argument("--chain-id", type=int, default=31337)
+    parser.add_argument("--membership", help="MembershipModule address (default: latest deployment)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="hashing processes")
+    parser.add_argument("--max-in-flight", type=int, default=32, help="concurrent transactions")
+    parser.add_argument("--checkpoint", type=Path, help="checkpoint file (default: logs/onboard_<manifest>.jsonl)")
+    parser.add_argument("--dry-run", action="store_true", help="hash and validate only")
+    args = parser.parse_args()
+
+    membership = args.membership or load_deployment(args.chain_id).get("MembershipModule")
+    if not membership and not args.dry_run:
+        parser.error("No MembershipModule address given and none found in deployment summaries.")
+
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = args.checkpoint or LOGS_DIR / f"onboard_{args.manifest.stem}.jsonl"
+    checkpoint = Checkpoint(checkpoint_path) if not args.dry_run else Checkpoint(Path(os.devnull))
+    try:
+        counts = asyncio.run(run_pipeline(args.manifest, args.rpc_url, membership, checkpoint,
+                                          args.workers, args.max_in_flight, args.dry_run))
+    finally:
+        checkpoint.close()
+
+    print("Onboarding finished: " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+    if not args.dry_run:
+        print(f"Checkpoint: {checkpoint_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Differential Redeploy Planner
+-----------------------------------------------
+Redeploys only what changed since the last deployment:
+  • Runtime bytecode hashes from out/ (metadata stripped, immutables
+    masked) via the ABI index
+  • On-chain code for the addresses in the latest deployment summary,
+    fetched with one batched eth_getCode and normalised the same way
+  • Changed or missing contracts plus everything depending on them,
+    in deploy order (vc_deploy.DEPLOY_SPECS)
+  • Creation gas of the contracts that are kept, as the gas saved
+
+Usage:
+    python vc_automation/vc_redeploy.py [--rpc-url URL] [--execute]
+"""
+import argparse
+import hashlib
+import json
+
+import requests
+from eth_abi import encode
+from eth_account import Account
+
+from vc_abi_index import build_index, get_artifact
+from vc_deploy import ADMIN, ADMIN_LIST, DEPLOY_ORDER, DEPLOY_SPECS, deploy_contracts, save_deployment, with_dependents
+from vc_helpers import artifact_path, load_deployment, normalized_runtime
+from vc_state import batch_rpc
+
+ANVIL_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+# ======================================================================
+# === PLANNING ===
+# ======================================================================
+def onchain_hashes(session: requests.Session, rpc_url: str, addresses: dict) -> dict:
+    """Normalised runtime hash of each deployed contract, or None where there is no code."""
+    names = [n for n in DEPLOY_ORDER if addresses.get(n)]
+    codes = batch_rpc(session, rpc_url, [("eth_getCode", [addresses[n], "latest"]) for n in names])
+    hashes = {}
+    for name, code in zip(names, codes):
+        raw = bytes.fromhex(code[2:])
+        if not raw:
+            hashes[name] = None
+            continue
+        refs = get_artifact(name)["immutable_references"]
+        hashes[name] = hashlib.sha256(normalized_runtime(raw, refs)).hexdigest()
+    return hashes
+
+
+def plan_redeploy(session: requests.Session, rpc_url: str, addresses: dict) -> dict:
+    onchain = onchain_hashes(session, rpc_url, addresses)
+    reasons = {}
+    for name in DEPLOY_ORDER:
+        compiled = get_artifact(name)["runtime_hash"]
+        if not addresses.get(name):
+            reasons[name] = "not deployed"
+        elif onchain.get(name) is None:
+            reasons[name] = "no code at recorded address"
+        elif compiled is None:
+            reasons[name] = "linked library references; cannot compare"
+        elif compiled != onchain[name]:
+            reasons[name] = "bytecode changed"
+
+    to_deploy = with_dependents(reasons)
+    for name in to_deploy:
+        reasons.setdefault(name, "depends on " + ", ".join(
+            d for d in DEPLOY_SPECS[name]["depends_on"] if d in to_deploy))
+    return {
+        "deploy": to_deploy,
+        "keep": [n for n in DEPLOY_ORDER if n not in to_deploy],
+        "reasons": reasons,
+    }
+
+# ======================================================================
+# === GAS SAVED ===
+# ======================================================================
+def _constructor_values(name: str, addresses: dict, admin: str) -> tuple:
+    values = []
+    for arg in DEPLOY_SPECS[name]["constructor_args"]:
+        if arg == ADMIN:
+            values.append(admin)
+        elif arg == ADMIN_LIST:
+            values.append([admin])
+        else:
+            values.append(addresses.get(arg, arg))
+    return tuple(values)
+
+
+def creation_data(name: str, addresses: dict, admin: str) -> str:
+    with open(artifact_path(name), "r", encoding="utf-8") as f:
+        artifact = json.load(f)
+    bytecode = artifact["bytecode"]["object"]
+    constructor = next((item for item in artifact["abi"] if item.get("type") == "constructor"), None)
+    args = b""
+    if constructor and constructor["inputs"]:
+        args = encode([i["type"] for i in constructor["inputs"]], list(_constructor_values(name, addresses, admin)))
+    return bytecode + args.hex()
+
+
+def intrinsic_creation_gas(data_hex: str, runtime_size: int) -> int:
+    """Lower bound when estimation fails: base + calldata + code deposit."""
+    data = bytes.fromhex(data_hex.removeprefix("0x"))
+    zero = data.count(0)
+    return 53_000 + 4 * zero + 16 * (len(data) - zero) + 200 * runtime_size
+
+
+def estimate_saved_gas(session: requests.Session, rpc_url: str, names: list,
+                       addresses: dict, admin: str) -> dict:
+    """Creation gas per kept contract, from one batch of eth_estimateGas calls."""
+    if not names:
+        return {}
+    datas = {n: creation_data(n, addresses, admin) for n in names}
+    payload = [{"jsonrpc": "2.0", "id": i, "method": "eth_estimateGas",
+                "params": [{"from": admin, "data": datas[n]}]} for i, n in enumerate(names)]
+    replies = {r["id"]: r for r in session.post(rpc_url, json=payload, timeout=60).json()}
+    saved = {}
+    for i, name in enumerate(names):
+        reply = replies.get(i, {})
+        if "result" in reply:
+            saved[name] = {"gas": int(reply["result"], 16), "estimated": True}
+        else:
+            with open(artifact_path(name), "r", encoding="utf-8") as f:
+                runtime = json.load(f)["deployedBytecode"]["object"]
+            saved[name] = {"gas": intrinsic_creation_gas(datas[name], len(runtime.removeprefix("0x")) // 2),
+                           "estimated": False}
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redeploy only contracts whose bytecode changed")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    parser.add_argument("--chain-id", type=int, default=31337)
+    parser.add_argument("--private-key", default=ANVIL_KEY)
+    parser.add_argument("--admin", help="admin passed to constructors (default: the --private-key account)")
+    parser.add_argument("--execute", action="store_true", help="deploy the plan (default: print it only)")
+    args = parser.parse_args()
+    args.admin = args.admin or Account.from_key(args.private_key).address
+
+    build_index()
+    addresses = load_deployment(args.chain_id)
+    session = requests.Session()
+    plan = plan_redeploy(session, args.rpc_url, addresses)
+    saved = estimate_saved_gas(session, args.rpc_url, plan["keep"], addresses, args.admin)
+
+    print("=== Redeploy plan (dependency order) ===")
+    for step, name in enumerate(plan["deploy"], 1):
+        print(f"  {step}. {name:18} {plan['reasons'][name]}")
+    if not plan["deploy"]:
+        print("  nothing to deploy: on-chain code matches out/")
+    print("=== Kept ===")
+    for name in plan["keep"]:
+        gas = saved[name]
+        print(f"  {name:18} {addresses[name]}  saves {gas['gas']:>10,} gas{'' if gas['estimated'] else ' (approx.)'}")
+    print(f"Gas saved vs full redeploy: {sum(g['gas'] for g in saved.values()):,} "
+          f"({len(plan['keep'])}/{len(DEPLOY_ORDER)} contracts kept)")
+
+    if args.execute and plan["deploy"]:
+        updated = deploy_contracts(plan["deploy"], addresses, args.rpc_url, args.private_key, args.admin)
+        failed = [n for n in plan["deploy"] if updated.get(n) == addresses.get(n)]
+        if failed:
+            print(f"Redeploy stopped; not deployed: {', '.join(failed)}. Deployment summary left unchanged.")
+            raise SystemExit(1)
+        print(f"Saved deployment summary to {save_deployment(updated, args.chain_id)}")
+
+
+if __name__ == "__main__":
+    main()
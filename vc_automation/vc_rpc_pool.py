@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Adaptive RPC Pool
+-----------------------------------
+A JSON-RPC transport for the throttled public endpoints in foundry.toml:
+  • Per-endpoint AIMD concurrency: the limit halves on HTTP 429, rate-limit
+    errors, failures or latency spikes, and grows by one per window of
+    successful requests
+  • Per-endpoint token buckets, plus Retry-After cooldowns
+  • Hedged reads: when the first endpoint has not answered within its
+    typical latency, the same read is sent to the next one and the first
+    answer wins
+  • Failover across the endpoint list for transient errors
+
+JSON-RPC errors such as reverts are answers, not failures: they are
+returned as-is and never retried. Writes are not hedged; they fail over
+only on transient errors. A write that failed after reaching the wire may
+still have been accepted, so when its resend is rejected as "already known"
+or "nonce too low" the pool answers with the hash of the signed transaction
+instead of the error.
+
+ThrottlingNode is a local fake node that enforces a rate and a concurrency
+capacity with 429s and slows down under load, for exercising the pool
+without touching a public endpoint.
+
+Usage:
+    pool = RpcPool(endpoints_from_foundry(["optimism_sepolia", "arbitrum_one_sepolia"]))
+    w3 = AsyncWeb3(PooledProvider(pool))
+
+    python vc_automation/vc_rpc_pool.py selftest --requests 3000
+    python vc_automation/vc_rpc_pool.py probe optimism_sepolia arbitrum_one_sepolia
+"""
+import argparse
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import aiohttp
+from eth_utils import keccak
+from web3.providers import AsyncBaseProvider
+
+from vc_helpers import PROJECT_ROOT
+from vc_metrics import REGISTRY
+
+READ_METHODS = {
+    "eth_blockNumber", "eth_call", "eth_chainId", "eth_estimateGas", "eth_feeHistory",
+    "eth_gasPrice", "eth_getBalance", "eth_getBlockByHash", "eth_getBlockByNumber",
+    "eth_getBlockReceipts", "eth_getCode", "eth_getLogs", "eth_getStorageAt",
+    "eth_getTransactionByHash", "eth_getTransactionCount", "eth_getTransactionReceipt",
+    "eth_maxPriorityFeePerGas", "net_version", "web3_clientVersion",
+}
+THROTTLE_STATUSES = {429, 503}
+THROTTLE_ERROR_CODES = {-32005, -32029, 429}
+ALREADY_SENT_ERRORS = ("already known", "known transaction", "nonce too low")
+
+ENDPOINT_LIMIT = REGISTRY.gauge("vc_rpc_concurrency_limit", "Current AIMD concurrency limit", ("endpoint",))
+ENDPOINT_THROTTLED = REGISTRY.counter("vc_rpc_throttled_total", "Throttled responses per endpoint",
+                                      ("endpoint",))
+HEDGED = REGISTRY.counter("vc_rpc_hedged_total", "Reads sent to a second endpoint")
+
+
+class TransientError(Exception):
+    """A failure worth retrying on another endpoint."""
+
+
+class RpcUnavailable(Exception):
+    """Every attempt on every endpoint failed."""
+
+# ======================================================================
+# === RATE CONTROL ===
+# ======================================================================
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AimdLimiter:
+    """Additive-increase / multiplicative-decrease concurrency limit.
+
+    Backoffs are applied at most once per typical round trip, since every
+    request in flight during congestion reports the same signal.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64,
+                 backoff: float = 0.5, latency_factor: float = 2.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_factor = latency_factor
+        self.in_flight = 0
+        self.latency: Optional[float] = None  # smoothed successful latency
+        self.backoffs = 0
+        self._last_backoff = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: Optional[float], congested: bool) -> None:
+        """latency None means the request was abandoned (e.g. a losing hedge)."""
+        async with self._cond:
+            self.in_flight -= 1
+            if latency is not None:
+                spike = self.latency is not None and latency > self.latency * self.latency_factor
+                if congested or spike:
+                    now = time.monotonic()
+                    if now - self._last_backoff > (self.latency or latency):
+                        self.limit = max(self.minimum, self.limit * self.backoff)
+                        self._last_backoff = now
+                        self.backoffs += 1
+                else:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                if not congested:
+                    self.latency = latency if self.latency is None else 0.95 * self.latency + 0.05 * latency
+            self._cond.notify_all()
+
+
+class Endpoint:
+    def __init__(self, name: str, url: str, rate: float = 25.0, burst: Optional[float] = None,
+                 initial_concurrency: int = 4, max_concurrency: int = 64):
+        self.name = name
+        self.url = url
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AimdLimiter(initial_concurrency, maximum=max_concurrency)
+        self.cooldown_until = 0.0
+        self.failures = 0
+        self.requests = 0
+        self.throttled = 0
+        ENDPOINT_LIMIT.set_function(lambda: self.limiter.limit, endpoint=name)
+
+    @property
+    def load(self) -> float:
+        return self.limiter.in_flight / self.limiter.limit
+
+    def hedge_delay(self, floor: float) -> float:
+        latency = self.limiter.latency
+        return max(floor, 2 * latency) if latency is not None else max(floor, 1.0)
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "limit": round(self.limiter.limit, 2),
+            "backoffs": self.limiter.backoffs,
+            "latency_ms": round(self.limiter.latency * 1000, 1) if self.limiter.latency else None,
+        }
+
+
+def endpoints_from_foundry(names: Optional[list] = None, **options) -> list:
+    """Endpoints from the [rpc_endpoints] table of foundry.toml, in the given order."""
+    text = (PROJECT_ROOT / "foundry.toml").read_text(encoding="utf-8")
+    section = re.search(r"^\[rpc_endpoints\]\s*$(.*?)(?=^\[|\Z)", text, re.M | re.S)
+    table = dict(re.findall(r'^\s*([\w-]+)\s*=\s*"([^"]+)"', section.group(1), re.M)) if section else {}
+    names = names or list(table)
+    missing = [n for n in names if n not in table]
+    if missing:
+        raise KeyError(f"Not in foundry.toml [rpc_endpoints]: {', '.join(missing)}")
+    return [Endpoint(n, table[n], **options) for n in names]
+
+# ======================================================================
+# === POOL ===
+# ======================================================================
+class RpcPool:
+    """Routes JSON-RPC requests over several endpoints."""
+
+    def __init__(self, endpoints: list, max_attempts: int = 6,
+                 hedge_floor: float = 0.05, request_timeout: float = 30.0):
+        if not endpoints:
+            raise ValueError("RpcPool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.max_attempts = max_attempts
+        self.hedge_floor = hedge_floor
+        self.request_timeout = request_timeout
+        self.hedged = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ids = 0
+
+    async def __aenter__(self) -> "RpcPool":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _session_for_loop(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                connector=aiohttp.TCPConnector(limit=0))
+        return self._session
+
+    def _pick(self, exclude: set, idle_only: bool = False) -> Optional[Endpoint]:
+        """Least-loaded endpoint out of cooldown, preferring the list order on ties."""
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e not in exclude and e.cooldown_until <= now
+                      and not (idle_only and e.load >= 1)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda e: (e.load >= 1, e.failures > 0, e.load))
+
+    async def _attempt(self, endpoint: Endpoint, payload: dict, sent: asyncio.Event) -> dict:
+        await endpoint.bucket.acquire()
+        await endpoint.limiter.acquire()
+        if endpoint.cooldown_until > time.monotonic():
+            # Went into cooldown while we were queued: try elsewhere without sending.
+            await endpoint.limiter.release(None, False)
+            raise TransientError(f"{endpoint.name}: cooling down")
+        endpoint.requests += 1
+        start = time.monotonic()
+        sent.set()
+        congested = abandoned = False
+        try:
+            async with self._session_for_loop().post(endpoint.url, json=payload) as response:
+                if response.status in THROTTLE_STATUSES:
+                    congested = True
+                    retry_after = response.headers.get("Retry-After", "")
+                    if retry_after.isdigit():
+                        endpoint.cooldown_until = time.monotonic() + int(retry_after)
+                    raise TransientError(f"{endpoint.name}: HTTP {response.status}")
+                if response.status >= 500:
+                    congested = True
+                    raise TransientError(f"{endpoint.name}: HTTP {response.status}")
+                body = await response.json(content_type=None)
+            error = body.get("error") if isinstance(body, dict) else None
+            if error and (error.get("code") in THROTTLE_ERROR_CODES
+                          or "rate limit" in str(error.get("message", "")).lower()):
+                congested = True
+                raise TransientError(f"{endpoint.name}: {error.get('message')}")
+            endpoint.failures = 0
+            return body
+        except TransientError:
+            endpoint.throttled += 1
+            ENDPOINT_THROTTLED.labels(endpoint.name).inc()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+            congested = True
+            endpoint.failures += 1
+            raise TransientError(f"{endpoint.name}: {e!r}") from e
+        except asyncio.CancelledError:
+            abandoned = True  # a losing hedge says nothing about the endpoint
+            raise
+        finally:
+            await endpoint.limiter.release(None if abandoned else time.monotonic() - start, congested)
+
+    async def request(self, method: str, params: list) -> dict:
+        """Send one request and return the JSON-RPC response object."""
+        self._ids += 1
+        payload = {"jsonrpc": "2.0", "id": self._ids, "method": method, "params": params}
+        hedge = method in READ_METHODS and len(self.endpoints) > 1
+        errors = []
+        attempts = 0
+        used: set = set()
+        running: dict = {}  # task -> (endpoint, event set once the request is on the wire)
+        resent = False  # a write that reached an endpoint failed and is being sent again
+
+        def launch(hedging: bool = False) -> bool:
+            nonlocal attempts
+            endpoint = self._pick(used | {e for e, _ in running.values()}, idle_only=hedging)
+            if endpoint is None and not running:
+                used.clear()  # every endpoint tried: start another round
+                endpoint = self._pick(set())
+            if endpoint is None or attempts >= self.max_attempts:
+                return False
+            attempts += 1
+            used.add(endpoint)
+            sent = asyncio.Event()
+            running[asyncio.ensure_future(self._attempt(endpoint, payload, sent))] = (endpoint, sent)
+            return True
+
+        try:
+            while True:
+                if not running and not launch():
+                    if attempts >= self.max_attempts:
+                        raise RpcUnavailable(f"{method} failed on every endpoint: {'; '.join(errors)}")
+                    # Everything is cooling down after a 429: wait for the first to recover.
+                    await asyncio.sleep(max(0.05, min(e.cooldown_until for e in self.endpoints)
+                                            - time.monotonic()))
+                    continue
+                delay = None
+                if hedge and len(running) == 1:
+                    endpoint, sent = next(iter(running.values()))
+                    if not sent.is_set():
+                        # Time spent queued for our own limiter is not a slow endpoint.
+                        waiter = asyncio.ensure_future(sent.wait())
+                        await asyncio.wait([waiter, *running], return_when=asyncio.FIRST_COMPLETED)
+                        waiter.cancel()
+                    delay = endpoint.hedge_delay(self.hedge_floor)
+                done, _ = await asyncio.wait(running, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if launch(hedging=True):
+                        self.hedged += 1
+                        HEDGED.inc()
+                    else:
+                        hedge = False
+                    continue
+                for task in done:
+                    _, sent = running.pop(task)
+                    try:
+                        reply = task.result()
+                    except TransientError as e:
+                        errors.append(str(e))
+                        resent = resent or (method == "eth_sendRawTransaction" and sent.is_set())
+                        if hedge or not running:
+                            launch()
+                        continue
+                    if resent:
+                        reply = _already_sent(reply, params[0])
+                    return reply
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def call(self, method: str, params: list):
+        """The result of a request, raising RuntimeError on a JSON-RPC error."""
+        reply = await self.request(method, params)
+        if "error" in reply:
+            raise RuntimeError(f"{method} failed: {reply['error']}")
+        return reply["result"]
+
+    def stats(self) -> dict:
+        return {"hedged": self.hedged, "endpoints": {e.name: e.stats() for e in self.endpoints}}
+
+
+def _already_sent(reply: dict, raw_tx: str) -> dict:
+    """Turn the rejection of a resent transaction into its hash: the first
+    send was accepted even though its answer was lost."""
+    error = reply.get("error")
+    if not error or not any(m in str(error.get("message", "")).lower() for m in ALREADY_SENT_ERRORS):
+        return reply
+    return {"jsonrpc": "2.0", "id": reply.get("id"), "result": "0x" + keccak(hexstr=raw_tx).hex()}
+
+
+class PooledProvider(AsyncBaseProvider):
+    """AsyncWeb3 provider backed by an RpcPool."""
+
+    def __init__(self, pool: RpcPool):
+        super().__init__()
+        self.pool = pool
+
+    async def make_request(self, method, params):
+        return await self.pool.request(method, list(params))
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            await self.pool.call("web3_clientVersion", [])
+            return True
+        except Exception:
+            if show_traceback:
+                raise
+            return False
+
+    async def disconnect(self) -> None:
+        await self.pool.close()
+
+# ======================================================================
+# === FAKE THROTTLING NODE ===
+# ======================================================================
+class _ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, data, headers = self.server.handle_rpc(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client cancelled a losing hedge
+
+    def log_message(self, *args):
+        pass
+
+
+class ThrottlingNode(ThreadingHTTPServer):
+    """Fake node that answers with 429 beyond `rate` req/s or `capacity`
+    concurrent requests, and slows down as concurrency approaches capacity."""
+    daemon_threads = True
+
+    def __init__(self, rate: float, capacity: int, latency: float = 0.01,
+                 retry_after: Optional[int] = None, port: int = 0, host: str = "127.0.0.1"):
+        super().__init__((host, port), _ThrottlingHandler)
+        self.rate = rate
+        self.capacity = capacity
+        self.latency = latency
+        self.retry_after = retry_after
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.served = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle_rpc(self, body: bytes) -> tuple:
+        request = json.loads(body)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1 or self.in_flight >= self.capacity:
+                self.throttled += 1
+                headers = {"Retry-After": str(self.retry_after)} if self.retry_after else {}
+                return 429, b'{"error":"too many requests"}', headers
+            self.tokens -= 1
+            self.in_flight += 1
+            load = self.in_flight / self.capacity
+        try:
+            time.sleep(self.latency * (1 + 3 * load * load))
+            result = {"eth_chainId": "0x7a69", "eth_blockNumber": hex(self.served)}.get(
+                request.get("method"), "0x")
+            reply = {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+            return 200, json.dumps(reply).encode("utf-8"), {}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.served += 1
+
+    def __enter__(self) -> "ThrottlingNode":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+# ======================================================================
+# === CLI ===
+# ======================================================================
+async def drive(pool: RpcPool, requests: int, concurrency: int, method: str = "eth_blockNumber") -> dict:
+    """Issue `requests` reads with up to `concurrency` callers; returns timing and failures."""
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            try:
+                await pool.call(method, [])
+            except (RpcUnavailable, RuntimeError):
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {"requests": requests, "failures": failures, "seconds": round(elapsed, 3),
+            "requests_per_second": round(requests / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive multi-endpoint JSON-RPC pool")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    selftest = sub.add_parser("selftest", help="drive the pool against local throttling fake nodes")
+    selftest.add_argument("--requests", type=int, default=3000)
+    selftest.add_argument("--concurrency", type=int, default=64, help="concurrent callers")
+
+    probe = sub.add_parser("probe", help="drive the pool against foundry.toml endpoints")
+    probe.add_argument("names", nargs="*", help="[rpc_endpoints] names (default: all)")
+    probe.add_argument("--requests", type=int, default=200)
+    probe.add_argument("--concurrency", type=int, default=32)
+    probe.add_argument("--rate", type=float, default=10.0, help="per-endpoint requests per second")
+
+    args = parser.parse_args()
+
+    if args.command == "selftest":
+        with ThrottlingNode(rate=400, capacity=8) as fast, ThrottlingNode(rate=150, capacity=4, latency=0.02) as slow:
+            pool = RpcPool([Endpoint("fast", fast.url, rate=1000, max_concurrency=32),
+                            Endpoint("slow", slow.url, rate=1000, max_concurrency=32)])
+
+            async def run():
+                async with pool:
+                    return await drive(pool, args.requests, args.concurrency)
+
+            result = asyncio.run(run())
+            result["nodes"] = {"fast": {"served": fast.served, "throttled": fast.throttled},
+                               "slow": {"served": slow.served, "throttled": slow.throttled}}
+    else:
+        pool = RpcPool(endpoints_from_foundry(args.names or None, rate=args.rate))
+
+        async def run():
+            async with pool:
+                return await drive(pool, args.requests, args.concurrency)
+
+        result = asyncio.run(run())
+
+    result["pool"] = pool.stats()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
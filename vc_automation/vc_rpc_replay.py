@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa JSON-RPC Record / Replay
+------------------------------------------
+Offline stand-in for Anvil when testing the automation pipeline:
+  • record: a proxy in front of a real node that captures every JSON-RPC
+    request/response pair (batches included) to a gzip JSONL file
+  • replay: a lightweight local server answering the same requests from the
+    recording, deterministically and without a node or forge
+
+Requests are matched on (method, params). When the same request was recorded
+several times (eth_blockNumber, receipt polling), the answers are replayed
+in recorded order and the last one repeats. Unknown requests get a JSON-RPC
+error, so drift between the recording and the code under test is visible.
+
+eth_sendRawTransaction is matched on the decoded (to, data, value) instead:
+concurrent senders such as stage 4's toolkit hand out nonces in the order
+estimates finish, so raw bytes and hashes differ between runs. The replay
+answers with the hash of the transaction it actually received and maps it
+to the recorded hash in later requests (receipt polling) and back in the
+replies.
+Each ReplayServer binds its own free port, so many replays can run in
+parallel.
+
+Usage:
+    python vc_automation/vc_rpc_replay.py record run.jsonl.gz --upstream http://127.0.0.1:8545 --port 8546
+    python vc_automation/vc_rpc_replay.py replay run.jsonl.gz --port 8547
+
+    with ReplayServer("run.jsonl.gz") as rpc_url:
+        stage_4_post_deploy_setup(chain_folder, rpc_url=rpc_url)
+"""
+import argparse
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+import requests
+import rlp
+from eth_account.typed_transactions import TypedTransaction
+from eth_utils import keccak
+from hexbytes import HexBytes
+
+NOT_RECORDED = -32601
+
+# ======================================================================
+# === RECORDING FORMAT ===
+# ======================================================================
+def decode_raw_transaction(raw_hex: str) -> dict:
+    """The nonce-independent part of a signed transaction."""
+    raw = bytes.fromhex(raw_hex.removeprefix("0x"))
+    if raw and raw[0] <= 0x7f:
+        tx = TypedTransaction.from_bytes(HexBytes(raw)).as_dict()
+        to, data, value = tx.get("to") or b"", tx.get("data") or b"", tx.get("value", 0)
+    else:
+        # legacy: [nonce, gasPrice, gas, to, value, data, v, r, s]
+        to, value, data = rlp.decode(raw)[3:6]
+        value = int.from_bytes(value, "big")
+    return {"to": "0x" + bytes(HexBytes(to)).hex(), "data": "0x" + bytes(HexBytes(data)).hex(), "value": value}
+
+
+def request_key(request: dict) -> str:
+    method, params = request.get("method"), request.get("params", [])
+    if method == "eth_sendRawTransaction" and params:
+        params = [decode_raw_transaction(params[0])]
+    return json.dumps([method, params], sort_keys=True, separators=(",", ":"))
+
+
+def load_recording(path) -> dict:
+    """Map request key -> list of recorded replies (without ids)."""
+    replies = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            replies.setdefault(entry["k"], []).append(entry["r"])
+    return replies
+
+
+def _as_list(payload):
+    return payload if isinstance(payload, list) else [payload]
+
+
+def _swap_hashes(value, mapping: dict):
+    """Replace every string in a JSON value that is a key of `mapping` (lowercase hex)."""
+    if isinstance(value, str):
+        return mapping.get(value.lower(), value)
+    if isinstance(value, list):
+        return [_swap_hashes(v, mapping) for v in value]
+    if isinstance(value, dict):
+        return {k: _swap_hashes(v, mapping) for k, v in value.items()}
+    return value
+
+# ======================================================================
+# === SERVERS ===
+# ======================================================================
+class _JsonRpcHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as two writes
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            self._send(400, b'{"jsonrpc":"2.0","id":null,"error":{"code":-32700,"message":"Parse error"}}')
+            return
+        reply = self.server.answer(payload, body)
+        self._send(200, json.dumps(reply, separators=(",", ":")).encode("utf-8"))
+
+    def _send(self, status: int, data: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class RecordingProxy(ThreadingHTTPServer):
+    """Forwards JSON-RPC to an upstream node and records each exchange."""
+    daemon_threads = True
+
+    def __init__(self, upstream: str, output, port: int = 0, host: str = "127.0.0.1"):
+        super().__init__((host, port), _JsonRpcHandler)
+        self.upstream = upstream
+        self.session = requests.Session()
+        self._out = gzip.open(output, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def answer(self, payload, body: bytes):
+        response = self.session.post(self.upstream, data=body,
+                                     headers={"Content-Type": "application/json"}, timeout=600)
+        reply = response.json()
+        by_id = {r.get("id"): r for r in _as_list(reply)}
+        with self._lock:
+            for request in _as_list(payload):
+                answer = by_id.get(request.get("id"))
+                if answer is None:
+                    continue
+                recorded = {k: v for k, v in answer.items() if k in ("result", "error")}
+                self._out.write(json.dumps({"k": request_key(request), "r": recorded},
+                                           separators=(",", ":")) + "\n")
+                self.recorded += 1
+            self._out.flush()
+        return reply
+
+    def server_close(self):
+        super().server_close()
+        self._out.close()
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Answers JSON-RPC requests from a recording.
+
+    Usable as a context manager that serves in a background thread and
+    yields the server URL.
+    """
+    daemon_threads = True
+
+    def __init__(self, recording, port: int = 0, host: str = "127.0.0.1"):
+        super().__init__((host, port), _JsonRpcHandler)
+        self.replies = load_recording(recording)
+        self._cursor: dict = {}
+        self._to_recorded: dict = {}     # replayed tx hash -> recorded tx hash
+        self._to_replayed: dict = {}     # recorded tx hash -> replayed tx hash
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.misses = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _answer_one(self, request: dict) -> dict:
+        method = request.get("method")
+        with self._lock:
+            if method != "eth_sendRawTransaction" and self._to_recorded:
+                request = dict(request, params=_swap_hashes(request.get("params", []), self._to_recorded))
+            key = request_key(request)
+            recorded = self.replies.get(key)
+            if not recorded:
+                self.misses += 1
+                reply = {"error": {"code": NOT_RECORDED, "message": f"not recorded: {method}"}}
+            else:
+                index = self._cursor.get(key, 0)
+                reply = recorded[min(index, len(recorded) - 1)]
+                self._cursor[key] = index + 1
+            if method == "eth_sendRawTransaction" and "result" in reply:
+                raw = request["params"][0]
+                replayed = "0x" + keccak(hexstr=raw).hex()
+                self._to_recorded[replayed] = reply["result"].lower()
+                self._to_replayed[reply["result"].lower()] = replayed
+                reply = dict(reply, result=replayed)
+            elif self._to_replayed:
+                reply = _swap_hashes(reply, self._to_replayed)
+        return dict(reply, jsonrpc="2.0", id=request.get("id"))
+
+    def answer(self, payload, body: bytes):
+        if isinstance(payload, list):
+            return [self._answer_one(r) for r in payload]
+        return self._answer_one(payload)
+
+    def __enter__(self) -> str:
+        # A short poll interval so leaving the block does not wait up to 0.5s
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self.url
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay JSON-RPC traffic")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="proxy to a real node and record traffic")
+    record.add_argument("output", type=Path)
+    record.add_argument("--upstream", default="http://127.0.0.1:8545")
+    record.add_argument("--port", type=int, default=8546)
+
+    replay = sub.add_parser("replay", help="serve a recording")
+    replay.add_argument("recording", type=Path)
+    replay.add_argument("--port", type=int, default=8547)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        server = RecordingProxy(args.upstream, args.output, args.port)
+        print(f"Recording {args.upstream} via {server.server_address[0]}:{server.server_address[1]} -> {args.output}")
+    else:
+        server = ReplayServer(args.recording, args.port)
+        print(f"Replaying {args.recording} ({sum(map(len, server.replies.values()))} replies) on {server.url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.command == "record":
+            print(f"Recorded {server.recorded} exchanges.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Scenario Runner
+---------------------------------
+Runs declarative loan-lifecycle scenarios in parallel, each on a clean chain:
+  • Scenario files (vc_automation/scenarios/*.json) list steps that send
+    transactions, call views with expectations, warp time or deploy helper
+    contracts, optionally once per account or per saved loan id
+  • The core contracts are deployed once onto a seed Anvil and its state is
+    dumped (anvil_dumpState) to vc_automation/cache/; the dump is reused
+    until the forge build changes
+  • One Anvil per worker process on a free port, loaded from the dump; each
+    scenario starts from an evm_snapshot of that state, so scenarios never
+    see each other's transactions
+  • One report comparing outcomes, final loan states and gas per function
+    across scenarios
+
+Step reference (one action per step):
+    {"send": "LoanLogicFixed.markDefault", "args": ["$item"], "from": "$admin",
+     "value": "1 ether", "expect_revert": "Loan not overdue",
+     "save": {"event": "LoanCore.LoanCreated", "arg": "loanId", "as": "loans"}}
+    {"call": "LoanCore.getLoan", "args": ["$item"], "expect": {"status": "$Defaulted"}}
+    {"warp": 604801}
+    {"deploy": {"contract": "MockERC20", "args": ["Mock", "MCK"], "as": "MockToken"}}
+Any step may add "for_each": "$list" (with "$item" and "$index", its
+position in the list, in scope) and "slice": [start, stop, step]. Values: "$name", "$name[$index]",
+"$name[2]", amounts like "0.5 ether", enum names like "$Verified",
+"$Token" or "$Defaulted", contract names like "$LoanLogicFixed", "$admin"
+and "$zero". "accounts" maps group names to [start, stop) ranges of
+Anvil dev accounts; account 0 is the admin that deployed everything.
+
+Usage:
+    python vc_automation/vc_scenarios.py                       # all scenarios
+    python vc_automation/vc_scenarios.py scenarios/mass_defaults.json --workers 2
+    python vc_automation/vc_scenarios.py --reseed --report report.json
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import multiprocessing
+import os
+import re
+import subprocess
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+import requests
+from eth_account import Account
+from web3 import Web3
+from web3.exceptions import ContractLogicError, Web3RPCError
+from web3.logs import DISCARD
+
+from vc_abi_index import build_hash
+from vc_deploy import DEPLOY_ORDER, deploy_contracts
+from vc_helpers import (ACTIVE_LOAN_STATUSES, KYC_STATUSES, LOAN_STATUSES, PAYMENT_TYPES, PROJECT_ROOT,
+                        VC_DIR, artifact_path, load_abi, local_anvil)
+from vc_state import batch_rpc
+
+SCENARIOS_DIR = VC_DIR / "scenarios"
+STATE_PATH = VC_DIR / "cache" / "scenario_state.json"
+LOGS_DIR = VC_DIR / "logs"
+
+ANVIL_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+ACCOUNTS = 64  # dev accounts per Anvil; scenarios may use indices 1..ACCOUNTS-1
+
+STEP_KINDS = ("send", "call", "warp", "deploy")
+UNITS = {"wei": 1, "gwei": 10**9, "ether": 10**18}
+AMOUNT_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*(wei|gwei|ether)$")
+REF_RE = re.compile(r"^\$(\w+)(?:\[(\$index|-?\d+)\])?$")
+ENUMS = {name: i for names in (KYC_STATUSES, PAYMENT_TYPES, LOAN_STATUSES) for i, name in enumerate(names)}
+
+# ======================================================================
+# === SCENARIO FILES ===
+# ======================================================================
+def load_scenario(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        scenario = json.load(f)
+    scenario.setdefault("name", path.stem)
+    for group, (start, stop) in scenario.get("accounts", {}).items():
+        if not 0 < start < stop <= ACCOUNTS:
+            raise ValueError(f"{path.name}: accounts.{group} must be a range within [1, {ACCOUNTS})")
+    for i, step in enumerate(scenario["steps"]):
+        kinds = [k for k in STEP_KINDS if k in step]
+        if len(kinds) != 1:
+            raise ValueError(f"{path.name}: step {i} needs exactly one of {', '.join(STEP_KINDS)}")
+    return scenario
+
+
+def _plain(value):
+    """Decoded arrays and structs come back as tuples; expectations are written as JSON lists."""
+    return [_plain(v) for v in value] if isinstance(value, (list, tuple)) else value
+
+
+def named_outputs(outputs: list, result):
+    """View results keyed by ABI output names, so expectations can name fields."""
+    if len(outputs) == 1:
+        components = outputs[0].get("components")
+        if outputs[0]["type"] == "tuple" and components:
+            return {c["name"]: _plain(v) for c, v in zip(components, result)}
+        return _plain(result)
+    return {o["name"] or str(i): _plain(v) for i, (o, v) in enumerate(zip(outputs, result))}
+
+# ======================================================================
+# === EXECUTION ===
+# ======================================================================
+class ScenarioRun:
+    """Executes one scenario against a chain holding the seeded deployment."""
+
+    def __init__(self, w3: Web3, scenario: dict, addresses: dict, accounts: list):
+        self.w3 = w3
+        self.scenario = scenario
+        self.contracts = {name: w3.eth.contract(address=address, abi=load_abi(name))
+                          for name, address in addresses.items()}
+        self.vars = dict(ENUMS, **addresses, admin=accounts[0], zero=ZERO_ADDRESS)
+        for group, (start, stop) in scenario.get("accounts", {}).items():
+            self.vars[group] = accounts[start:stop]
+        for name, value in scenario.get("variables", {}).items():
+            self.vars[name] = self.resolve(value, {})
+        self.gas = {}
+        self.failures = []
+
+    def resolve(self, value, scope: dict):
+        if isinstance(value, list):
+            return [self.resolve(v, scope) for v in value]
+        if isinstance(value, dict):
+            return {k: self.resolve(v, scope) for k, v in value.items()}
+        if not isinstance(value, str):
+            return value
+        amount = AMOUNT_RE.match(value)
+        if amount:
+            return int(Decimal(amount.group(1)) * UNITS[amount.group(2)])
+        ref = REF_RE.match(value)
+        if not ref:
+            return value
+        name, index = ref.groups()
+        if name in scope:
+            target = scope[name]
+        elif name in self.vars:
+            target = self.vars[name]
+        else:
+            raise KeyError(f"unknown variable ${name}")
+        if index is not None:
+            target = target[scope["index"] if index == "$index" else int(index)]
+        return target
+
+    def function(self, spec: str, args: list):
+        alias, name = spec.split(".", 1)
+        return alias, self.contracts[alias].functions[name](*args)
+
+    def fail(self, step: dict, scope: dict, message: str) -> None:
+        self.failures.append({"step": step.get("name", ""), "item": str(scope.get("item")),
+                              "error": message[:300]})
+
+    def record_gas(self, key: str, receipt, stats: dict) -> None:
+        total, calls = self.gas.get(key, (0, 0))
+        self.gas[key] = (total + receipt["gasUsed"], calls + 1)
+        stats["gas"] += receipt["gasUsed"]
+
+    # ------------------------------------------------------------------
+    def _send(self, step: dict, scope: dict, stats: dict) -> None:
+        _, call = self.function(step["send"], self.resolve(step.get("args", []), scope))
+        tx = {"from": self.resolve(step.get("from", "$admin"), scope),
+              "value": self.resolve(step.get("value", 0), scope)}
+        expected = step.get("expect_revert")
+        try:
+            receipt = self.w3.eth.wait_for_transaction_receipt(call.transact(tx))
+            error = None if receipt["status"] == 1 else "transaction reverted"
+        except (ContractLogicError, Web3RPCError) as e:
+            receipt, error = None, str(e)
+        stats["calls"] += 1
+        stats["transactions"] += 1
+        if receipt is not None:
+            self.record_gas(step["send"], receipt, stats)
+        if error:
+            stats["reverted"] += 1
+        if expected:
+            if error is None or (isinstance(expected, str) and expected not in error):
+                self.fail(step, scope, f"expected revert {expected!r}, got {error or 'success'}")
+        elif error:
+            self.fail(step, scope, error)
+
+        save = step.get("save")
+        if save and receipt is not None and receipt["status"] == 1:
+            event_alias, event = save["event"].split(".", 1)
+            logs = self.contracts[event_alias].events[event]().process_receipt(receipt, errors=DISCARD)
+            self.vars.setdefault(save["as"], []).extend(log["args"][save["arg"]] for log in logs)
+
+    def _call(self, step: dict, scope: dict, stats: dict) -> None:
+        _, call = self.function(step["call"], self.resolve(step.get("args", []), scope))
+        stats["calls"] += 1
+        try:
+            value = named_outputs(call.abi["outputs"], call.call())
+        except (ContractLogicError, Web3RPCError) as e:
+            self.fail(step, scope, str(e))
+            return
+        if "expect" not in step:
+            return
+        expected = self.resolve(step["expect"], scope)
+        if isinstance(expected, dict):
+            wrong = {k: value.get(k) for k, v in expected.items() if value.get(k) != v}
+            if wrong:
+                self.fail(step, scope, f"expected {expected}, got {wrong}")
+        elif value != expected:
+            self.fail(step, scope, f"expected {expected!r}, got {value!r}")
+
+    def _deploy(self, step: dict, scope: dict, stats: dict) -> None:
+        spec = step["deploy"]
+        with open(artifact_path(spec["contract"], spec.get("source")), "r", encoding="utf-8") as f:
+            artifact = json.load(f)
+        factory = self.w3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"]["object"])
+        tx_hash = factory.constructor(*self.resolve(spec.get("args", []), scope)).transact({"from": self.vars["admin"]})
+        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        stats["calls"] += 1
+        stats["transactions"] += 1
+        self.record_gas(f"deploy:{spec['contract']}", receipt, stats)
+        alias = spec.get("as", spec["contract"])
+        self.contracts[alias] = self.w3.eth.contract(address=receipt["contractAddress"], abi=artifact["abi"])
+        self.vars[alias] = receipt["contractAddress"]
+
+    def run_step(self, step: dict) -> dict:
+        stats = {"name": step.get("name", ""), "calls": 0, "transactions": 0, "reverted": 0, "gas": 0}
+        failures_before = len(self.failures)
+        start = time.perf_counter()
+        if "warp" in step:
+            self.w3.provider.make_request("evm_increaseTime", [int(self.resolve(step["warp"], {}))])
+            self.w3.provider.make_request("evm_mine", [])
+        else:
+            items = self.resolve(step["for_each"], {}) if "for_each" in step else [None]
+            # $index stays the position in the full list, so "$other[$index]" pairs up under a slice
+            positions = range(len(items))[slice(*step["slice"])] if "slice" in step else range(len(items))
+            action = self._send if "send" in step else self._call if "call" in step else self._deploy
+            for index in positions:
+                action(step, {"item": items[index], "index": index}, stats)
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        stats["failures"] = len(self.failures) - failures_before
+        return stats
+
+    def loan_summary(self) -> dict:
+        core = self.contracts["LoanCore"].functions
+        count = core.loanCounter().call()
+        by_status = Counter()
+        outstanding = 0
+        for loan_id in range(1, count + 1):
+            call = core.getLoan(loan_id)
+            loan = named_outputs(call.abi["outputs"], call.call())
+            by_status[LOAN_STATUSES[loan["status"]]] += 1
+            if loan["status"] in ACTIVE_LOAN_STATUSES:
+                outstanding += loan["loan_amount"]
+        return {"count": count, "by_status": dict(sorted(by_status.items())), "outstanding_wei": outstanding}
+
+    def run(self) -> dict:
+        start = time.perf_counter()
+        steps = []
+        for step in self.scenario["steps"]:
+            steps.append(self.run_step(step))
+            if self.failures and self.scenario.get("stop_on_failure", True):
+                break
+        elapsed = time.perf_counter() - start
+        return {
+            "name": self.scenario["name"],
+            "description": self.scenario.get("description", ""),
+            "passed": not self.failures,
+            "failures": self.failures[:20],
+            "failure_count": len(self.failures),
+            "steps": steps,
+            "transactions": sum(s["transactions"] for s in steps),
+            "reverted": sum(s["reverted"] for s in steps),
+            "gas_used": sum(s["gas"] for s in steps),
+            "gas_by_function": {key: {"calls": calls, "total": total, "avg": total // calls}
+                                for key, (total, calls) in sorted(self.gas.items())},
+            "loans": self.loan_summary(),
+            "seconds": round(elapsed, 3),
+        }
+
+# ======================================================================
+# === WORKERS ===
+# ======================================================================
+_worker = {}
+
+
+def _init_worker(rpc_urls) -> None:
+    """Claim one of the prepared Anvil instances for the lifetime of this process."""
+    rpc_url = rpc_urls.get()
+    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    _worker.update(rpc_url=rpc_url, w3=w3, snapshot=w3.provider.make_request("evm_snapshot", [])["result"])
+
+
+def _run_scenario(scenario: dict, addresses: dict) -> dict:
+    w3 = _worker["w3"]
+    # every scenario starts from the seeded state; a reverted snapshot is consumed, so take a new one
+    w3.provider.make_request("evm_revert", [_worker["snapshot"]])
+    _worker["snapshot"] = w3.provider.make_request("evm_snapshot", [])["result"]
+    try:
+        result = ScenarioRun(w3, scenario, addresses, w3.eth.accounts).run()
+    except Exception as e:
+        result = {"name": scenario["name"], "passed": False, "error": f"{type(e).__name__}: {e}",
+                  "failures": [], "failure_count": 1}
+    result["rpc_url"] = _worker["rpc_url"]
+    return result
+
+# ======================================================================
+# === SEED STATE ===
+# ======================================================================
+def seed_state(rpc_url: str) -> dict:
+    """Deploy the core contracts and dump the resulting chain state."""
+    admin = Account.from_key(ANVIL_KEY).address
+    addresses = deploy_contracts(DEPLOY_ORDER, {}, rpc_url, ANVIL_KEY, admin)
+    missing = [name for name in DEPLOY_ORDER if name not in addresses]
+    if missing:
+        raise RuntimeError(f"seed deployment failed for: {', '.join(missing)}")
+    state = batch_rpc(requests.Session(), rpc_url, [("anvil_dumpState", [])])[0]
+    return {"build": build_hash(), "accounts": ACCOUNTS, "addresses": addresses, "state": state}
+
+
+def ensure_seed_state(reseed: bool = False, path: Path = STATE_PATH) -> dict:
+    """The cached dump when it matches the current build, otherwise a fresh one."""
+    if not reseed and path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["build"] is not None and cached["build"] == build_hash() and cached["accounts"] == ACCOUNTS:
+            return cached
+    print("Seeding: deploying core contracts onto a fresh Anvil")
+    with local_anvil(accounts=ACCOUNTS) as rpc_url:
+        state = seed_state(rpc_url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    return state
+
+# ======================================================================
+# === RUN & REPORT ===
+# ======================================================================
+def run_scenarios(scenarios: list, workers: Optional[int] = None, reseed: bool = False) -> dict:
+    build = subprocess.run(["forge", "build"], cwd=str(PROJECT_ROOT), check=False)
+    if build.returncode != 0:
+        raise RuntimeError("forge build failed; fix the build before running scenarios")
+    state = ensure_seed_state(reseed)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(scenarios)))
+
+    with contextlib.ExitStack() as stack:
+        rpc_urls = [stack.enter_context(local_anvil(accounts=ACCOUNTS)) for _ in range(workers)]
+        session = requests.Session()
+        queue = multiprocessing.Queue()
+        for rpc_url in rpc_urls:
+            batch_rpc(session, rpc_url, [("anvil_loadState", [state["state"]])])
+            queue.put(rpc_url)
+
+        print(f"Running {len(scenarios)} scenarios on {workers} Anvil workers")
+        start = time.perf_counter()
+        results = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(queue,)) as pool:
+            futures = [pool.submit(_run_scenario, s, state["addresses"]) for s in scenarios]
+            for future in futures:
+                result = future.result()
+                status = "passed" if result["passed"] else result.get("error") or f"{result['failure_count']} failures"
+                print(f"  {result['name']:28} {status} ({result.get('seconds', 0):.1f}s on {result['rpc_url']})")
+                results.append(result)
+        wall = time.perf_counter() - start
+    return build_report(results, workers, wall)
+
+
+def build_report(results: list, workers: int, wall: float) -> dict:
+    functions = sorted({fn for r in results for fn in r.get("gas_by_function", {})})
+    scenario_seconds = sum(r.get("seconds", 0) for r in results)
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "workers": workers,
+        "wall_seconds": round(wall, 3),
+        "scenario_seconds": round(scenario_seconds, 3),
+        "parallel_speedup": round(scenario_seconds / wall, 2) if wall else None,
+        "passed": sum(1 for r in results if r["passed"]),
+        "failed": [r["name"] for r in results if not r["passed"]],
+        "gas_comparison": {fn: {r["name"]: r["gas_by_function"][fn]["avg"]
+                                for r in results if fn in r.get("gas_by_function", {})}
+                           for fn in functions},
+        "scenarios": results,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{'scenario':28} {'result':>7} {'txs':>6} {'reverted':>8} {'gas used':>14} {'gas/tx':>9}  loans")
+    for r in report["scenarios"]:
+        if "error" in r:
+            print(f"{r['name']:28} {'ERROR':>7}  {r['error']}")
+            continue
+        per_tx = r["gas_used"] // r["transactions"] if r["transactions"] else 0
+        loans = ", ".join(f"{status} {n}" for status, n in r["loans"]["by_status"].items())
+        print(f"{r['name']:28} {'ok' if r['passed'] else 'FAIL':>7} {r['transactions']:>6} {r['reverted']:>8} "
+              f"{r['gas_used']:>14,} {per_tx:>9,}  {loans}")
+        for failure in r["failures"][:3]:
+            print(f"    {failure['step']} [{failure['item']}]: {failure['error']}")
+
+    names = [r["name"] for r in report["scenarios"] if "error" not in r]
+    if report["gas_comparison"]:
+        print(f"\n{'avg gas per call':36}" + "".join(f"{n[:16]:>17}" for n in names))
+        for fn, by_scenario in report["gas_comparison"].items():
+            print(f"{fn[:36]:36}" + "".join(f"{by_scenario[n]:>17,}" if n in by_scenario else f"{'-':>17}"
+                                            for n in names))
+    print(f"\n{report['passed']}/{len(report['scenarios'])} passed; wall {report['wall_seconds']:.1f}s for "
+          f"{report['scenario_seconds']:.1f}s of scenarios (x{report['parallel_speedup']} on "
+          f"{report['workers']} workers)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run loan-lifecycle scenarios in parallel on isolated Anvils")
+    parser.add_argument("scenarios", nargs="*", type=Path, help="scenario files (default: scenarios/*.json)")
+    parser.add_argument("--workers", type=int, help="Anvil instances / processes (default: CPU count)")
+    parser.add_argument("--reseed", action="store_true", help="redeploy and dump the seed state")
+    parser.add_argument("--report", type=Path, help="where to write the JSON report")
+    args = parser.parse_args()
+
+    paths = args.scenarios or sorted(SCENARIOS_DIR.glob("*.json"))
+    if not paths:
+        parser.error(f"No scenario files given or found in {SCENARIOS_DIR}")
+    scenarios = [load_scenario(p) for p in paths]
+
+    report = run_scenarios(scenarios, args.workers, args.reseed)
+    print_report(report)
+
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    report_path = args.report or LOGS_DIR / f"scenarios_{timestamp}.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4, default=str)
+    print(f"Report written to {report_path}")
+    raise SystemExit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Test Shard Planner
+------------------------------------
+Splits `forge test` across N worker nodes and merges their results:
+  • plan:  list test contracts/functions under test/ and balance them into
+           N shards by historical per-test duration (longest first onto the
+           lightest shard)
+  • run:   execute one shard, one `forge test --match-path --match-contract
+           --match-test --json` per test contract in it
+  • merge: combine the per-shard JSON results into one report with
+           per-test timing, and fold the timings into the history
+
+The plan depends only on the tree and the timing history, so every node
+computes the same shards without coordinating. The history lives in
+vc_automation/test_durations.json and should be committed (or shared as a
+CI artifact) so all nodes see the same one. Tests without history are
+planned at the median known duration.
+
+Usage:
+    python vc_automation/vc_shard.py plan --shards 4
+    python vc_automation/vc_shard.py run --shard 0 --shards 4 -o shard_0.json
+    python vc_automation/vc_shard.py merge shard_*.json -o report.json
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from vc_helpers import PROJECT_ROOT, VC_DIR
+
+TEST_DIR = PROJECT_ROOT / "test"
+HISTORY_PATH = VC_DIR / "test_durations.json"
+DEFAULT_DURATION = 1.0
+HISTORY_WEIGHT = 0.5  # weight of the newest measurement in the running average
+
+CONTRACT_RE = re.compile(r"^\s*(abstract\s+)?contract\s+(\w+)", re.M)
+TEST_FN_RE = re.compile(r"^\s*function\s+((?:test|invariant)\w*)\s*\(", re.M)
+
+# ======================================================================
+# === DISCOVERY ===
+# ======================================================================
+def discover_tests(test_dir: Path = TEST_DIR) -> list:
+    """Sorted test ids "path:Contract:function" for every concrete test contract."""
+    tests = []
+    for path in sorted(test_dir.rglob("*.t.sol")):
+        source = path.read_text(encoding="utf-8", errors="ignore")
+        contracts = [(m.start(), m.group(2), bool(m.group(1))) for m in CONTRACT_RE.finditer(source)]
+        rel = path.relative_to(PROJECT_ROOT).as_posix()
+        for fn in TEST_FN_RE.finditer(source):
+            owner = [c for c in contracts if c[0] < fn.start()]
+            if owner and not owner[-1][2]:
+                tests.append(f"{rel}:{owner[-1][1]}:{fn.group(1)}")
+    return sorted(set(tests))
+
+
+def split_id(test_id: str) -> tuple:
+    path, contract, name = test_id.rsplit(":", 2)
+    return path, contract, name
+
+# ======================================================================
+# === HISTORY & PLANNING ===
+# ======================================================================
+def load_history(path: Path = HISTORY_PATH) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_history(history: dict, path: Path = HISTORY_PATH) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(history.items())), f, indent=2)
+        f.write("\n")
+    tmp_path.replace(path)
+
+
+def plan_shards(tests: list, shards: int, history: dict) -> list:
+    """Longest-processing-time-first assignment; ties broken by id and shard index."""
+    known = [history[t] for t in tests if t in history]
+    default = statistics.median(known) if known else DEFAULT_DURATION
+    weighted = sorted(((history.get(t, default), t) for t in tests), key=lambda wt: (-wt[0], wt[1]))
+    plan = [{"index": i, "estimate": 0.0, "tests": []} for i in range(shards)]
+    for duration, test_id in weighted:
+        lightest = min(plan, key=lambda s: (s["estimate"], s["index"]))
+        lightest["tests"].append(test_id)
+        lightest["estimate"] += duration
+    for shard in plan:
+        shard["tests"].sort()
+    return plan
+
+
+def shard_commands(test_ids: list) -> list:
+    """One forge invocation per test contract; matching is exact, so no test runs twice."""
+    groups = {}
+    for test_id in test_ids:
+        path, contract, name = split_id(test_id)
+        groups.setdefault((path, contract), []).append(re.escape(name))
+    return [
+        ["forge", "test", "--match-path", path, "--match-contract", f"^{contract}$",
+         "--match-test", f"^({'|'.join(names)})$", "--json"]
+        for (path, contract), names in sorted(groups.items())
+    ]
+
+# ======================================================================
+# === RUN ===
+# ======================================================================
+def parse_duration(value) -> float:
+    """Seconds from forge's duration, serialised as {"secs", "nanos"} or as "1s 250ms 3µs"."""
+    if isinstance(value, dict):
+        return float(value.get("secs", 0)) + float(value.get("nanos", 0)) / 1e9
+    if isinstance(value, (int, float)):
+        return float(value)
+    units = {"h": 3600, "m": 60, "s": 1, "ms": 1e-3, "us": 1e-6, "µs": 1e-6, "ns": 1e-9}
+    return sum(float(n) * units[u] for n, u in re.findall(r"([\d.]+)\s*(h|ms|m|s|us|µs|ns)\b", str(value or "")))
+
+
+def run_shard(index: int, shards: int, timeout: int = 3600) -> dict:
+    plan = plan_shards(discover_tests(), shards, load_history())[index]
+    build = subprocess.run(["forge", "build"], cwd=str(PROJECT_ROOT), capture_output=True, text=True, check=False)
+    if build.returncode != 0:
+        raise RuntimeError(f"forge build failed:\n{build.stderr}")
+
+    suites = {}
+    errors = []
+    start = time.perf_counter()
+    for cmd in shard_commands(plan["tests"]):
+        proc = subprocess.run(cmd, cwd=str(PROJECT_ROOT), capture_output=True, text=True,
+                              timeout=timeout, check=False)
+        try:
+            suites.update(json.loads(proc.stdout) if proc.stdout.strip() else {})
+        except json.JSONDecodeError:
+            errors.append({"command": " ".join(cmd), "exit_code": proc.returncode,
+                           "stderr": (proc.stderr or "")[-2000:]})
+    return {
+        "shard": index,
+        "shards": shards,
+        "estimate": plan["estimate"],
+        "planned": plan["tests"],
+        "wall_seconds": time.perf_counter() - start,
+        "suites": suites,
+        "errors": errors,
+    }
+
+# ======================================================================
+# === MERGE ===
+# ======================================================================
+def merge_results(results: list) -> dict:
+    tests = {}
+    shards = []
+    for result in sorted(results, key=lambda r: r["shard"]):
+        shards.append({"shard": result["shard"], "estimate": round(result["estimate"], 3),
+                       "wall_seconds": round(result["wall_seconds"], 3), "tests": len(result["planned"]),
+                       "errors": result["errors"]})
+        for suite_name, suite in result["suites"].items():
+            path, _, contract = suite_name.rpartition(":")
+            for test_name, outcome in (suite.get("test_results") or {}).items():
+                name = test_name.split("(")[0]
+                tests[f"{path}:{contract}:{name}"] = {
+                    "status": outcome.get("status"),
+                    "seconds": round(parse_duration(outcome.get("duration")), 6),
+                    "reason": outcome.get("reason"),
+                    "shard": result["shard"],
+                }
+
+    planned = {t for r in results for t in r["planned"]}
+    walls = [s["wall_seconds"] for s in shards] or [0.0]
+    return {
+        "passed": sum(1 for t in tests.values() if t["status"] == "Success"),
+        "failed": sorted(t for t, v in tests.items() if v["status"] == "Failure"),
+        "missing": sorted(planned - tests.keys()),
+        "wall_seconds": max(walls),
+        "imbalance": round(max(walls) / statistics.mean(walls), 3) if statistics.mean(walls) else 1.0,
+        "shards": shards,
+        "slowest": sorted(tests, key=lambda t: -tests[t]["seconds"])[:10],
+        "tests": dict(sorted(tests.items())),
+    }
+
+
+def update_history(history: dict, tests: dict, current: list) -> dict:
+    """Fold new timings in and drop tests that no longer exist."""
+    updated = {}
+    for test_id in current:
+        old = history.get(test_id)
+        new = tests.get(test_id, {}).get("seconds")
+        if new is None:
+            if old is not None:
+                updated[test_id] = old
+        else:
+            updated[test_id] = round(new if old is None else
+                                     HISTORY_WEIGHT * new + (1 - HISTORY_WEIGHT) * old, 6)
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan, run and merge sharded forge test runs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    plan = sub.add_parser("plan", help="print the shard plan")
+    plan.add_argument("--shards", type=int, required=True)
+    plan.add_argument("--commands", action="store_true", help="print the forge commands per shard")
+
+    run = sub.add_parser("run", help="run one shard")
+    run.add_argument("--shard", type=int, required=True)
+    run.add_argument("--shards", type=int, required=True)
+    run.add_argument("-o", "--output", type=Path, required=True)
+    run.add_argument("--timeout", type=int, default=3600, help="per forge invocation, in seconds")
+
+    merge = sub.add_parser("merge", help="merge shard results and update the timing history")
+    merge.add_argument("results", nargs="+", type=Path)
+    merge.add_argument("-o", "--output", type=Path)
+    merge.add_argument("--no-history", action="store_true", help="do not update test_durations.json")
+
+    args = parser.parse_args()
+
+    if args.command == "plan":
+        for shard in plan_shards(discover_tests(), args.shards, load_history()):
+            print(f"shard {shard['index']}: {len(shard['tests'])} tests, ~{shard['estimate']:.2f}s")
+            for line in (shard_commands(shard["tests"]) if args.commands else shard["tests"]):
+                print(f"  {' '.join(line) if args.commands else line}")
+        return
+
+    if args.command == "run":
+        if not 0 <= args.shard < args.shards:
+            parser.error("--shard must be in [0, --shards)")
+        result = run_shard(args.shard, args.shards, args.timeout)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Shard {args.shard}/{args.shards}: {len(result['planned'])} tests in "
+              f"{result['wall_seconds']:.1f}s (estimated {result['estimate']:.1f}s) -> {args.output}")
+        raise SystemExit(1 if result["errors"] else 0)
+
+    results = []
+    for path in args.results:
+        with open(path, "r", encoding="utf-8") as f:
+            results.append(json.load(f))
+    report = merge_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if not args.no_history:
+        save_history(update_history(load_history(), report["tests"], discover_tests()))
+
+    print(f"{report['passed']} passed, {len(report['failed'])} failed, {len(report['missing'])} missing; "
+          f"wall {report['wall_seconds']:.1f}s, imbalance x{report['imbalance']}")
+    for test_id in report["failed"]:
+        print(f"  FAIL {test_id}: {report['tests'][test_id]['reason']}")
+    for test_id in report["missing"]:
+        print(f"  MISSING {test_id}")
+    raise SystemExit(1 if report["failed"] or report["missing"] else 0)
+
+
+if __name__ == "__main__":
+    main()
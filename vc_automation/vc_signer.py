@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Batch Signer
+------------------------------
+Offline signing of large admin/operator batches (LoanLogicFixed.updateKyc,
+LoanManager.approveLoan) across a process pool:
+  • Calldata precomputed per call from the function selector and eth_abi
+  • Unsigned legacy or EIP-1559 transactions with consecutive nonces
+  • ECDSA signing spread over worker processes with eth_account; the key
+    is handed to each worker once, transactions travel in chunks
+  • Raw signed payloads returned in nonce order, ready for
+    eth_sendRawTransaction (submit() sends them as JSON-RPC batches)
+
+updateKyc goes straight to LoanLogicFixed, signed by its admin: the
+LoanManager wrapper calls it as the contract and fails the admin check.
+
+Signing is pure CPU work that the GIL keeps on one core in a single
+process; the bench subcommand reports signatures per second for one core
+against the pool.
+
+Usage:
+    python vc_automation/vc_signer.py kyc members.txt --status 1 --nonce 42 -o signed.jsonl [--submit]
+    python vc_automation/vc_signer.py approve 1-500 --nonce 42 -o signed.jsonl
+    python vc_automation/vc_signer.py bench --count 5000
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import requests
+from eth_abi import encode
+from eth_account import Account
+from eth_utils import keccak, to_checksum_address
+
+from vc_helpers import KYC_STATUSES, load_deployment
+from vc_state import batch_rpc
+
+ANVIL_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+OPERATOR_CALLS = {
+    # name -> (target contract, signature, ABI types, default gas limit)
+    "updateKyc": ("LoanLogicFixed", "updateKyc(address,uint8)", ("address", "uint8"), 80_000),
+    "approveLoan": ("LoanManager", "approveLoan(uint256)", ("uint256",), 120_000),
+}
+
+# ======================================================================
+# === TRANSACTION BUILDING ===
+# ======================================================================
+def encode_calls(signature: str, types: tuple, args_list) -> list:
+    """Calldata for each argument tuple; the selector is hashed once."""
+    selector = keccak(text=signature)[:4]
+    return ["0x" + (selector + encode(list(types), list(args))).hex() for args in args_list]
+
+
+def build_transactions(to: str, calldata: list, start_nonce: int, chain_id: int, gas: int,
+                       gas_price: Optional[int] = None, max_fee: Optional[int] = None,
+                       priority_fee: Optional[int] = None) -> list:
+    """Unsigned transactions with consecutive nonces; EIP-1559 when max_fee is given."""
+    to = to_checksum_address(to)
+    if max_fee is not None:
+        fees = {"maxFeePerGas": max_fee, "maxPriorityFeePerGas": priority_fee or 0, "type": 2}
+    else:
+        fees = {"gasPrice": gas_price or 0}
+    return [dict(fees, to=to, data=data, nonce=start_nonce + i, gas=gas, value=0, chainId=chain_id)
+            for i, data in enumerate(calldata)]
+
+# ======================================================================
+# === SIGNING ===
+# ======================================================================
+_worker_account = None
+
+
+def _init_worker(private_key: str) -> None:
+    global _worker_account
+    _worker_account = Account.from_key(private_key)
+
+
+def _sign_chunk(transactions: list) -> list:
+    out = []
+    for tx in transactions:
+        signed = _worker_account.sign_transaction(tx)
+        out.append((tx["nonce"], "0x" + signed.raw_transaction.hex(), "0x" + signed.hash.hex()))
+    return out
+
+
+def sign_serial(private_key: str, transactions: list) -> list:
+    """Single-process signing, the baseline for bench."""
+    _init_worker(private_key)
+    return _sign_chunk(transactions)
+
+
+def sign_batch(private_key: str, transactions: list, workers: Optional[int] = None,
+               chunk_size: int = 256) -> list:
+    """Sign across a process pool; returns (nonce, raw tx, tx hash) sorted by nonce."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(transactions) <= chunk_size:
+        return sorted(sign_serial(private_key, transactions))
+    chunks = [transactions[i:i + chunk_size] for i in range(0, len(transactions), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(private_key,)) as pool:
+        signed = [item for chunk in pool.map(_sign_chunk, chunks) for item in chunk]
+    signed.sort()
+    return signed
+
+
+def submit(rpc_url: str, signed: list, batch_size: int = 200) -> list:
+    """Send raw transactions in nonce order as JSON-RPC batches; returns tx hashes."""
+    session = requests.Session()
+    return batch_rpc(session, rpc_url, [("eth_sendRawTransaction", [raw]) for _, raw, _ in signed], batch_size)
+
+# ======================================================================
+# === BENCHMARK ===
+# ======================================================================
+def benchmark(count: int, workers: Optional[int] = None) -> dict:
+    workers = workers or os.cpu_count() or 1
+    members = [f"0x{i:040x}" for i in range(1, count + 1)]
+    _, signature, types, gas = OPERATOR_CALLS["updateKyc"]
+    txs = build_transactions("0x" + "11" * 20, encode_calls(signature, types, [(m, 1) for m in members]),
+                             0, 31337, gas, gas_price=1_000_000_000)
+
+    start = time.perf_counter()
+    serial = sign_serial(ANVIL_KEY, txs)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pooled = sign_batch(ANVIL_KEY, txs, workers)
+    pool_seconds = time.perf_counter() - start
+
+    if pooled != serial:
+        raise AssertionError("pool signatures differ from the serial baseline")
+    return {
+        "transactions": count,
+        "workers": workers,
+        "single_core_sigs_per_second": round(count / serial_seconds, 1),
+        "pool_sigs_per_second": round(count / pool_seconds, 1),
+        "speedup": round(serial_seconds / pool_seconds, 2),
+    }
+
+# ======================================================================
+# === CLI ===
+# ======================================================================
+def parse_loan_ids(spec: str) -> list:
+    """"1-5,9" -> [1, 2, 3, 4, 5, 9]"""
+    ids = []
+    for part in spec.split(","):
+        low, _, high = part.partition("-")
+        ids.extend(range(int(low), int(high or low) + 1))
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sign operator transaction batches across a process pool")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(p):
+        p.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+        p.add_argument("--chain-id", type=int, default=31337)
+        p.add_argument("--private-key", default=ANVIL_KEY,
+                       help="LoanLogicFixed admin for kyc, a LoanManager operator for approve")
+        p.add_argument("--to", help="target contract address (default: LoanLogicFixed for kyc, "
+                                    "LoanManager for approve, from the latest deployment summary)")
+        p.add_argument("--nonce", type=int, help="first nonce (default: pending nonce from --rpc-url)")
+        p.add_argument("--gas", type=int, help="gas limit per transaction")
+        p.add_argument("--gas-price", type=int, help="legacy gas price in wei (default: from --rpc-url)")
+        p.add_argument("--max-fee", type=int, help="EIP-1559 maxFeePerGas in wei")
+        p.add_argument("--priority-fee", type=int, default=0)
+        p.add_argument("--workers", type=int)
+        p.add_argument("-o", "--output", type=Path, required=True, help="JSONL of {nonce, raw, hash}")
+        p.add_argument("--submit", action="store_true", help="send the signed transactions afterwards")
+
+    kyc = sub.add_parser("kyc", help="updateKyc for every member listed in a file")
+    kyc.add_argument("members", type=Path, help="one address per line")
+    kyc.add_argument("--status", type=int, default=KYC_STATUSES.index("Verified"))
+    add_common(kyc)
+
+    approve = sub.add_parser("approve", help="approveLoan for a range of loan ids")
+    approve.add_argument("loan_ids", help='e.g. "1-500" or "3,7,10-12"')
+    add_common(approve)
+
+    bench = sub.add_parser("bench", help="signatures per second, one core vs the pool")
+    bench.add_argument("--count", type=int, default=5000)
+    bench.add_argument("--workers", type=int)
+
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        print(json.dumps(benchmark(args.count, args.workers), indent=2))
+        return
+
+    if args.command == "kyc":
+        with open(args.members, "r", encoding="utf-8") as f:
+            call_args = [(to_checksum_address(line.strip()), args.status) for line in f if line.strip()]
+        name = "updateKyc"
+    else:
+        call_args = [(loan_id,) for loan_id in parse_loan_ids(args.loan_ids)]
+        name = "approveLoan"
+
+    if not call_args:
+        parser.error("Nothing to sign")
+
+    contract, signature, types, default_gas = OPERATOR_CALLS[name]
+    target = args.to or load_deployment(args.chain_id).get(contract)
+    if not target:
+        parser.error(f"No {contract} address; pass --to or deploy first")
+
+    account = Account.from_key(args.private_key)
+    nonce, gas_price = args.nonce, args.gas_price
+    if nonce is None or (gas_price is None and args.max_fee is None):
+        session = requests.Session()
+        pending, price = batch_rpc(session, args.rpc_url, [
+            ("eth_getTransactionCount", [account.address, "pending"]), ("eth_gasPrice", [])])
+        nonce = int(pending, 16) if nonce is None else nonce
+        gas_price = int(price, 16) if gas_price is None else gas_price
+
+    txs = build_transactions(target, encode_calls(signature, types, call_args), nonce, args.chain_id,
+                             args.gas or default_gas, gas_price, args.max_fee, args.priority_fee)
+
+    start = time.perf_counter()
+    signed = sign_batch(args.private_key, txs, args.workers)
+    elapsed = time.perf_counter() - start
+    with open(args.output, "w", encoding="utf-8") as f:
+        for nonce_value, raw, tx_hash in signed:
+            f.write(json.dumps({"nonce": nonce_value, "raw": raw, "hash": tx_hash}) + "\n")
+    print(f"Signed {len(signed)} {contract}.{name} transactions (nonces {signed[0][0]}..{signed[-1][0]}) "
+          f"in {elapsed:.2f}s ({len(signed) / elapsed:.0f} sigs/s) -> {args.output}")
+
+    if args.submit:
+        hashes = submit(args.rpc_url, signed)
+        print(f"Submitted {len(hashes)} transactions to {args.rpc_url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Storage State Exporter
+----------------------------------------
+Dumps LoanCore and MembershipModule state straight from storage slots:
+  • Slot positions computed from the forge storage-layout of each contract
+  • Batched eth_getStorageAt, all pinned to one block
+  • Decoding of packed structs, strings and dynamic arrays (Loan.guarantors)
+  • Internal mappings such as LoanCore.activeLoanId, unreachable via getters
+  • Compact gzip-JSON snapshots and a fast snapshot diff
+
+Mapping keys cannot be enumerated from storage, so they are derived:
+loan ids from loanCounter, borrowers from the loans themselves, members from
+MembershipModule events (BiodataSubmitted, MemberApproved, DepositMade).
+
+Usage:
+    python vc_automation/vc_state.py export snapshot.json.gz [--block 123]
+    python vc_automation/vc_state.py diff old.json.gz new.json.gz
+"""
+import argparse
+import gzip
+import json
+import subprocess
+from typing import Iterable, Optional
+
+import requests
+from eth_utils import keccak
+
+from vc_helpers import PROJECT_ROOT, artifact_path, load_deployment
+
+MEMBER_EVENT_TOPICS = {
+    # topic0 -> index of the topic holding the member address
+    "0x" + keccak(text="BiodataSubmitted(address,uint256)").hex(): 1,
+    "0x" + keccak(text="MemberApproved(address,uint256,bool)").hex(): 1,
+    "0x" + keccak(text="DepositMade(address,address,uint256)").hex(): 2,
+}
+
+# ======================================================================
+# === JSON-RPC BATCHING ===
+# ======================================================================
+def batch_rpc(session: requests.Session, rpc_url: str, calls: list, batch_size: int = 500) -> list:
+    """Send (method, params) pairs as JSON-RPC batches; results keep call order."""
+    results = []
+    for start in range(0, len(calls), batch_size):
+        chunk = calls[start:start + batch_size]
+        payload = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(chunk)]
+        response = session.post(rpc_url, json=payload, timeout=60)
+        response.raise_for_status()
+        by_id = {r["id"]: r for r in response.json()}
+        for i in range(len(chunk)):
+            reply = by_id[i]
+            if "error" in reply:
+                raise RuntimeError(f"{chunk[i][0]} failed: {reply['error']}")
+            results.append(reply["result"])
+    return results
+
+# ======================================================================
+# === STORAGE LAYOUT ===
+# ======================================================================
+def load_storage_layout(contract_name: str) -> dict:
+    """Storage layout from the artifact (extra_output = ["storageLayout"]) or `forge inspect`."""
+    path = artifact_path(contract_name)
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            layout = json.load(f).get("storageLayout")
+        if layout:
+            return layout
+    proc = subprocess.run(["forge", "inspect", contract_name, "storageLayout", "--json"],
+                          cwd=str(PROJECT_ROOT), capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def slot_of(layout: dict, label: str) -> tuple:
+    for var in layout["storage"]:
+        if var["label"] == label:
+            return int(var["slot"]), int(var["offset"]), var["type"]
+    raise KeyError(f"No storage variable {label}")
+
+
+def keccak_int(data: bytes) -> int:
+    return int.from_bytes(keccak(data), "big")
+
+
+def mapping_slot(key_label: str, key, slot: int) -> int:
+    """Slot of mapping[key] for a mapping whose root is at `slot`."""
+    if key_label in ("string", "bytes"):
+        encoded = key.encode("utf-8") if isinstance(key, str) else bytes(key)
+    elif key_label.startswith("address") or key_label.startswith("contract"):
+        encoded = int(key, 16).to_bytes(32, "big")
+    else:
+        encoded = int(key).to_bytes(32, "big", signed=key_label.startswith("int"))
+    return keccak_int(encoded + slot.to_bytes(32, "big"))
+
+# ======================================================================
+# === DECODING ===
+# ======================================================================
+# Decoders are generators. They yield ("read", slots) to get storage words,
+# or ("all", decoders) to run sub-decoders concurrently, and return the value.
+# StorageReader drives all of them together so that each round of reads is
+# a single batch, however many structs, strings and arrays are pending.
+
+def _extract(word: int, offset: int, size: int) -> int:
+    return (word >> (offset * 8)) & ((1 << (size * 8)) - 1)
+
+
+def _primitive(label: str, raw: int, size: int):
+    if label.startswith("address") or label.startswith("contract"):
+        return "0x" + raw.to_bytes(20, "big").hex()
+    if label == "bool":
+        return bool(raw)
+    if label.startswith("int"):
+        bits = size * 8
+        return raw - (1 << bits) if raw >> (bits - 1) else raw
+    if label.startswith("bytes"):
+        return "0x" + raw.to_bytes(size, "big").hex()
+    return raw  # uint*, enum
+
+
+def decode(types: dict, type_id: str, slot: int, offset: int = 0):
+    t = types[type_id]
+    encoding = t["encoding"]
+    size = int(t["numberOfBytes"])
+
+    if encoding == "inplace" and "members" in t:
+        n_slots = size // 32
+        yield ("read", range(slot, slot + n_slots))
+        values = yield ("all", [decode(types, m["type"], slot + int(m["slot"]), int(m["offset"]))
+                                for m in t["members"]])
+        return {m["label"]: v for m, v in zip(t["members"], values)}
+
+    if encoding == "inplace":
+        (word,) = yield ("read", [slot])
+        return _primitive(t["label"], _extract(word, offset, size), size)
+
+    if encoding == "bytes":
+        (word,) = yield ("read", [slot])
+        if word & 1:
+            length = (word - 1) // 2
+            data_slot = keccak_int(slot.to_bytes(32, "big"))
+            words = yield ("read", range(data_slot, data_slot + (length + 31) // 32))
+            data = b"".join(w.to_bytes(32, "big") for w in words)[:length]
+        else:
+            data = word.to_bytes(32, "big")[:(word & 0xFF) // 2]
+        return data.decode("utf-8", errors="replace") if t["label"] == "string" else "0x" + data.hex()
+
+    if encoding == "dynamic_array":
+        (length,) = yield ("read", [slot])
+        base = t["base"]
+        elem_size = int(types[base]["numberOfBytes"])
+        data_slot = keccak_int(slot.to_bytes(32, "big"))
+        if types[base]["encoding"] == "inplace" and elem_size < 32:
+            per_slot = 32 // elem_size
+            positions = [(data_slot + i // per_slot, (i % per_slot) * elem_size) for i in range(length)]
+        else:
+            slots_per = (elem_size + 31) // 32
+            positions = [(data_slot + i * slots_per, 0) for i in range(length)]
+        if positions and types[base]["encoding"] == "inplace":
+            yield ("read", sorted({s for s, _ in positions}))
+        return (yield ("all", [decode(types, base, s, o) for s, o in positions]))
+
+    raise ValueError(f"Unsupported storage encoding {encoding} for {type_id}")
+
+
+def decode_mapping(types: dict, type_id: str, slot: int, keys: Iterable):
+    t = types[type_id]
+    key_label = types[t["key"]]["label"]
+    keys = list(keys)
+    values = yield ("all", [decode(types, t["value"], mapping_slot(key_label, k, slot)) for k in keys])
+    return {str(k): v for k, v in zip(keys, values)}
+
+
+class _Task:
+    def __init__(self, gen, parent=None, index=0):
+        self.gen = gen
+        self.parent = parent
+        self.index = index
+        self.reads = None
+        self.results = None
+        self.remaining = 0
+
+
+class StorageReader:
+    """Runs decoders for one contract, batching every round of slot reads."""
+
+    def __init__(self, session: requests.Session, rpc_url: str, address: str,
+                 block: str, batch_size: int = 500):
+        self.session = session
+        self.rpc_url = rpc_url
+        self.address = address
+        self.block = block
+        self.batch_size = batch_size
+        self.words: dict = {}
+        self.rounds = 0
+
+    def _fetch(self, slots: list) -> None:
+        calls = [("eth_getStorageAt", [self.address, hex(s), self.block]) for s in slots]
+        for slot, value in zip(slots, batch_rpc(self.session, self.rpc_url, calls, self.batch_size)):
+            self.words[slot] = int(value, 16)
+        self.rounds += 1
+
+    def run(self, decoders: list) -> list:
+        root = _Task(None)
+        root.results = [None] * len(decoders)
+        root.remaining = len(decoders)
+        waiting = []
+        ready = [(_Task(d, root, i), None) for i, d in enumerate(decoders)]
+
+        def finish(task, value):
+            parent = task.parent
+            parent.results[task.index] = value
+            parent.remaining -= 1
+            if parent.remaining == 0 and parent is not root:
+                ready.append((parent, parent.results))
+
+        while ready or waiting:
+            while ready:
+                task, value = ready.pop()
+                try:
+                    kind, arg = task.gen.send(value)
+                except StopIteration as stop:
+                    finish(task, stop.value)
+                    continue
+                if kind == "read":
+                    task.reads = list(arg)
+                    if all(s in self.words for s in task.reads):
+                        ready.append((task, [self.words[s] for s in task.reads]))
+                    else:
+                        waiting.append(task)
+                else:
+                    children = list(arg)
+                    task.results = [None] * len(children)
+                    task.remaining = len(children)
+                    if not children:
+                        ready.append((task, []))
+                    ready.extend((_Task(c, task, i), None) for i, c in enumerate(children))
+            if waiting:
+                missing = sorted({s for task in waiting for s in task.reads if s not in self.words})
+                self._fetch(missing)
+                ready.extend((task, [self.words[s] for s in task.reads]) for task in waiting)
+                waiting = []
+        return root.results
+
+# ======================================================================
+# === EXPORT ===
+# ======================================================================
+def discover_members(session: requests.Session, rpc_url: str, membership: str, block: str) -> list:
+    (logs,) = batch_rpc(session, rpc_url, [("eth_getLogs", [{
+        "address": membership,
+        "fromBlock": "0x0",
+        "toBlock": block,
+        "topics": [list(MEMBER_EVENT_TOPICS)],
+    }])])
+    members = set()
+    for entry in logs:
+        topic_index = MEMBER_EVENT_TOPICS[entry["topics"][0]]
+        members.add("0x" + entry["topics"][topic_index][-40:])
+    return sorted(members)
+
+
+def export_state(rpc_url: str, addresses: dict, block: Optional[int] = None,
+                 members: Optional[list] = None, batch_size: int = 500) -> dict:
+    session = requests.Session()
+    chain_id, head = batch_rpc(session, rpc_url, [("eth_chainId", []), ("eth_blockNumber", [])])
+    block_tag = hex(block) if block is not None else head
+    snapshot = {"chain_id": int(chain_id, 16), "block": int(block_tag, 16), "contracts": {}}
+
+    # --- LoanCore: loanCounter -> loans -> activeLoanId[borrowers]
+    layout = load_storage_layout("LoanCore")
+    types = layout["types"]
+    reader = StorageReader(session, rpc_url, addresses["LoanCore"], block_tag, batch_size)
+    counter_slot, counter_offset, counter_type = slot_of(layout, "loanCounter")
+    (loan_counter,) = reader.run([decode(types, counter_type, counter_slot, counter_offset)])
+    loans_slot, _, loans_type = slot_of(layout, "loans")
+    (loans,) = reader.run([decode_mapping(types, loans_type, loans_slot, range(1, loan_counter + 1))])
+    borrowers = sorted({loan["borrower"] for loan in loans.values()})
+    active_slot, _, active_type = slot_of(layout, "activeLoanId")
+    (active,) = reader.run([decode_mapping(types, active_type, active_slot, borrowers)])
+    snapshot["contracts"]["LoanCore"] = {
+        "address": addresses["LoanCore"],
+        "loanCounter": loan_counter,
+        "loans": loans,
+        "activeLoanId": active,
+        "_rounds": reader.rounds,
+    }
+
+    # --- MembershipModule: members / totalDeposits for every known member
+    layout = load_storage_layout("MembershipModule")
+    types = layout["types"]
+    membership = addresses["MembershipModule"]
+    members = members if members is not None else discover_members(session, rpc_url, membership, block_tag)
+    reader = StorageReader(session, rpc_url, membership, block_tag, batch_size)
+    members_slot, _, members_type = slot_of(layout, "members")
+    deposits_slot, _, deposits_type = slot_of(layout, "totalDeposits")
+    member_state, deposits = reader.run([
+        decode_mapping(types, members_type, members_slot, members),
+        decode_mapping(types, deposits_type, deposits_slot, members),
+    ])
+    snapshot["contracts"]["MembershipModule"] = {
+        "address": membership,
+        "members": member_state,
+        "totalDeposits": deposits,
+        "_rounds": reader.rounds,
+    }
+    return snapshot
+
+
+def save_snapshot(snapshot: dict, path) -> None:
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"), sort_keys=True)
+
+
+def load_snapshot(path) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+# ======================================================================
+# === DIFF ===
+# ======================================================================
+def diff_snapshots(old: dict, new: dict) -> dict:
+    """Per contract and variable: changed scalars, and added/removed/changed mapping keys."""
+    result = {}
+    for contract in sorted(old["contracts"].keys() | new["contracts"].keys()):
+        a = old["contracts"].get(contract, {})
+        b = new["contracts"].get(contract, {})
+        changes = {}
+        for var in sorted(a.keys() | b.keys()):
+            if var.startswith("_") or a.get(var) == b.get(var):
+                continue
+            va, vb = a.get(var), b.get(var)
+            if isinstance(va, dict) and isinstance(vb, dict):
+                changes[var] = {
+                    "added": sorted(vb.keys() - va.keys()),
+                    "removed": sorted(va.keys() - vb.keys()),
+                    "changed": {k: {"old": va[k], "new": vb[k]}
+                                for k in sorted(va.keys() & vb.keys()) if va[k] != vb[k]},
+                }
+            else:
+                changes[var] = {"old": va, "new": vb}
+        if changes:
+            result[contract] = changes
+    return {"from_block": old["block"], "to_block": new["block"], "changes": result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and diff contract state from storage slots")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="write a snapshot")
+    export.add_argument("output")
+    export.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    export.add_argument("--chain-id", type=int, default=31337)
+    export.add_argument("--block", type=int, help="block to read at (default: latest)")
+    export.add_argument("--members", help="file with one member address per line (default: from events)")
+    export.add_argument("--batch-size", type=int, default=500)
+
+    diff = sub.add_parser("diff", help="compare two snapshots")
+    diff.add_argument("old")
+    diff.add_argument("new")
+
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        print(json.dumps(diff_snapshots(load_snapshot(args.old), load_snapshot(args.new)), indent=2))
+        return
+
+    addresses = load_deployment(args.chain_id)
+    missing = [n for n in ("LoanCore", "MembershipModule") if n not in addresses]
+    if missing:
+        parser.error(f"Missing addresses in the latest deployment summary: {', '.join(missing)}")
+    members = None
+    if args.members:
+        with open(args.members, "r", encoding="utf-8") as f:
+            members = [line.strip().lower() for line in f if line.strip()]
+
+    snapshot = export_state(args.rpc_url, addresses, args.block, members, args.batch_size)
+    save_snapshot(snapshot, args.output)
+    loan_core = snapshot["contracts"]["LoanCore"]
+    membership = snapshot["contracts"]["MembershipModule"]
+    print(f"Block {snapshot['block']}: {len(loan_core['loans'])} loans, "
+          f"{len(membership['members'])} members "
+          f"({loan_core['_rounds'] + membership['_rounds']} batched read rounds) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
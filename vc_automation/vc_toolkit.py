@@ -0,0 +1,220 @@
+"""
+VaultChain Africa Async Toolkit
+-------------------------------
+asyncio-native on-chain operations built on AsyncWeb3 (aiohttp transport):
+  • Concurrent role grants, member registrations and KYC updates
+  • Concurrent view calls
+  • Bounded concurrency through a semaphore, one OpResult per operation
+  • Cancellation: cancelling the awaiting task (or hitting a batch timeout)
+    cancels every in-flight operation of the batch
+
+Transactions are signed locally with a single key. Nonces are handed out
+from a local counter, so a batch of N transactions is sent without waiting
+for each receipt in turn and costs roughly one round trip of latency.
+"""
+import asyncio
+import heapq
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from eth_account import Account
+from web3 import AsyncWeb3
+
+from vc_helpers import load_abi
+from vc_metrics import RpcMetricsMiddleware, TX_IN_FLIGHT, TX_SENT
+
+OPERATOR_ROLE = AsyncWeb3.keccak(text="OPERATOR_ROLE")
+
+# ======================================================================
+# === RESULTS ===
+# ======================================================================
+class OpResult:
+    """Outcome of one toolkit operation."""
+    name: str
+    ok: bool
+    value: object
+    tx_hash: Optional[str]
+    error: Optional[str]
+    elapsed: float
+
+    def __init__(self, name: str, ok: bool, value: object = None,
+                 tx_hash: Optional[str] = None, error: Optional[str] = None,
+                 elapsed: float = 0.0):
+        self.name = name
+        self.ok = ok
+        self.value = value
+        self.tx_hash = tx_hash
+        self.error = error
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"failed: {self.error}"
+        return f"OpResult({self.name}, {status}, {self.elapsed:.3f}s)"
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "ok": self.ok,
+            "value": self.value,
+            "tx_hash": self.tx_hash,
+            "error": self.error,
+            "elapsed": self.elapsed,
+        }
+
+# ======================================================================
+# === TOOLKIT ===
+# ======================================================================
+class AsyncToolkit:
+    """Concurrent transaction sender and reader for one signing account.
+
+    Usage:
+        async with AsyncToolkit(rpc_url, private_key) as tk:
+            results = await tk.register_members(loan_logic, members)
+    """
+
+    def __init__(self, rpc_url: str, private_key: str,
+                 concurrency: int = 16,
+                 receipt_timeout: float = 120.0,
+                 poll_latency: float = 0.1):
+        self.rpc_url = rpc_url
+        self.account = Account.from_key(private_key)
+        self.concurrency = concurrency
+        self.receipt_timeout = receipt_timeout
+        self.poll_latency = poll_latency
+
+        self.w3: Optional[AsyncWeb3] = None
+        self.chain_id: Optional[int] = None
+        self.gas_price: Optional[int] = None
+        self._nonce: Optional[int] = None
+        self._free_nonces: list = []  # min-heap of nonces whose send was rejected
+        self._nonce_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> "AsyncToolkit":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(self.rpc_url))
+        self.w3.middleware_onion.add(RpcMetricsMiddleware, "metrics")
+        self.chain_id, self.gas_price, self._nonce = await asyncio.gather(
+            self.w3.eth.chain_id,
+            self.w3.eth.gas_price,
+            self.w3.eth.get_transaction_count(self.account.address, "pending"),
+        )
+
+    async def close(self) -> None:
+        if self.w3 is not None:
+            await self.w3.provider.disconnect()
+            self.w3 = None
+
+    def contract(self, address: str, contract_name: str):
+        return self.w3.eth.contract(address=AsyncWeb3.to_checksum_address(address),
+                                    abi=load_abi(contract_name))
+
+    # ------------------------------------------------------------------
+    async def _allocate_nonce(self) -> int:
+        async with self._nonce_lock:
+            if self._free_nonces:
+                return heapq.heappop(self._free_nonces)
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    async def _release_nonce(self, nonce: int) -> None:
+        """Hand a nonce whose send was rejected to the next allocation."""
+        async with self._nonce_lock:
+            heapq.heappush(self._free_nonces, nonce)
+
+    async def _guarded(self, name: str, op: Callable[[], Awaitable[OpResult]]) -> OpResult:
+        """Run one operation under the semaphore, turning errors into a failed OpResult."""
+        start = time.perf_counter()
+        async with self._semaphore:
+            try:
+                result = await op()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                result = OpResult(name, False, error=str(e))
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def run_batch(self, ops: Iterable[tuple], timeout: Optional[float] = None) -> list:
+        """Run (name, op) pairs concurrently; results keep the input order.
+
+        On timeout or cancellation every unfinished operation is cancelled.
+        """
+        tasks = [asyncio.ensure_future(self._guarded(name, op)) for name, op in ops]
+        try:
+            return await asyncio.wait_for(asyncio.gather(*tasks), timeout)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    # ------------------------------------------------------------------
+    async def send(self, name: str, fn) -> OpResult:
+        """Estimate, sign and send one contract call, then wait for its receipt."""
+        tx = await fn.build_transaction({
+            "from": self.account.address,
+            "chainId": self.chain_id,
+            "gasPrice": self.gas_price,
+            "nonce": 0,
+        })
+        # The nonce is only taken once estimation succeeded, so a reverting
+        # call does not consume one. A rejected send returns its nonce to a
+        # free list that the next allocation drains lowest first, so the gap
+        # is refilled instead of stalling the batch until receipt_timeout.
+        # Rewinding the counter instead would hand out nonces that other
+        # sends in flight already hold.
+        tx["nonce"] = await self._allocate_nonce()
+        signed = self.account.sign_transaction(tx)
+        try:
+            tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception:
+            await self._release_nonce(tx["nonce"])
+            raise
+        TX_IN_FLIGHT.inc()
+        try:
+            receipt = await self.w3.eth.wait_for_transaction_receipt(
+                tx_hash, timeout=self.receipt_timeout, poll_latency=self.poll_latency)
+        except BaseException:
+            TX_SENT.labels("unconfirmed").inc()
+            raise
+        finally:
+            TX_IN_FLIGHT.dec()
+        ok = receipt["status"] == 1
+        TX_SENT.labels("success" if ok else "reverted").inc()
+        return OpResult(name, ok, value=receipt["blockNumber"], tx_hash=tx_hash.to_0x_hex(),
+                        error=None if ok else "transaction reverted")
+
+    async def read(self, name: str, fn) -> OpResult:
+        return OpResult(name, True, value=await fn.call())
+
+    def send_many(self, calls: Iterable[tuple], timeout: Optional[float] = None):
+        """Send (name, ContractFunction) pairs concurrently."""
+        return self.run_batch(((name, lambda fn=fn, name=name: self.send(name, fn))
+                               for name, fn in calls), timeout)
+
+    def read_many(self, calls: Iterable[tuple], timeout: Optional[float] = None):
+        """Call (name, ContractFunction) view functions concurrently."""
+        return self.run_batch(((name, lambda fn=fn, name=name: self.read(name, fn))
+                               for name, fn in calls), timeout)
+
+    # ------------------------------------------------------------------
+    def grant_roles(self, access_controlled, role: bytes, accounts: Iterable[str]):
+        return self.send_many((f"grantRole:{a}", access_controlled.functions.grantRole(role, a))
+                              for a in accounts)
+
+    def register_members(self, loan_logic, members: Iterable[str]):
+        return self.send_many((f"registerMemberFor:{m}", loan_logic.functions.registerMemberFor(m))
+                              for m in members)
+
+    def update_kyc(self, loan_logic, members: Iterable[str], status: int):
+        """LoanLogicFixed.updateKyc is admin-only; LoanManager's wrapper calls it as the contract and reverts."""
+        return self.send_many((f"updateKyc:{m}", loan_logic.functions.updateKyc(m, status))
+                              for m in members)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+VaultChain Africa Watch Mode
+----------------------------
+A long-running edit/test/deploy loop against a warm Anvil:
+  • Watches contracts/, script/ and test/ for Solidity changes (debounced)
+  • Incremental `forge build` (no clean; forge's cache skips unchanged files)
+  • Reruns only the test files whose import closure contains a changed file
+  • Redeploys only the changed core contracts and their dependents on the
+    Anvil instance it keeps alive
+  • Reports edit-to-green latency for every cycle
+
+Changes are detected by polling file stat info: the tree is small enough
+that a scan costs well under a millisecond, and it needs no extra
+dependency on any platform.
+
+Usage:
+    python vc_automation/vc_watch.py [--no-deploy] [--debounce 0.3]
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+from eth_account import Account
+
+from vc_automation import log, run_command, stage_2_ensure_anvil
+from vc_deploy import DEPLOY_ORDER, DEPLOY_SPECS, deploy_contracts, save_deployment, with_dependents
+from vc_helpers import PROJECT_ROOT, load_deployment
+
+WATCH_DIRS = ("contracts", "script", "test")
+
+IMPORT_RE = re.compile(r"""^\s*import\s+(?:[^;]*?\s+from\s+)?["']([^"']+)["']\s*;""", re.MULTILINE)
+
+DEFAULT_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+# ======================================================================
+# === SOURCE GRAPH ===
+# ======================================================================
+def watched_files() -> list:
+    files = []
+    for folder in WATCH_DIRS:
+        files.extend((PROJECT_ROOT / folder).rglob("*.sol"))
+    return files
+
+
+def resolve_import(importer: Path, target: str) -> Optional[Path]:
+    """Resolve a Solidity import to a project file; library imports resolve to None."""
+    if target.startswith("."):
+        path = (importer.parent / target).resolve()
+    else:
+        path = (PROJECT_ROOT / target).resolve()
+    return path if path.exists() and PROJECT_ROOT in path.parents else None
+
+
+def build_import_graph(files: list) -> dict:
+    """Map each project source file to the project files it imports."""
+    graph = {}
+    for path in files:
+        try:
+            source = path.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+        imports = set()
+        for target in IMPORT_RE.findall(source):
+            resolved = resolve_import(path, target)
+            if resolved is not None:
+                imports.add(resolved)
+        graph[path.resolve()] = imports
+    return graph
+
+
+def import_closure(path: Path, graph: dict) -> set:
+    """All files reachable from path through imports, including path itself."""
+    seen = {path}
+    stack = [path]
+    while stack:
+        for dep in graph.get(stack.pop(), ()):
+            if dep not in seen:
+                seen.add(dep)
+                stack.append(dep)
+    return seen
+
+
+def affected_tests(changed: set, graph: dict) -> list:
+    test_dir = PROJECT_ROOT / "test"
+    return sorted(
+        path for path in graph
+        if test_dir in path.parents and import_closure(path, graph) & changed
+    )
+
+
+def affected_contracts(changed: set, graph: dict) -> list:
+    names = [
+        name for name in DEPLOY_ORDER
+        if import_closure((PROJECT_ROOT / DEPLOY_SPECS[name]["source"]).resolve(), graph) & changed
+    ]
+    return with_dependents(names)
+
+# ======================================================================
+# === CHANGE DETECTION ===
+# ======================================================================
+def snapshot() -> dict:
+    state = {}
+    for path in watched_files():
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        state[path.resolve()] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def diff_snapshots(old: dict, new: dict) -> set:
+    return {p for p in old.keys() | new.keys() if old.get(p) != new.get(p)}
+
+
+def wait_for_changes(state: dict, poll_interval: float, debounce: float) -> tuple:
+    """Block until files change and then stay quiet for `debounce` seconds.
+
+    Returns (changed paths, new snapshot, timestamp of the earliest edit).
+    """
+    changed = set()
+    first_edit = None
+    quiet_since = None
+    while True:
+        time.sleep(poll_interval)
+        new_state = snapshot()
+        delta = diff_snapshots(state, new_state)
+        state = new_state
+        if delta:
+            changed |= delta
+            mtimes = [state[p][0] / 1e9 for p in delta if p in state]
+            edit_time = min(mtimes) if mtimes else time.time()
+            first_edit = edit_time if first_edit is None else min(first_edit, edit_time)
+            quiet_since = time.time()
+        elif changed and time.time() - quiet_since >= debounce:
+            return changed, state, first_edit
+
+# ======================================================================
+# === WATCH LOOP ===
+# ======================================================================
+def match_path_glob(paths: list) -> str:
+    relative = [p.relative_to(PROJECT_ROOT).as_posix() for p in paths]
+    return relative[0] if len(relative) == 1 else "{" + ",".join(relative) + "}"
+
+
+def run_cycle(changed: set, addresses: dict, deploy: bool, rpc_url: str,
+              private_key: str, chain_id: int) -> tuple:
+    """Build, test and redeploy for one batch of changes; returns (green, addresses)."""
+    rel = ", ".join(sorted(p.relative_to(PROJECT_ROOT).as_posix() for p in changed))
+    log(f"Changed: {rel}")
+
+    code, _, _ = run_command(["forge", "build"])
+    if code != 0:
+        log("Build failed.")
+        return False, addresses
+
+    graph = build_import_graph(watched_files())
+    tests = affected_tests(changed, graph)
+    if tests:
+        code, _, _ = run_command(["forge", "test", "--match-path", match_path_glob(tests)])
+        if code != 0:
+            log("Tests failed; skipping redeploy.")
+            return False, addresses
+    else:
+        log("No tests affected.")
+
+    if deploy:
+        names = list(DEPLOY_ORDER) if not addresses else affected_contracts(changed, graph)
+        if names:
+            admin = Account.from_key(private_key).address
+            updated = deploy_contracts(names, addresses, rpc_url, private_key, admin)
+            if any(updated.get(n) == addresses.get(n) for n in names):
+                log("Redeploy incomplete.")
+                return False, updated
+            addresses = updated
+            log(f"Redeployed {', '.join(names)}; summary at {save_deployment(addresses, chain_id)}")
+        else:
+            log("No deployed contracts affected.")
+
+    return True, addresses
+
+
+def watch(rpc_url: str = "http://127.0.0.1:8545", chain_id: int = 31337,
+          private_key: str = DEFAULT_PRIVATE_KEY, deploy: bool = True,
+          poll_interval: float = 0.1, debounce: float = 0.3) -> None:
+    if deploy:
+        stage_2_ensure_anvil(chain_id=chain_id)
+    addresses = load_deployment(chain_id) if deploy else {}
+
+    state = snapshot()
+    log(f"Watching {', '.join(WATCH_DIRS)} ({len(state)} files). Ctrl+C to stop.")
+    cycle = 0
+    try:
+        while True:
+            changed, state, first_edit = wait_for_changes(state, poll_interval, debounce)
+            cycle += 1
+            started = time.time()
+            green, addresses = run_cycle(changed, addresses, deploy, rpc_url, private_key, chain_id)
+            finished = time.time()
+            log(f"Cycle {cycle}: {'GREEN' if green else 'RED'} — "
+                f"edit-to-{'green' if green else 'red'} {finished - first_edit:.2f}s "
+                f"(cycle {finished - started:.2f}s)")
+    except KeyboardInterrupt:
+        log("Watch mode stopped.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental build/test/redeploy loop")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    parser.add_argument("--chain-id", type=int, default=31337)
+    parser.add_argument("--private-key", default=DEFAULT_PRIVATE_KEY)
+    parser.add_argument("--no-deploy", action="store_true", help="only build and test")
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    parser.add_argument("--debounce", type=float, default=0.3)
+    args = parser.parse_args()
+    watch(args.rpc_url, args.chain_id, args.private_key, not args.no_deploy,
+          args.poll_interval, args.debounce)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,20 @@ Usage:
     python vc_scaffold.py [--force]
 
 Options:
-    --force     Overwrite existing contract files
+    --force     Overwrite existing contract files whose content has changed
+
+Templates are rendered in memory and compared by content hash, so files whose
+content is already up to date are left untouched (their mtime does not change
+and solc does not recompile them). Contracts with a matching interface in
+contracts/core/interfaces are generated as stubs implementing that interface.
 """
 
+import hashlib
 import os
+import re
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
 CURRENT_DIR = Path.cwd()
@@ -24,19 +33,48 @@ if not (PROJECT_ROOT / "vc_scaffold.py").exists():
     print("❌ Could not find vc_scaffold.py in any parent folder.")
     sys.exit(1)
 
+INTERFACES_DIR = PROJECT_ROOT / "contracts" / "core" / "interfaces"
+
+WRITTEN = "written"
+UNCHANGED = "unchanged"
+SKIPPED = "skipped"
+
+# Matches one interface function declaration (possibly spanning several lines),
+# together with the NatSpec comment lines directly above it.
+FUNCTION_RE = re.compile(
+    r"((?:^[ \t]*///[^\n]*\n)*)^[ \t]*(function\s+\w+\s*\([^;{]*?\)[^;{]*?);",
+    re.MULTILINE | re.DOTALL,
+)
+
 # -----------------------------
-# Contract scaffolding
+# Template rendering
 # -----------------------------
-def create_contract(contract_name, folder, force=False):
-    folder_path = PROJECT_ROOT / "backend/contracts" / folder
-    os.makedirs(folder_path, exist_ok=True)
-    path = folder_path / f"{contract_name}.sol"
+def parse_interface_functions(interface_path):
+    """Return (natspec_lines, declaration) pairs for every function in an interface."""
+    source = interface_path.read_text(encoding="utf-8")
+    functions = []
+    for match in FUNCTION_RE.finditer(source):
+        natspec = [line.strip() for line in match.group(1).splitlines() if line.strip()]
+        declaration = " ".join(match.group(2).split())
+        declaration = declaration.replace("( ", "(").replace(" )", ")")
+        functions.append((natspec, declaration))
+    return functions
 
-    if path.exists() and not force:
-        print(f"⚠️ Skipped: {contract_name}.sol already exists in {folder_path}")
-        return
 
-    content = f"""// SPDX-License-Identifier: MIT
+def render_function_stub(contract_name, natspec, declaration):
+    lines = [f"    {line}" for line in natspec]
+    lines.append(f"    {declaration} {{")
+    lines.append(f'        revert("{contract_name}: not implemented");')
+    lines.append("    }")
+    return "\n".join(lines)
+
+
+def render_contract(contract_name, folder_path):
+    interface_name = f"I{contract_name}"
+    interface_path = INTERFACES_DIR / f"{interface_name}.sol"
+
+    if not interface_path.exists():
+        return f"""// SPDX-License-Identifier: MIT
 pragma solidity ^0.8.20;
 
 contract {contract_name} {{
@@ -47,9 +85,86 @@ contract {contract_name} {{
     }}
 }}
 """
-    with open(path, "w") as f:
-        f.write(content)
+
+    import_path = Path(os.path.relpath(interface_path, folder_path)).as_posix()
+    stubs = "\n\n".join(
+        render_function_stub(contract_name, natspec, declaration)
+        for natspec, declaration in parse_interface_functions(interface_path)
+    )
+    body = f"""
+    event Initialized(address indexed owner);
+
+    constructor() {{
+        emit Initialized(msg.sender);
+    }}
+"""
+    if stubs:
+        body += "\n" + stubs + "\n"
+
+    return f"""// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.30;
+
+import "{import_path}";
+
+contract {contract_name} is {interface_name} {{{body}}}
+"""
+
+# -----------------------------
+# File writing
+# -----------------------------
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def default_mode():
+    """The mode open() would give a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_atomic(path, data):
+    """Write bytes to path via a temporary file and an atomic rename.
+
+    mkstemp creates files as 0600; the result keeps the mode of the file it
+    replaces, or gets the umask default for a new file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        else:
+            os.chmod(tmp_path, default_mode())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+# -----------------------------
+# Contract scaffolding
+# -----------------------------
+def create_contract(contract_name, folder, force=False):
+    """Scaffold one contract and return WRITTEN, UNCHANGED or SKIPPED."""
+    folder_path = PROJECT_ROOT / "backend/contracts" / folder
+    os.makedirs(folder_path, exist_ok=True)
+    path = folder_path / f"{contract_name}.sol"
+
+    if path.exists() and not force:
+        print(f"⚠️ Skipped: {contract_name}.sol already exists in {folder_path}")
+        return SKIPPED
+
+    content = render_contract(contract_name, folder_path).encode("utf-8")
+
+    if path.exists() and content_hash(path.read_bytes()) == content_hash(content):
+        print(f"➖ Unchanged: {contract_name}.sol in {folder_path}")
+        return UNCHANGED
+
+    write_atomic(path, content)
     print(f"✅ Created: {contract_name}.sol in {folder_path}")
+    return WRITTEN
 
 
 def scaffold_all(force=False):
@@ -60,11 +175,16 @@ def scaffold_all(force=False):
         "oracle": ["OracleAggregator"],
         "treasury": ["Treasury", "ReserveFund"]
     }
+    counts = {WRITTEN: 0, UNCHANGED: 0, SKIPPED: 0}
     for folder, contracts in modules.items():
         for contract in contracts:
-            create_contract(contract, folder, force=force)
+            counts[create_contract(contract, folder, force=force)] += 1
+    return counts
 
 if __name__ == "__main__":
     force_flag = "--force" in sys.argv
-    scaffold_all(force=force_flag)
-    print("✅ All contract templates scaffolded.")
+    counts = scaffold_all(force=force_flag)
+    print(
+        f"✅ All contract templates scaffolded "
+        f"({counts[WRITTEN]} written, {counts[UNCHANGED]} unchanged, {counts[SKIPPED]} skipped)."
+    )